@@ -2,13 +2,25 @@
 
 import logging
 import os
+import secrets
+import threading
 from pathlib import Path
 
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import (
+    Depends,
+    FastAPI,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Response,
+    UploadFile,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from PIL import Image
 from pydantic import BaseModel
 
+from vibecheck.api import ExecutorOverloaded, InferenceExecutor
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
@@ -48,46 +60,232 @@ class SearchResponse(BaseModel):
     query_type: str
 
 
+class IndexUpdateResponse(BaseModel):
+    id: int
+    indexed: bool
+    index_size: int
+
+
+class IndexInfoResponse(BaseModel):
+    version: int
+    size: int
+    loaded_at: float
+    status: str = "serving"
+
+
 class HealthResponse(BaseModel):
     status: str
     service: str
     version: str
 
 
+class ReadinessResponse(BaseModel):
+    ready: bool
+    components: dict[str, bool]
+
+
 _recommender = None
+_recommender_lock = threading.Lock()
+
+# Models loaded with the recommender ("text", "image"); others load on first use
+WARM_MODELS = tuple(
+    m.strip() for m in os.getenv("WARM_MODELS", "text").split(",") if m.strip()
+)
+
+# Model inference, FAISS and SQLite are blocking, so they run here instead of
+# on the event loop; requests beyond the queue limit get a 503.
+inference = InferenceExecutor(
+    max_workers=int(os.getenv("INFERENCE_WORKERS", "2")),
+    max_queue=int(os.getenv("INFERENCE_QUEUE_SIZE", "16")),
+)
+
+
+def require_admin(authorization: str | None = Header(None)) -> None:
+    """
+    Guard endpoints that change or reload the index: ``Authorization: Bearer
+    <token>``.
+
+    The token is the ``ADMIN_TOKEN`` environment variable; without it these
+    endpoints are disabled, since the API is public (CORS allows any origin).
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(
+            status_code=403, detail="Index admin endpoints disabled; set ADMIN_TOKEN"
+        )
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run ``fn`` on the inference executor, mapping overload to 503."""
+    try:
+        return await inference.run(fn, *args, **kwargs)
+    except ExecutorOverloaded as e:
+        logger.warning(f"Rejecting request: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, retry shortly",
+            headers={"Retry-After": "1"},
+        ) from e
 
 
 def get_recommender():
     global _recommender
+    if _recommender is not None:
+        return _recommender
+    with _recommender_lock:
+        if _recommender is None:
+            _recommender = _create_recommender()
+    return _recommender
+
+
+def _loaded_recommender():
+    """
+    The recommender, or 503 while it is still loading.
+
+    For ``async`` handlers that touch it on the event loop: calling
+    ``get_recommender()`` there would block every request on the warm-up lock.
+    """
     if _recommender is None:
-        logger.info("Initializing recommender...")
-        from vibecheck import VibeCheckRecommender
-
-        _recommender = VibeCheckRecommender(
-            db_path=Path(os.getenv("DB_PATH", "data/restaurants_info/restaurants.db")),
-            image_dir=Path(os.getenv("IMAGE_DIR", "data/images/sample_images")),
-            faiss_index_path=Path(
-                os.getenv("FAISS_INDEX_PATH", "data/embeddings/vibecheck_index.faiss")
-            ),
-            meta_ids_path=Path(
-                os.getenv("META_IDS_PATH", "data/restaurants_info/meta_ids.npy")
-            ),
+        raise HTTPException(
+            status_code=503,
+            detail="Service is loading, retry shortly",
+            headers={"Retry-After": "5"},
         )
-        logger.info("Recommender initialized")
     return _recommender
 
 
+def _create_recommender():
+    logger.info("Initializing recommender...")
+    from vibecheck import VibeCheckRecommender
+    from vibecheck.index import load_index_config
+
+    encoder = None
+    if os.getenv("ML_SERVICE_URL"):
+        # Lightweight replica: models live in ml_service.py, not here.
+        from vibecheck.embeddings.encoders import RemoteEncoder
+
+        encoder = RemoteEncoder(
+            os.getenv("ML_SERVICE_URL"),
+            timeout=(2.0, float(os.getenv("ML_SERVICE_TIMEOUT", "30"))),
+            retries=int(os.getenv("ML_SERVICE_RETRIES", "3")),
+            pool_size=int(os.getenv("INFERENCE_WORKERS", "2")),
+        )
+
+    recommender = VibeCheckRecommender(
+        db_path=Path(os.getenv("DB_PATH", "data/restaurants_info/restaurants.db")),
+        image_dir=Path(os.getenv("IMAGE_DIR", "data/images/sample_images")),
+        faiss_index_path=Path(
+            os.getenv("FAISS_INDEX_PATH", "data/embeddings/vibecheck_index.faiss")
+        ),
+        meta_ids_path=Path(
+            os.getenv("META_IDS_PATH", "data/restaurants_info/meta_ids.npy")
+        ),
+        use_metadata_store=os.getenv("USE_METADATA_STORE", "false").lower() == "true",
+        mmap=os.getenv("INDEX_MMAP", "false").lower() == "true",
+        live_index_path=(
+            Path(os.getenv("LIVE_INDEX_PATH")) if os.getenv("LIVE_INDEX_PATH") else None
+        ),
+        live_index_flush_interval=float(os.getenv("LIVE_INDEX_FLUSH_INTERVAL", "5")),
+        embeddings_path=(
+            Path(os.getenv("EMBEDDINGS_PATH")) if os.getenv("EMBEDDINGS_PATH") else None
+        ),
+        # The live index is built like the offline one (params.yaml `index`)
+        index_config=(
+            load_index_config(Path(os.getenv("PARAMS_PATH", "params.yaml")))
+            if os.getenv("LIVE_INDEX_PATH")
+            else None
+        ),
+        encoder=encoder,
+        warm=WARM_MODELS,
+        # One read-only SQLite connection per inference thread
+        db_pool_size=int(os.getenv("INFERENCE_WORKERS", "2")),
+    )
+    logger.info("Recommender initialized")
+    return recommender
+
+
+# Under `gunicorn --preload -k uvicorn.workers.UvicornWorker api.main:app` this
+# runs once in the master, so forked workers share the loaded models and index.
+if os.getenv("PRELOAD_MODELS", "false").lower() == "true":
+    get_recommender()
+
+
+def _warm_up():
+    try:
+        recommender = get_recommender()
+    except Exception as e:
+        logger.error(f"Error loading recommender: {e}")
+        return
+    interval = float(os.getenv("INDEX_WATCH_INTERVAL", "0"))
+    if interval > 0:
+        recommender.watch_index(interval=interval)
+    # Index updates land in one worker; the others merge them from the file
+    live_interval = float(os.getenv("LIVE_INDEX_WATCH_INTERVAL", "5"))
+    if recommender.live_index_path is not None and live_interval > 0:
+        recommender.watch_live_index(interval=live_interval)
+
+
+@app.on_event("startup")
+async def start_warm_up():
+    # Runs in every worker (threads don't survive gunicorn's fork). Loading
+    # happens off the event loop so /health answers right away and /ready
+    # reports progress.
+    threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def flush_live_index():
+    # Live index changes are written on a debounce; don't lose the last ones
+    if _recommender is not None:
+        _recommender.flush_index()
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     return HealthResponse(status="healthy", service="vibecheck-api", version="0.1.0")
 
 
+@app.get("/ready", response_model=ReadinessResponse)
+async def readiness(response: Response):
+    """
+    Readiness probe: 200 once the index and the ``WARM_MODELS`` are loaded.
+
+    Unlike ``/health`` (process is up) this returns 503 while loading, so a
+    load balancer only routes queries to replicas that can answer quickly.
+    Models outside ``WARM_MODELS`` are reported but not required.
+    """
+    if _recommender is None:
+        components = {"index": False, "text_model": False, "clip_model": False}
+    else:
+        components = _recommender.readiness()
+    required = ["index"]
+    required += [
+        name
+        for modality, name in (("text", "text_model"), ("image", "clip_model"))
+        if modality in WARM_MODELS
+    ]
+    ready = all(components[name] for name in required)
+    if not ready:
+        response.status_code = 503
+    return ReadinessResponse(ready=ready, components=components)
+
+
 @app.post("/api/search/text", response_model=SearchResponse)
 async def search_by_text(request: TextSearchRequest):
     logger.info(f"Text search: '{request.query}'")
     try:
-        recommender = get_recommender()
-        results = recommender.search_by_text(request.query, top_k=request.top_k)
+        results = await run_blocking(
+            lambda: get_recommender().search_by_text(request.query, top_k=request.top_k)
+        )
         return SearchResponse(
             results=[
                 RestaurantResult(
@@ -101,6 +299,8 @@ async def search_by_text(request: TextSearchRequest):
             ],
             query_type="text",
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Search error: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -112,10 +312,11 @@ async def search_by_image(
     top_k: int = 5,
 ):
     logger.info("Image search")
+    data = await file.read()
     try:
-        image = Image.open(file.file)
-        recommender = get_recommender()
-        results = recommender.search_by_image(image, top_k=top_k)
+        results = await run_blocking(
+            lambda: get_recommender().search_by_image_bytes(data, top_k=top_k)
+        )
         return SearchResponse(
             results=[
                 RestaurantResult(
@@ -129,16 +330,29 @@ async def search_by_image(
             ],
             query_type="image",
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Search error: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@app.get("/api/stats/cache")
+async def cache_stats():
+    return _loaded_recommender().cache_stats()
+
+
+@app.get("/api/stats/inference")
+async def inference_stats():
+    return inference.stats()
+
+
 @app.get("/api/restaurants/{restaurant_id}")
 async def get_restaurant(restaurant_id: str):
     try:
-        recommender = get_recommender()
-        info = recommender.get_restaurant_info(restaurant_id)
+        info = await run_blocking(
+            lambda: get_recommender().get_restaurant_info(restaurant_id)
+        )
         if not info:
             raise HTTPException(status_code=404, detail="Restaurant not found")
         return info
@@ -149,6 +363,94 @@ async def get_restaurant(restaurant_id: str):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+def _index_info(status: str = "serving") -> IndexInfoResponse:
+    snapshot = _loaded_recommender().snapshots.current
+    return IndexInfoResponse(
+        version=snapshot.version,
+        size=snapshot.size,
+        loaded_at=snapshot.loaded_at,
+        status=status,
+    )
+
+
+@app.get("/api/index", response_model=IndexInfoResponse)
+async def index_info():
+    return _index_info()
+
+
+@app.post(
+    "/api/index/reload",
+    response_model=IndexInfoResponse,
+    status_code=202,
+    dependencies=[Depends(require_admin)],
+)
+async def reload_index():
+    """Load the index files in the background and swap them in when ready."""
+    status = _loaded_recommender().reload_index(background=True)
+    return _index_info(status=status)
+
+
+def _live_index_or_409():
+    recommender = _loaded_recommender()
+    if recommender.live_index is None:
+        raise HTTPException(
+            status_code=409, detail="Live index disabled; set LIVE_INDEX_PATH"
+        )
+    return recommender
+
+
+@app.post(
+    "/api/restaurants/{restaurant_id}/index",
+    response_model=IndexUpdateResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def index_restaurant(
+    restaurant_id: int,
+    text: str | None = Form(None),  # noqa: B008
+    files: list[UploadFile] | None = File(None),  # noqa: B008
+):
+    """Add or re-embed a restaurant in the live index (no rebuild or restart)."""
+    from io import BytesIO
+
+    from PIL import Image
+
+    recommender = _live_index_or_409()
+    uploads = [await f.read() for f in files or []]
+
+    def add():
+        images = [Image.open(BytesIO(data)).convert("RGB") for data in uploads]
+        recommender.add_restaurant(restaurant_id, text=text, images=images)
+
+    try:
+        await run_blocking(add)
+    except HTTPException:
+        raise
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        logger.error(f"Index update error: {e}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    return IndexUpdateResponse(
+        id=restaurant_id, indexed=True, index_size=recommender.live_index.ntotal
+    )
+
+
+@app.delete(
+    "/api/restaurants/{restaurant_id}/index",
+    response_model=IndexUpdateResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def unindex_restaurant(restaurant_id: int):
+    """Remove a restaurant from the live index."""
+    recommender = _live_index_or_409()
+    if not await run_blocking(recommender.remove_restaurant, restaurant_id):
+        raise HTTPException(status_code=404, detail="Restaurant not in index")
+    return IndexUpdateResponse(
+        id=restaurant_id, indexed=False, index_size=recommender.live_index.ntotal
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
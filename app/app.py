@@ -5,24 +5,55 @@ Main Flask backend for restaurant vibe search and visualization.
 """
 
 import os
+import secrets
 import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 from io import BytesIO
 from pathlib import Path
 
 import clip
-import faiss
 import numpy as np
 import torch
 from flask import Flask, jsonify, render_template, request
 from PIL import Image
 from sentence_transformers import SentenceTransformer
 
+# Get the app directory (where this file is located)
+APP_DIR = Path(__file__).parent
+
+# Make the vibecheck package importable when running from a source checkout
+# (Docker images put it on PYTHONPATH instead)
+if (APP_DIR.parent / "src").exists():
+    sys.path.insert(0, str(APP_DIR.parent / "src"))
+
+from vibecheck.cache import LRUCache, content_key  # noqa: E402
+from vibecheck.database import ConnectionPool  # noqa: E402
+from vibecheck.index import (  # noqa: E402
+    IndexSnapshot,
+    IndexWatcher,
+    SnapshotHolder,
+    load_array,
+    load_index,
+)
+from vibecheck.queries import (  # noqa: E402
+    PHOTOS_SQL,
+    RESTAURANT_SQL,
+    TOP_REVIEWS_SQL,
+    TOP_VIBES_SQL,
+    FileBackedJSONCache,
+    fetch_map_data,
+    fetch_restaurant_cards,
+    fetch_restaurants_by_vibe,
+)
+from vibecheck.schema import CARD_PHOTOS, prepare_database  # noqa: E402
+
 # ==============================================================================
 # CONFIG
 # ==============================================================================
 
-# Get the app directory (where this file is located)
-APP_DIR = Path(__file__).parent
 # Data directory is one level up from app/
 DATA_DIR = APP_DIR.parent / "data"
 
@@ -36,6 +67,29 @@ VIBE_MAP_CSV = Path(os.getenv("VIBE_MAP_CSV", DATA_DIR / "vibe_map.csv"))
 
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
+# Memory-map the FAISS index and meta_ids so gunicorn workers share one copy
+INDEX_MMAP = os.getenv("INDEX_MMAP", "false").lower() == "true"
+
+# Seconds between checks for a new index build to hot-reload (0 disables)
+INDEX_WATCH_INTERVAL = float(os.getenv("INDEX_WATCH_INTERVAL", "0"))
+
+# Models loaded at startup ("text", "image"); CLIP otherwise loads on the first
+# image query. Warm it too under gunicorn --preload so workers share one copy.
+WARM_MODELS = [
+    m.strip() for m in os.getenv("WARM_MODELS", "text").split(",") if m.strip()
+]
+
+# Pooled read-only SQLite connections per worker; DB_IMMUTABLE skips all
+# locking and is only safe when the database file never changes while serving
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+DB_IMMUTABLE = os.getenv("DB_IMMUTABLE", "false").lower() == "true"
+
+# Upper bound on results per search request
+MAX_TOP_K = int(os.getenv("MAX_TOP_K", "100"))
+
+# Memory budget for CLIP vectors of uploaded images, keyed by content hash
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
 # ==============================================================================
 # FLASK APP
 # ==============================================================================
@@ -47,12 +101,71 @@ app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16MB max file size
 # LOAD MODELS (once at startup)
 # ==============================================================================
 
-print("Loading models...")
-text_model = SentenceTransformer("all-MiniLM-L6-v2", device=DEVICE)
-clip_model, clip_preprocess = clip.load("ViT-B/32", device=DEVICE)
-faiss_index = faiss.read_index(str(FAISS_PATH))
-meta_ids = np.load(META_PATH)
-print(f"Models loaded. FAISS index contains {len(meta_ids)} restaurants.")
+_clip = {}
+_clip_lock = threading.Lock()
+
+
+def get_clip_model():
+    """CLIP model and preprocessor, loaded on first use."""
+    if "model" not in _clip:
+        with _clip_lock:
+            if "model" not in _clip:
+                print("Loading CLIP model...")
+                model, preprocess = clip.load("ViT-B/32", device=DEVICE)
+                _clip["preprocess"] = preprocess
+                _clip["model"] = model  # last: readers check this key
+    return _clip["model"], _clip["preprocess"]
+
+
+def load_search_index(version):
+    """Load the FAISS index and meta_ids as one swappable snapshot."""
+    return IndexSnapshot(
+        index=load_index(FAISS_PATH, mmap=INDEX_MMAP),
+        meta_ids=load_array(META_PATH, mmap=INDEX_MMAP),
+        version=version,
+    )
+
+
+# The text model, the index and (if warmed) CLIP don't depend on each other,
+# so they load concurrently.
+print(f"Loading models ({', '.join(WARM_MODELS) or 'none'}) and index...")
+with ThreadPoolExecutor(max_workers=3) as _pool:
+    _text_future = _pool.submit(SentenceTransformer, "all-MiniLM-L6-v2", device=DEVICE)
+    if "image" in WARM_MODELS:
+        _clip_future = _pool.submit(get_clip_model)
+    # Requests read `index_snapshots.current` once, so a reload never splits one
+    index_snapshots = SnapshotHolder(load_search_index)
+    text_model = _text_future.result()
+    if "image" in WARM_MODELS:
+        _clip_future.result()
+print(
+    f"Models loaded. FAISS index contains "
+    f"{len(index_snapshots.current.meta_ids)} restaurants."
+)
+
+
+def start_index_watcher():
+    """Hot-reload the index when a new build is written (per process)."""
+    if INDEX_WATCH_INTERVAL > 0:
+        IndexWatcher(
+            [FAISS_PATH, META_PATH],
+            index_snapshots.reload,
+            interval=INDEX_WATCH_INTERVAL,
+        ).start()
+
+
+# A 512-d float32 vector is 2 KiB, so the byte budget is the binding limit
+image_embedding_cache = LRUCache(
+    max_entries=IMAGE_CACHE_MAX_BYTES // (512 * 4), max_bytes=IMAGE_CACHE_MAX_BYTES
+)
+
+# Read-only connections reused across requests (opened lazily, per worker)
+db_pool = ConnectionPool(
+    DB_PATH, size=DB_POOL_SIZE, immutable=DB_IMMUTABLE, row_factory=sqlite3.Row
+)
+
+# /api/map-data JSON, rebuilt when the database or vibe map changes
+map_data_cache = FileBackedJSONCache([DB_PATH, VIBE_MAP_CSV])
 
 # ==============================================================================
 # HELPER FUNCTIONS
@@ -60,12 +173,17 @@ print(f"Models loaded. FAISS index contains {len(meta_ids)} restaurants.")
 
 
 def get_db():
-    """Get database connection."""
+    """Get a read-write database connection (startup imports only)."""
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
 
+def read_db():
+    """Borrow a pooled read-only connection: ``with read_db() as conn:``."""
+    return db_pool.connection()
+
+
 def encode_query(text=None, image_file=None):
     """Encode text and/or image query into combined embedding."""
 
@@ -74,15 +192,20 @@ def encode_query(text=None, image_file=None):
         text or "", convert_to_numpy=True, normalize_embeddings=True
     )
 
-    # Encode image if provided
+    # Encode image if provided (repeat uploads are served from the cache)
     if image_file:
         try:
-            img = Image.open(BytesIO(image_file)).convert("RGB")
-            img_tensor = clip_preprocess(img).unsqueeze(0).to(DEVICE)
-            with torch.no_grad():
-                img_vec = clip_model.encode_image(img_tensor)
-            img_vec /= img_vec.norm(dim=-1, keepdim=True)
-            img_vec = img_vec.cpu().numpy()[0]
+            key = content_key(image_file)
+            img_vec = image_embedding_cache.get(key)
+            if img_vec is None:
+                img = Image.open(BytesIO(image_file)).convert("RGB")
+                clip_model, clip_preprocess = get_clip_model()
+                img_tensor = clip_preprocess(img).unsqueeze(0).to(DEVICE)
+                with torch.no_grad():
+                    img_vec = clip_model.encode_image(img_tensor)
+                img_vec /= img_vec.norm(dim=-1, keepdim=True)
+                img_vec = img_vec.cpu().numpy()[0].astype("float32")
+                image_embedding_cache.put(key, img_vec)
         except Exception as e:
             print(f"Error processing image: {e}")
             img_vec = np.zeros((512,))
@@ -96,78 +219,36 @@ def encode_query(text=None, image_file=None):
 
 def get_restaurant_details(restaurant_id, full_details=False):
     """Fetch restaurant details from database."""
-    conn = get_db()
-    cursor = conn.cursor()
-
-    # Basic info - include latitude/longitude for map display
-    cursor.execute(
-        """
-        SELECT id, name, rating, address, reviews_count, place_id, latitude, longitude
-        FROM restaurants
-        WHERE id = ?
-        """,
-        (restaurant_id,),
-    )
+    # Photos and reviews: a card's worth of photos and 2 reviews for search
+    # results, or 5 of each for full details
+    photo_limit = 5 if full_details else CARD_PHOTOS
+    review_limit = 5 if full_details else 2
 
-    row = cursor.fetchone()
-    if not row:
-        return None
+    with read_db() as conn:
+        # Basic info - include latitude/longitude for map display
+        row = conn.execute(RESTAURANT_SQL, (restaurant_id,)).fetchone()
+        if not row:
+            return None
+        photos = conn.execute(PHOTOS_SQL, (restaurant_id, photo_limit)).fetchall()
+        vibes = conn.execute(TOP_VIBES_SQL, (restaurant_id,)).fetchall()
+        reviews = conn.execute(
+            TOP_REVIEWS_SQL, (restaurant_id, review_limit)
+        ).fetchall()
 
     restaurant = dict(row)
 
-    # Photos - get first photo for search results, or all 5 for full details
-    photo_limit = 5 if full_details else 1
-    cursor.execute(
-        """
-        SELECT local_filename, photo_url
-        FROM vibe_photos
-        WHERE restaurant_id = ?
-        LIMIT ?
-        """,
-        (restaurant_id, photo_limit),
-    )
-
-    photos = cursor.fetchall()
-    if full_details:
-        restaurant["photos"] = [
-            {"filename": p["local_filename"], "url": p["photo_url"]} for p in photos
-        ]
-    else:
-        # For search results, just return first photo
+    restaurant["photos"] = [
+        {"filename": p["local_filename"], "url": p["photo_url"]} for p in photos
+    ]
+    if not full_details:
+        # Search results also carry the first photo, like restaurant_cards
         restaurant["photo_filename"] = photos[0]["local_filename"] if photos else None
         restaurant["photo_url"] = photos[0]["photo_url"] if photos else None
 
-    # Vibes
-    cursor.execute(
-        """
-        SELECT vibe_name, mention_count
-        FROM vibe_analysis
-        WHERE restaurant_id = ?
-        ORDER BY mention_count DESC
-        LIMIT 3
-        """,
-        (restaurant_id,),
-    )
-
-    vibes = cursor.fetchall()
     restaurant["vibes"] = [
         {"name": v["vibe_name"], "count": v["mention_count"]} for v in vibes
     ]
 
-    # Reviews - get 2 for search results, or 5 for full details
-    review_limit = 5 if full_details else 2
-    cursor.execute(
-        """
-        SELECT review_text, likes
-        FROM reviews
-        WHERE restaurant_id = ?
-        ORDER BY likes DESC
-        LIMIT ?
-        """,
-        (restaurant_id, review_limit),
-    )
-
-    reviews = cursor.fetchall()
     if full_details:
         restaurant["reviews"] = [
             {"text": r["review_text"], "likes": r["likes"]} for r in reviews
@@ -178,54 +259,56 @@ def get_restaurant_details(restaurant_id, full_details=False):
             for r in reviews
         ]
 
-    conn.close()
     return restaurant
 
 
-def get_all_restaurants_for_map():
-    """Fetch all restaurants with coordinates for map visualization."""
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT r.id, r.name, r.rating, r.address, r.reviews_count,
-               vm.x, vm.y, vm.cluster, r.latitude, r.longitude
-        FROM restaurants r
-        LEFT JOIN (
-            SELECT id, name, x, y, cluster
-            FROM vibe_map_data
-        ) vm ON r.name = vm.name
-        WHERE r.rating IS NOT NULL
-    """)
-
-    restaurants = []
-    for row in cursor.fetchall():
-        restaurant = dict(row)
-
-        # Get top vibe for this restaurant
-        cursor.execute(
-            """
-            SELECT vibe_name, mention_count
-            FROM vibe_analysis
-            WHERE restaurant_id = ?
-            ORDER BY mention_count DESC
-            LIMIT 1
-        """,
-            (restaurant["id"],),
-        )
+def get_restaurant_cards(restaurant_ids):
+    """Search-result details for many restaurants, keyed by id.
+
+    Reads the prebuilt ``restaurant_cards`` table in one lookup; restaurants
+    without a card (or a database without the table) fall back to
+    :func:`get_restaurant_details`.
+    """
+    try:
+        with read_db() as conn:
+            cards = fetch_restaurant_cards(conn, restaurant_ids)
+    except sqlite3.OperationalError:
+        cards = {}
+
+    for restaurant_id in restaurant_ids:
+        if restaurant_id not in cards:
+            details = get_restaurant_details(restaurant_id)
+            if details:
+                cards[restaurant_id] = details
+    return cards
 
-        vibe_row = cursor.fetchone()
-        if vibe_row:
-            restaurant["top_vibe"] = vibe_row["vibe_name"]
-            restaurant["vibe_count"] = vibe_row["mention_count"]
-        else:
-            restaurant["top_vibe"] = None
-            restaurant["vibe_count"] = 0
 
-        restaurants.append(restaurant)
+def admin_required(view):
+    """Require ``Authorization: Bearer <ADMIN_TOKEN>`` (403 if it is unset)."""
+
+    @wraps(view)
+    def guarded(*args, **kwargs):
+        admin_token = os.getenv("ADMIN_TOKEN")
+        if not admin_token:
+            return jsonify({"error": "Index admin endpoints disabled"}), 403
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not secrets.compare_digest(
+            token.encode(), admin_token.encode()
+        ):
+            return (
+                jsonify({"error": "Invalid admin token"}),
+                401,
+                {"WWW-Authenticate": "Bearer"},
+            )
+        return view(*args, **kwargs)
+
+    return guarded
 
-    conn.close()
-    return restaurants
+
+def get_all_restaurants_for_map():
+    """Fetch all restaurants with coordinates for map visualization."""
+    with read_db() as conn:
+        return fetch_map_data(conn)
 
 
 def import_vibe_map_to_db():
@@ -242,6 +325,16 @@ def import_vibe_map_to_db():
     print("Imported vibe_map.csv into database.")
 
 
+def build_cards():
+    """Index the database and (re)build the restaurant_cards table.
+
+    Runs once per start, before requests are served: from ``__main__`` here
+    and from ``on_starting`` in gunicorn.conf.py, never per worker.
+    """
+    count = prepare_database(DB_PATH)
+    print(f"Built {count} restaurant cards.")
+
+
 # ==============================================================================
 # ROUTES
 # ==============================================================================
@@ -259,7 +352,7 @@ def search():
     try:
         query_text = request.form.get("text", "")
         query_image = request.files.get("image")
-        top_k = int(request.form.get("top_k", 9))
+        top_k = min(max(int(request.form.get("top_k", 9)), 1), MAX_TOP_K)
 
         if not query_text and not query_image:
             return jsonify({"error": "Please provide text or image query"}), 400
@@ -267,15 +360,21 @@ def search():
         image_bytes = query_image.read() if query_image else None
         query_vec = encode_query(query_text, image_bytes)
 
-        distances, indices = faiss_index.search(query_vec, top_k)
+        snapshot = index_snapshots.current
+        distances, indices = snapshot.index.search(query_vec, top_k)
+
+        hits = [
+            (int(snapshot.meta_ids[idx]), float(distance))
+            for idx, distance in zip(indices[0], distances[0], strict=False)
+            if idx >= 0
+        ]
+        cards = get_restaurant_cards([restaurant_id for restaurant_id, _ in hits])
 
         results = []
-        for idx, distance in zip(indices[0], distances[0], strict=False):
-            restaurant_id = int(meta_ids[idx])
-            details = get_restaurant_details(restaurant_id)
+        for restaurant_id, distance in hits:
+            details = cards.get(restaurant_id)
             if details:
-                details["similarity_score"] = float(distance)
-                results.append(details)
+                results.append({**details, "similarity_score": distance})
 
         return jsonify({"results": results})
 
@@ -284,6 +383,33 @@ def search():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/index")
+def index_info():
+    """Version and size of the index currently serving searches."""
+    snapshot = index_snapshots.current
+    return jsonify(
+        {
+            "version": snapshot.version,
+            "size": snapshot.size,
+            "loaded_at": snapshot.loaded_at,
+        }
+    )
+
+
+@app.route("/api/index/reload", methods=["POST"])
+@admin_required
+def reload_index():
+    """Load the index files in the background and swap them in when ready.
+
+    Only the worker handling the request reloads; set INDEX_WATCH_INTERVAL to
+    have every worker pick up new builds. Requests made while a reload is
+    running are coalesced into one follow-up reload ("queued").
+    """
+    status = index_snapshots.reload_async()
+    version = index_snapshots.current.version
+    return jsonify({"status": status, "version": version}), 202
+
+
 @app.route("/api/restaurant/<int:restaurant_id>")
 def get_restaurant(restaurant_id):
     """Get full restaurant details with all photos and reviews."""
@@ -296,8 +422,10 @@ def get_restaurant(restaurant_id):
 @app.route("/api/map-data")
 def map_data():
     try:
-        restaurants = get_all_restaurants_for_map()
-        return jsonify({"restaurants": restaurants})
+        body = map_data_cache.get(
+            lambda: {"restaurants": get_all_restaurants_for_map()}
+        )
+        return app.response_class(body, mimetype="application/json")
     except Exception as e:
         print(f"Map data error: {e}")
         return jsonify({"error": str(e)}), 500
@@ -305,94 +433,44 @@ def map_data():
 
 @app.route("/api/vibe-stats")
 def vibe_stats():
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT vibe_name, SUM(mention_count) as total
-        FROM vibe_analysis
-        GROUP BY vibe_name
-        ORDER BY total DESC
-        LIMIT 10
-    """)
+    with read_db() as conn:
+        rows = conn.execute("""
+            SELECT vibe_name, SUM(mention_count) as total
+            FROM vibe_analysis
+            GROUP BY vibe_name
+            ORDER BY total DESC
+            LIMIT 10
+        """).fetchall()
 
-    vibes = [{"name": row[0], "count": row[1]} for row in cursor.fetchall()]
-    conn.close()
+    vibes = [{"name": row[0], "count": row[1]} for row in rows]
 
     return jsonify({"vibes": vibes})
 
 
 @app.route("/api/restaurants-by-vibe")
 def restaurants_by_vibe():
-    """Get restaurants matching a specific vibe, sorted by mention count."""
+    """Get restaurants matching a specific vibe, sorted by mention count.
+
+    Paginated: pass ``limit`` (default 50, max 100) and the ``next_cursor``
+    of the previous response as ``cursor`` to fetch the next page.
+    """
     vibe_name = request.args.get("vibe")
     if not vibe_name:
         return jsonify({"error": "Vibe parameter is required"}), 400
+    limit = request.args.get("limit", 50, type=int)
 
-    conn = get_db()
-    cursor = conn.cursor()
-
-    # Get restaurants with this vibe, ranked by mention count
-    cursor.execute(
-        """
-        SELECT r.id, r.name, r.rating, r.address, r.reviews_count,
-               va.mention_count
-        FROM restaurants r
-        JOIN vibe_analysis va ON r.id = va.restaurant_id
-        WHERE va.vibe_name = ?
-        ORDER BY va.mention_count DESC, r.rating DESC
-        LIMIT 50
-        """,
-        (vibe_name,),
+    try:
+        with read_db() as conn:
+            restaurants, next_cursor = fetch_restaurants_by_vibe(
+                conn, vibe_name, limit=limit, cursor=request.args.get("cursor")
+            )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(
+        {"vibe": vibe_name, "restaurants": restaurants, "next_cursor": next_cursor}
     )
 
-    restaurants = []
-    for row in cursor.fetchall():
-        restaurant_id = row["id"]
-
-        # Get first photo
-        cursor.execute(
-            """
-            SELECT local_filename
-            FROM vibe_photos
-            WHERE restaurant_id = ?
-            LIMIT 1
-            """,
-            (restaurant_id,),
-        )
-        photo_row = cursor.fetchone()
-
-        # Get top review
-        cursor.execute(
-            """
-            SELECT review_text, likes
-            FROM reviews
-            WHERE restaurant_id = ?
-            ORDER BY likes DESC
-            LIMIT 1
-            """,
-            (restaurant_id,),
-        )
-        review_row = cursor.fetchone()
-
-        restaurants.append(
-            {
-                "id": row["id"],
-                "name": row["name"],
-                "rating": row["rating"],
-                "address": row["address"],
-                "reviews_count": row["reviews_count"],
-                "mention_count": row["mention_count"],
-                "photo_filename": photo_row["local_filename"] if photo_row else None,
-                "top_review": review_row["review_text"][:200] + "..."
-                if review_row and review_row["review_text"]
-                else None,
-            }
-        )
-
-    conn.close()
-    return jsonify({"vibe": vibe_name, "restaurants": restaurants})
-
 
 @app.route("/images/<path:filename>")
 def serve_image(filename):
@@ -407,13 +485,15 @@ def serve_image(filename):
 
 if __name__ == "__main__":
     import_vibe_map_to_db()
+    build_cards()
+    start_index_watcher()
 
     port = int(os.getenv("FLASK_PORT", 8080))
 
     print("\n" + "=" * 60)
     print("VibeCheck Flask App Starting")
     print("=" * 60)
-    print(f"Restaurants loaded: {len(meta_ids)}")
+    print(f"Restaurants loaded: {index_snapshots.current.size}")
     print(f"Server available at http://localhost:{port}")
     print("=" * 60 + "\n")
 
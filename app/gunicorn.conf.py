@@ -0,0 +1,73 @@
+"""
+Gunicorn configuration for the VibeCheck Flask app.
+
+With ``preload_app`` the master imports ``app.py`` once, so the sentence
+transformer, CLIP (when in ``WARM_MODELS``) and the FAISS index are loaded
+before forking and shared
+copy-on-write by every worker instead of being loaded N times.
+
+The ``restaurant_cards`` table is rebuilt once in ``on_starting``, before any
+worker exists, rather than by every worker at import (``BUILD_CARDS=false``
+skips it when ``scripts/load_sql.py`` already built them).
+
+Usage:
+    cd app && gunicorn -c gunicorn.conf.py app:app
+"""
+
+import gc
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "2"))
+timeout = 120
+preload_app = os.getenv("PRELOAD_APP", "true").lower() == "true"
+
+# Torch threads per worker; workers * threads should not exceed the core count
+torch_threads = int(os.getenv("TORCH_NUM_THREADS", "1"))
+
+build_cards = os.getenv("BUILD_CARDS", "true").lower() == "true"
+# Same default as app.py
+db_path = Path(
+    os.getenv("DB_PATH", Path(__file__).resolve().parent.parent / "data/vibecheck.db")
+)
+
+
+def on_starting(server):
+    if not build_cards or not db_path.exists():
+        return
+    src_dir = Path(__file__).resolve().parent.parent / "src"
+    if src_dir.exists() and str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    from vibecheck.schema import prepare_database
+
+    try:
+        count = prepare_database(db_path)
+    except sqlite3.Error as e:
+        # Searches fall back to per-restaurant queries without cards
+        server.log.error(f"Could not build restaurant cards: {e}")
+        return
+    server.log.info(f"Built {count} restaurant cards in {db_path}")
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far into the permanent GC generation so the
+    # collector never writes to those pages and un-shares them in workers.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    import torch
+
+    torch.set_num_threads(torch_threads)
+    server.log.info(f"Worker {worker.pid}: torch threads={torch_threads}")
+
+
+def post_worker_init(worker):
+    # Watcher threads don't survive fork, so each worker starts its own.
+    import app as flask_app
+
+    flask_app.start_index_watcher()
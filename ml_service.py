@@ -1,10 +1,22 @@
 """ML Service for model inference."""
 
 import logging
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, File, Form, Header, HTTPException, Response, UploadFile
 from pydantic import BaseModel
 
+from vibecheck.api import (
+    MicroBatcher,
+    UnsupportedMediaType,
+    encode_matrix,
+    negotiate,
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
@@ -18,6 +30,21 @@ app = FastAPI(
 )
 
 _models = {}
+_text_lock = threading.Lock()
+_clip_lock = threading.Lock()
+
+# Models loaded at startup ("text", "image"); others load on first request
+WARM_MODELS = tuple(
+    m.strip() for m in os.getenv("WARM_MODELS", "text,image").split(",") if m.strip()
+)
+
+# Concurrent requests are grouped into one model call of up to BATCH_MAX_SIZE
+# items, waiting at most BATCH_MAX_WAIT_MS for a batch to fill.
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+
+# Largest number of texts or images accepted by one /embed/batch request
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "256"))
 
 
 class TextEmbeddingRequest(BaseModel):
@@ -35,31 +62,100 @@ class HealthResponse(BaseModel):
     models_loaded: list[str]
 
 
+class ReadinessResponse(BaseModel):
+    ready: bool
+    components: dict[str, bool]
+
+
 def get_text_model():
     if "text" not in _models:
-        logger.info("Loading text model...")
-        from sentence_transformers import SentenceTransformer
+        with _text_lock:
+            if "text" not in _models:
+                logger.info("Loading text model...")
+                from sentence_transformers import SentenceTransformer
 
-        _models["text"] = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
-        logger.info("Text model loaded")
+                _models["text"] = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
+                logger.info("Text model loaded")
     return _models["text"]
 
 
 def get_clip_model():
     if "clip" not in _models:
-        logger.info("Loading CLIP model...")
-        import clip
-        import torch
-
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        model, preprocess = clip.load("ViT-B/32", device=device)
-        _models["clip"] = model
-        _models["clip_preprocess"] = preprocess
-        _models["device"] = device
-        logger.info("CLIP model loaded")
+        with _clip_lock:
+            if "clip" not in _models:
+                logger.info("Loading CLIP model...")
+                import clip
+                import torch
+
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                model, preprocess = clip.load("ViT-B/32", device=device)
+                _models["clip_preprocess"] = preprocess
+                _models["device"] = device
+                _models["clip"] = model  # last: readers check this key
+                logger.info("CLIP model loaded")
     return _models["clip"], _models["clip_preprocess"], _models["device"]
 
 
+def warm_models(modalities: tuple[str, ...] = WARM_MODELS) -> None:
+    """Load the requested models concurrently."""
+    loaders = [
+        loader
+        for modality, loader in (("text", get_text_model), ("image", get_clip_model))
+        if modality in modalities
+    ]
+    with ThreadPoolExecutor(max_workers=max(len(loaders), 1)) as pool:
+        for future in [pool.submit(loader) for loader in loaders]:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error loading models: {e}")
+
+
+def encode_texts(texts: list[str]):
+    model = get_text_model()
+    return model.encode(
+        texts,
+        batch_size=len(texts),
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+
+
+def encode_images(images: list[bytes]):
+    import numpy as np
+    import torch
+    from PIL import Image
+
+    model, preprocess, device = get_clip_model()
+    # Undecodable uploads get a NaN row and are rejected by the endpoint
+    # instead of failing everyone else's requests in the same batch.
+    tensors, ok = [], []
+    for data in images:
+        try:
+            image = Image.open(BytesIO(data)).convert("RGB")
+            tensors.append(preprocess(image))
+            ok.append(True)
+        except Exception as e:
+            logger.warning(f"Could not decode image: {e}")
+            ok.append(False)
+
+    vectors = np.full((len(images), 512), np.nan, dtype="float32")
+    if tensors:
+        with torch.no_grad():
+            encoded = model.encode_image(torch.stack(tensors).to(device))
+        encoded /= encoded.norm(dim=-1, keepdim=True)
+        vectors[np.flatnonzero(ok)] = encoded.cpu().numpy()
+    return vectors
+
+
+text_batcher = MicroBatcher(
+    encode_texts, max_batch_size=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS
+)
+image_batcher = MicroBatcher(
+    encode_images, max_batch_size=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS
+)
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     return HealthResponse(
@@ -69,13 +165,24 @@ async def health_check():
     )
 
 
+@app.get("/ready", response_model=ReadinessResponse)
+async def readiness(response: Response):
+    """503 until every model in ``WARM_MODELS`` is loaded; see ``/health``."""
+    components = {"text_model": "text" in _models, "clip_model": "clip" in _models}
+    ready = all(
+        components[name]
+        for modality, name in (("text", "text_model"), ("image", "clip_model"))
+        if modality in WARM_MODELS
+    )
+    if not ready:
+        response.status_code = 503
+    return ReadinessResponse(ready=ready, components=components)
+
+
 @app.post("/embed/text", response_model=EmbeddingResponse)
 async def embed_text(request: TextEmbeddingRequest):
     try:
-        model = get_text_model()
-        embedding = model.encode(
-            request.text, convert_to_numpy=True, normalize_embeddings=True
-        )
+        embedding = await text_batcher.submit(request.text)
         return EmbeddingResponse(
             embedding=embedding.tolist(), dimensions=len(embedding)
         )
@@ -84,15 +191,83 @@ async def embed_text(request: TextEmbeddingRequest):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Pre-loading models...")
+@app.post("/embed/image", response_model=EmbeddingResponse)
+async def embed_image(file: UploadFile = File(...)):  # noqa: B008
+    data = await file.read()
     try:
-        get_text_model()
-        get_clip_model()
-        logger.info("Models loaded successfully")
+        embedding = await image_batcher.submit(data)
     except Exception as e:
-        logger.error(f"Error loading models: {e}")
+        logger.error(f"Image embedding error: {e}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    if math.isnan(embedding[0]):  # marks an image that could not be decoded
+        raise HTTPException(status_code=400, detail="Could not decode image")
+    return EmbeddingResponse(embedding=embedding.tolist(), dimensions=len(embedding))
+
+
+@app.post("/embed/batch")
+async def embed_batch(
+    texts: list[str] | None = Form(None),  # noqa: B008
+    images: list[UploadFile] | None = File(None),  # noqa: B008
+    accept: str | None = Header(None),  # noqa: B008
+):
+    """
+    Embed many texts *or* many images in one request.
+
+    The response body is an (N, D) matrix in the format chosen by ``Accept``:
+    ``application/octet-stream`` (16-byte header + little-endian data, the
+    default), ``application/x-npy``, ``application/x-msgpack`` (if msgpack
+    is installed) or ``application/json``. Add ``; dtype=float16`` to halve
+    the payload. Decode with :func:`vibecheck.api.decode_matrix`.
+    """
+    if bool(texts) == bool(images):
+        raise HTTPException(status_code=400, detail="Send either texts or images")
+    items = texts or images
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"At most {BULK_MAX_ITEMS} items per request"
+        )
+    try:
+        media_type, dtype = negotiate(accept)
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=406, detail=str(e)) from e
+
+    import numpy as np
+
+    try:
+        if texts:
+            vectors = await text_batcher.submit_many(texts)
+        else:
+            uploads = [await f.read() for f in images]
+            vectors = await image_batcher.submit_many(uploads)
+    except Exception as e:
+        logger.error(f"Batch embedding error: {e}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    matrix = np.stack(vectors)
+    failed = np.flatnonzero(np.isnan(matrix[:, 0])).tolist()
+    if failed:
+        raise HTTPException(
+            status_code=400, detail=f"Could not decode images at positions {failed}"
+        )
+
+    return Response(
+        content=encode_matrix(matrix, media_type, dtype),
+        media_type=f"{media_type}; dtype={dtype}",
+        headers={"X-Embedding-Shape": f"{matrix.shape[0]},{matrix.shape[1]}"},
+    )
+
+
+@app.get("/stats/batching")
+async def batching_stats():
+    return {"text": text_batcher.stats(), "image": image_batcher.stats()}
+
+
+@app.on_event("startup")
+async def startup_event():
+    # Load in the background so /health answers at once; /ready tracks it.
+    logger.info(f"Pre-loading models: {', '.join(WARM_MODELS) or 'none'}")
+    threading.Thread(target=warm_models, name="warm-up", daemon=True).start()
 
 
 if __name__ == "__main__":
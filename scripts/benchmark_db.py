@@ -0,0 +1,116 @@
+"""Compare per-call SQLite connections against the read-only ConnectionPool.
+
+Runs the search-hit hydration queries (restaurant, photos, vibes, reviews)
+for random restaurants, single-threaded and from several threads, and
+reports p50/p95 latency and throughput for each strategy.
+
+Usage:
+    python scripts/benchmark_db.py --db data/vibecheck.db --threads 4
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from vibecheck.database import ConnectionPool
+from vibecheck.queries import (
+    PHOTOS_SQL,
+    RESTAURANT_SQL,
+    TOP_REVIEWS_SQL,
+    TOP_VIBES_SQL,
+)
+
+
+def hydrate(conn: sqlite3.Connection, restaurant_id: int) -> None:
+    """The four lookups the app runs per search hit without cards."""
+    conn.execute(RESTAURANT_SQL, (restaurant_id,)).fetchone()
+    conn.execute(PHOTOS_SQL, (restaurant_id, 1)).fetchall()
+    conn.execute(TOP_VIBES_SQL, (restaurant_id,)).fetchall()
+    conn.execute(TOP_REVIEWS_SQL, (restaurant_id, 2)).fetchall()
+
+
+def per_call(db_path: Path):
+    """The old behaviour: a fresh connection for every request."""
+
+    @contextmanager
+    def connection():
+        conn = sqlite3.connect(db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    return connection
+
+
+def run(connection, ids: list[int], threads: int) -> dict[str, float]:
+    def request(restaurant_id: int) -> float:
+        start = time.perf_counter()
+        with connection() as conn:
+            hydrate(conn, restaurant_id)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(pool.map(request, ids))
+    elapsed = time.perf_counter() - start
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+        "requests_per_s": len(ids) / elapsed,
+    }
+
+
+def main():
+    """Benchmark each connection strategy at 1 and N threads."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", type=Path, default=Path("data/vibecheck.db"))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument(
+        "--output", type=Path, default=Path("data/embeddings/db_benchmark.json")
+    )
+    args = parser.parse_args()
+
+    with sqlite3.connect(f"file:{args.db}?mode=ro", uri=True) as conn:
+        all_ids = [row[0] for row in conn.execute("SELECT id FROM restaurants")]
+    rng = random.Random(0)
+    ids = [rng.choice(all_ids) for _ in range(args.requests)]
+    print(f"{len(all_ids)} restaurants, {len(ids)} requests per run")
+
+    pool = ConnectionPool(args.db, size=args.threads)
+    immutable_pool = ConnectionPool(args.db, size=args.threads, immutable=True)
+    strategies = {
+        "per_call_connect": per_call(args.db),
+        "pool": pool.connection,
+        "pool_immutable": immutable_pool.connection,
+    }
+
+    report = {}
+    print(f"\n{'strategy':<18} {'threads':>7} {'p50 ms':>8} {'p95 ms':>8} {'req/s':>9}")
+    for name, connection in strategies.items():
+        for threads in sorted({1, args.threads}):
+            run(connection, ids[:100], threads)  # warm up caches
+            result = run(connection, ids, threads)
+            report[f"{name}@{threads}"] = result
+            print(
+                f"{name:<18} {threads:>7} {result['p50_ms']:>8.3f} "
+                f"{result['p95_ms']:>8.3f} {result['requests_per_s']:>9.0f}"
+            )
+    pool.close()
+    immutable_pool.close()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare FAISS index variants against the exact Flat baseline."""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from vibecheck.index import IndexConfig, load_index_config, recall_latency_report
+
+
+def main():
+    """Build every index variant and report recall@k vs. query latency."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--embeddings",
+        type=Path,
+        default=Path("data/embeddings/vibe_embeddings.npy"),
+    )
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("data/embeddings/index_benchmark.json"),
+    )
+    args = parser.parse_args()
+
+    embeddings = np.load(args.embeddings).astype("float32")
+    print(f"Loaded {len(embeddings)} embeddings (dim: {embeddings.shape[1]})")
+
+    # Start from params.yaml so nlist/pq/hnsw settings match the real build
+    base = load_index_config().to_dict()
+    configs = [
+        IndexConfig.from_dict({**base, "type": index_type})
+        for index_type in ("flat", "ivf_flat", "ivf_pq", "hnsw")
+    ]
+
+    report = recall_latency_report(
+        embeddings, configs, k=args.k, n_queries=args.queries
+    )
+
+    print(f"\n{'index':<10} {'knob':<14} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for row in report:
+        knob = "-"
+        if row["type"].startswith("ivf"):
+            knob = f"nprobe={row['nprobe']}"
+        elif row["type"] == "hnsw":
+            knob = f"efSearch={row['ef_search']}"
+        print(
+            f"{row['type']:<10} {knob:<14} {row['recall_at_k']:>9.3f} "
+            f"{row['latency_ms_p50']:>8.3f} {row['latency_ms_p95']:>8.3f}"
+        )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
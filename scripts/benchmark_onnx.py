@@ -0,0 +1,209 @@
+"""Compare int8 ONNX Runtime encoders against the FP32 PyTorch models.
+
+Reports, for MiniLM text queries and CLIP images:
+
+- cosine similarity between FP32 and ONNX embeddings,
+- top-k overlap of FAISS results on our index (same query, both encoders),
+- single-item latency (p50/p95) and batch throughput on this machine.
+
+Usage:
+    python scripts/benchmark_onnx.py --export
+    VIBECHECK_MODEL_BACKEND=onnx python api/main.py
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from PIL import Image
+
+from vibecheck.embeddings.models import ModelCache
+from vibecheck.embeddings.onnx_models import (
+    CLIP_ONNX,
+    TEXT_ONNX,
+    OnnxClipImageModel,
+    OnnxTextModel,
+    clip_preprocess,
+    export_clip_visual,
+    export_text_model,
+    onnx_path,
+)
+from vibecheck.index import load_index
+
+QUERIES = [
+    "cozy cafe with plants",
+    "candlelit wine bar",
+    "rooftop bar with a view",
+    "bright brunch spot with big windows",
+    "dive bar with neon signs",
+    "minimalist japanese restaurant",
+    "lively taqueria with murals",
+    "romantic italian dinner",
+    "industrial brewery with long tables",
+    "quiet bookstore cafe",
+    "fancy steakhouse with leather booths",
+    "colorful dessert shop",
+    "family friendly pizza place",
+    "speakeasy cocktail lounge",
+    "beachy seafood shack",
+    "modern vegan bistro",
+]
+
+
+def timed(fn, repeats: int) -> list[float]:
+    """Run ``fn`` ``repeats`` times and return latencies in milliseconds."""
+    fn()  # warm up
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": statistics.median(ordered),
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))],
+    }
+
+
+def topk_overlap(index, block: slice, a: np.ndarray, b: np.ndarray, k: int) -> float:
+    """Mean |top-k(a) ∩ top-k(b)| / k, searching with one modality's block."""
+    queries = np.zeros((2, len(a), index.d), dtype="float32")
+    queries[0, :, block] = a
+    queries[1, :, block] = b
+    _, ids_a = index.search(queries[0], k)
+    _, ids_b = index.search(queries[1], k)
+    return float(
+        np.mean([len(set(x) & set(y)) / k for x, y in zip(ids_a, ids_b, strict=True)])
+    )
+
+
+def compare(name, encode_ref, encode_onnx, items, index, block, k, repeats):
+    ref = encode_ref(items)
+    onnx = encode_onnx(items)
+    cosine = np.sum(ref * onnx, axis=1)
+
+    ref_single = summarize(timed(lambda: encode_ref(items[:1]), repeats))
+    onnx_single = summarize(timed(lambda: encode_onnx(items[:1]), repeats))
+    ref_batch = min(timed(lambda: encode_ref(items), 3))
+    onnx_batch = min(timed(lambda: encode_onnx(items), 3))
+
+    result = {
+        "items": len(items),
+        "cosine_mean": float(cosine.mean()),
+        "cosine_min": float(cosine.min()),
+        f"top{k}_overlap": topk_overlap(index, block, ref, onnx, k),
+        "fp32_single": ref_single,
+        "onnx_int8_single": onnx_single,
+        "fp32_batch_items_per_s": len(items) / (ref_batch / 1000),
+        "onnx_int8_batch_items_per_s": len(items) / (onnx_batch / 1000),
+    }
+    print(f"\n{name}")
+    for key, value in result.items():
+        print(f"  {key}: {value}")
+    return result
+
+
+def main():
+    """Export (optionally), then measure accuracy and latency."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--onnx-dir", type=Path, default=Path("models/onnx"))
+    parser.add_argument("--export", action="store_true", help="(Re-)export models")
+    parser.add_argument(
+        "--index", type=Path, default=Path("data/embeddings/vibecheck_index.faiss")
+    )
+    parser.add_argument(
+        "--image-dir", type=Path, default=Path("data/images/sample_images")
+    )
+    parser.add_argument("--max-images", type=int, default=64)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    parser.add_argument(
+        "--output", type=Path, default=Path("data/embeddings/onnx_benchmark.json")
+    )
+    args = parser.parse_args()
+
+    text_path = onnx_path(args.onnx_dir, TEXT_ONNX)
+    clip_path = onnx_path(args.onnx_dir, CLIP_ONNX)
+    if args.export or not text_path.exists():
+        text_path = export_text_model(args.onnx_dir)
+    if args.export or not clip_path.exists():
+        clip_path = export_clip_visual(args.onnx_dir)
+
+    ModelCache.set_backend("torch")  # the FP32 reference
+    ModelCache.configure_threads(args.threads)
+    index = load_index(args.index)
+    report = {"threads": args.threads, "k": args.k}
+
+    # Text: FP32 sentence-transformers vs int8 ONNX
+    text_model = ModelCache.get_text_model()
+    onnx_text = OnnxTextModel(text_path, args.threads)
+
+    def encode_text_ref(texts):
+        return text_model.encode(
+            texts, convert_to_numpy=True, normalize_embeddings=True
+        )
+
+    def encode_text_onnx(texts):
+        return onnx_text.encode(texts, normalize_embeddings=True)
+
+    report["text"] = compare(
+        "MiniLM text",
+        encode_text_ref,
+        encode_text_onnx,
+        QUERIES,
+        index,
+        slice(0, 384),
+        args.k,
+        args.repeats,
+    )
+
+    # Images: FP32 CLIP vs int8 ONNX image tower
+    paths = sorted(args.image_dir.glob("*.jpg"))[: args.max_images]
+    if paths:
+        images = [Image.open(p).convert("RGB") for p in paths]
+        clip_model, preprocess = ModelCache.get_clip_model()
+        onnx_clip = OnnxClipImageModel(clip_path, args.threads)
+        onnx_preprocess = clip_preprocess()
+        device = ModelCache.get_device()
+
+        def encode_image_ref(batch):
+            pixels = torch.stack([preprocess(img) for img in batch]).to(device)
+            with torch.no_grad():
+                vecs = clip_model.encode_image(pixels).float()
+            return (vecs / vecs.norm(dim=-1, keepdim=True)).cpu().numpy()
+
+        def encode_image_onnx(batch):
+            pixels = torch.stack([onnx_preprocess(img) for img in batch])
+            vecs = onnx_clip.encode_image(pixels)
+            return (vecs / vecs.norm(dim=-1, keepdim=True)).numpy()
+
+        report["image"] = compare(
+            "CLIP image",
+            encode_image_ref,
+            encode_image_onnx,
+            images,
+            index,
+            slice(384, 896),
+            args.k,
+            max(args.repeats // 5, 5),
+        )
+    else:
+        print(f"No images in {args.image_dir}, skipping CLIP")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Measure per-worker memory of the Flask app with and without preload-and-fork.
+
+Starts gunicorn twice (``PRELOAD_APP=false`` then ``true``), waits until the
+app answers, and reads ``/proc/<pid>/smaps_rollup`` for the master and every
+worker. PSS (proportional set size) splits shared pages between the processes
+mapping them, so it shows how much memory each worker really costs.
+
+Linux only. Usage:
+    python scripts/benchmark_worker_memory.py --workers 4
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import time
+import urllib.request
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent.parent / "app"
+
+
+def read_memory_kb(pid: int) -> dict[str, int]:
+    """Return Rss/Pss/Shared totals (kB) for one process."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:", "Shared_Clean:", "Shared_Dirty:"):
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "shared_kb": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+def child_pids(pid: int) -> list[int]:
+    """Direct children of a process (the gunicorn workers)."""
+    children_file = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(p) for p in children_file.read_text().split()]
+
+
+def wait_until_ready(url: str, timeout: float) -> float:
+    """Poll ``url`` until it responds; return seconds waited."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            urllib.request.urlopen(url, timeout=2)
+            return time.perf_counter() - start
+        except OSError:
+            time.sleep(1)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def measure(preload: bool, workers: int, port: int, timeout: float) -> dict:
+    """Start gunicorn, wait for readiness, and sample worker memory."""
+    env = {
+        **os.environ,
+        "PRELOAD_APP": str(preload).lower(),
+        "WEB_CONCURRENCY": str(workers),
+        "PORT": str(port),
+    }
+    proc = subprocess.Popen(
+        ["gunicorn", "-c", "gunicorn.conf.py", "app:app"], cwd=APP_DIR, env=env
+    )
+    try:
+        startup_seconds = wait_until_ready(f"http://127.0.0.1:{port}/", timeout)
+        time.sleep(2)  # let every worker finish booting
+        master = read_memory_kb(proc.pid)
+        worker_stats = [read_memory_kb(pid) for pid in child_pids(proc.pid)]
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+    n = max(len(worker_stats), 1)
+    total_pss = master["pss_kb"] + sum(w["pss_kb"] for w in worker_stats)
+    return {
+        "preload": preload,
+        "workers": len(worker_stats),
+        "startup_seconds": startup_seconds,
+        "master": master,
+        "worker_mean_pss_mb": sum(w["pss_kb"] for w in worker_stats) / n / 1024,
+        "worker_mean_rss_mb": sum(w["rss_kb"] for w in worker_stats) / n / 1024,
+        "total_pss_mb": total_pss / 1024,
+    }
+
+
+def main():
+    """Compare per-process loading against preload-and-fork."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--output", type=Path, default=Path("worker_memory.json"))
+    args = parser.parse_args()
+
+    results = [
+        measure(preload, args.workers, args.port, args.timeout)
+        for preload in (False, True)
+    ]
+
+    print(
+        f"\n{'mode':<10} {'workers':>7} {'PSS/worker':>11} {'RSS/worker':>11} "
+        f"{'total PSS':>10} {'startup':>8}"
+    )
+    for r in results:
+        mode = "preload" if r["preload"] else "per-proc"
+        print(
+            f"{mode:<10} {r['workers']:>7} {r['worker_mean_pss_mb']:>9.0f}MB "
+            f"{r['worker_mean_rss_mb']:>9.0f}MB {r['total_pss_mb']:>8.0f}MB "
+            f"{r['startup_seconds']:>7.1f}s"
+        )
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
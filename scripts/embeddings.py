@@ -11,12 +11,14 @@ import sqlite3
 import numpy as np
 import torch
 import clip
-from PIL import Image
 from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 import faiss
 from pathlib import Path
 
+from vibecheck.embeddings.prefetch import ImagePrefetcher
+from vibecheck.index import build_index, load_index_config
+
 # ==============================================================================
 # CONFIG
 # ==============================================================================
@@ -33,6 +35,12 @@ DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 # How many images to use per restaurant (average their embeddings)
 MAX_IMAGES_PER_RESTAURANT = 5
 
+# Texts / images per model forward pass
+BATCH_SIZE = 64
+
+# Threads decoding + preprocessing images ahead of CLIP
+NUM_WORKERS = int(os.getenv("EMBEDDING_NUM_WORKERS", 4))
+
 # ==============================================================================
 # MAIN
 # ==============================================================================
@@ -67,14 +75,16 @@ def main():
     restaurants = cursor.fetchall()
     print(f"✅ Loaded {len(restaurants)} restaurants")
     
-    # Generate embeddings
-    embeddings = []
+    # Collect texts and photo paths first so the models can run in batches
+    text_contents = []
+    photo_paths = []   # flat list of every image to embed
+    photo_owners = []  # restaurant row for each entry in photo_paths
     meta_ids = []
     
-    print("\n🔄 Generating embeddings...")
-    for restaurant_id, name, place_id in tqdm(restaurants, desc="Processing"):
+    print("\n🔄 Collecting reviews and photos...")
+    for row, (restaurant_id, name, place_id) in enumerate(tqdm(restaurants, desc="Loading")):
         
-        # ============ TEXT EMBEDDING ============
+        # ============ TEXT ============
         # Get ALL reviews for this restaurant and combine them
         cursor.execute("""
             SELECT review_text 
@@ -86,20 +96,12 @@ def main():
         
         if review_rows:
             # Combine all reviews with spaces
-            all_review_text = " ".join([r[0] for r in review_rows if r[0]])
-            text_content = all_review_text
+            text_contents.append(" ".join([r[0] for r in review_rows if r[0]]))
         else:
             # Fallback to restaurant name if no reviews
-            text_content = name or ""
-        
-        # Generate text embedding
-        text_vec = text_model.encode(
-            text_content, 
-            convert_to_numpy=True, 
-            normalize_embeddings=True
-        )
+            text_contents.append(name or "")
         
-        # ============ IMAGE EMBEDDING ============
+        # ============ IMAGES ============
         # Get ALL vibe photos for this restaurant
         cursor.execute("""
             SELECT local_filename 
@@ -108,44 +110,48 @@ def main():
             LIMIT ?
         """, (restaurant_id, MAX_IMAGES_PER_RESTAURANT))
         
-        photo_rows = cursor.fetchall()
+        for (filename,) in cursor.fetchall():
+            img_path = IMAGE_DIR / filename
+            if img_path.exists():
+                photo_paths.append(img_path)
+                photo_owners.append(row)
         
-        if photo_rows:
-            # Process multiple images and average their embeddings
-            img_vecs = []
-            
-            for (filename,) in photo_rows:
-                img_path = IMAGE_DIR / filename
-                
-                if img_path.exists():
-                    try:
-                        image = clip_preprocess(Image.open(img_path)).unsqueeze(0).to(DEVICE)
-                        with torch.no_grad():
-                            img_vec = clip_model.encode_image(image)
-                        img_vec /= img_vec.norm(dim=-1, keepdim=True)
-                        img_vec = img_vec.cpu().numpy()[0]
-                        img_vecs.append(img_vec)
-                    except Exception as e:
-                        # Skip images that fail to load
-                        continue
-            
-            if img_vecs:
-                # Average all image embeddings
-                img_vec = np.mean(img_vecs, axis=0).astype("float32")
-                # Renormalize after averaging
-                img_vec = img_vec / np.linalg.norm(img_vec)
-            else:
-                # No valid images found
-                img_vec = np.zeros((512,), dtype="float32")
-        else:
-            # No images in database
-            img_vec = np.zeros((512,), dtype="float32")
-        
-        # ============ COMBINE EMBEDDINGS ============
-        combined = np.concatenate([text_vec, img_vec]).astype("float32")
-        embeddings.append(combined)
         meta_ids.append(restaurant_id)
     
+    # ============ TEXT EMBEDDINGS ============
+    print("\n🔄 Embedding reviews...")
+    text_vecs = text_model.encode(
+        text_contents,
+        batch_size=BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=True,
+    ).astype("float32")
+    
+    # ============ IMAGE EMBEDDINGS ============
+    # Images are decoded and preprocessed on worker threads while CLIP runs
+    print(f"\n🔄 Embedding {len(photo_paths)} photos ({NUM_WORKERS} decode workers)...")
+    img_vecs = np.zeros((len(restaurants), 512), dtype="float32")
+    prefetcher = ImagePrefetcher(clip_preprocess, num_workers=NUM_WORKERS)
+    
+    with tqdm(total=len(photo_paths), desc="Photos") as progress:
+        for rows, batch in prefetcher.iter_batches(photo_paths, BATCH_SIZE):
+            with torch.no_grad():
+                batch_vecs = clip_model.encode_image(batch.to(DEVICE))
+            batch_vecs /= batch_vecs.norm(dim=-1, keepdim=True)
+            # Sum each restaurant's photo vectors (skipped images add nothing)
+            owners = [photo_owners[i] for i in rows]
+            np.add.at(img_vecs, owners, batch_vecs.cpu().numpy())
+            progress.update(len(rows))
+    
+    # Average = renormalized sum; restaurants without valid images stay zero
+    norms = np.linalg.norm(img_vecs, axis=1, keepdims=True)
+    has_image = norms[:, 0] > 0
+    img_vecs[has_image] /= norms[has_image]
+    
+    # ============ COMBINE EMBEDDINGS ============
+    embeddings = np.hstack([text_vecs, img_vecs])
+    
     conn.close()
     
     # Stack embeddings
@@ -154,10 +160,10 @@ def main():
     print(f"   Dimension: {embeddings.shape[1]} (text: 384 + image: 512)")
     
     # Create FAISS index
-    print("\n🔍 Building FAISS index...")
+    index_config = load_index_config()
+    print(f"\n🔍 Building FAISS index ({index_config.type})...")
     dim = embeddings.shape[1]
-    index = faiss.IndexFlatIP(dim)  # Inner product (cosine similarity)
-    index.add(embeddings)
+    index = build_index(embeddings, index_config)  # Inner product (cosine similarity)
     
     # Save everything
     print("\n💾 Saving files...")
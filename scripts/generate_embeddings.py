@@ -1,31 +1,74 @@
 """Generate embeddings for all restaurants."""
 
+import argparse
 from pathlib import Path
 
 import faiss
 import numpy as np
 
 from vibecheck.embeddings.generator import EmbeddingGenerator
+from vibecheck.embeddings.store import EmbeddingStore
+from vibecheck.index import build_index, load_index_config
 
 
 def main():
     """Generate and save embeddings."""
-    print("Generating embeddings...")
-    generator = EmbeddingGenerator()
-    embeddings, meta_ids = generator.generate_all()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-embed restaurants whose reviews or photos changed",
+    )
+    parser.add_argument(
+        "--vibe-photos",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Average up to N photos from the vibe_photos table per restaurant "
+        "instead of <id>.jpg (changes every image embedding)",
+    )
+    args = parser.parse_args()
+    photo_options = (
+        {"use_vibe_photos": True, "max_images_per_restaurant": args.vibe_photos}
+        if args.vibe_photos
+        else {}
+    )
 
-    # Save embeddings
     output_dir = Path("data/processed")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    np.save(output_dir / "vibe_embeddings.npy", embeddings)
-    np.save(output_dir / "meta_ids.npy", np.array(meta_ids))
+    if args.incremental:
+        print("Updating embeddings incrementally...")
+        generator = EmbeddingGenerator(use_mlflow=False, **photo_options)
+        store = EmbeddingStore(
+            output_dir / "vibe_embeddings.npy",
+            output_dir / "meta_ids.npy",
+            config=generator.embedding_config(),
+        )
+        stats = generator.generate_incremental(store)
+        print(
+            f"Embedded {stats['embedded']}, removed {stats['removed']}, "
+            f"unchanged {stats['unchanged']}, errors {stats['errors']}"
+        )
+        index_path = output_dir / "vibecheck_index.faiss"
+        if not (stats["embedded"] or stats["removed"]) and index_path.exists():
+            print("✅ Embeddings already up to date")
+            return
+        store.save()
+        embeddings, meta_ids = store.embeddings, store.meta_ids
+    else:
+        print("Generating embeddings...")
+        generator = EmbeddingGenerator(**photo_options)
+        embeddings, meta_ids = generator.generate_all()
+
+        # Save embeddings
+        np.save(output_dir / "vibe_embeddings.npy", embeddings)
+        np.save(output_dir / "meta_ids.npy", np.array(meta_ids))
 
     # Create FAISS index
-    print("Building FAISS index...")
-    dim = embeddings.shape[1]
-    index = faiss.IndexFlatIP(dim)
-    index.add(embeddings)
+    config = load_index_config()
+    print(f"Building FAISS index ({config.type})...")
+    index = build_index(embeddings, config)
     faiss.write_index(index, str(output_dir / "vibecheck_index.faiss"))
 
     print(f"✅ Saved {len(meta_ids)} embeddings to {output_dir}")
@@ -11,6 +11,8 @@ import json
 import sqlite3
 from pathlib import Path
 
+from vibecheck.schema import build_restaurant_cards, migrate_schema
+
 # ==============================================================================
 # CONFIG
 # ==============================================================================
@@ -187,6 +189,14 @@ def main():
     print("\n📥 Loading data into database...")
     stats = load_data_to_db(conn, data)
     
+    # Indexes for the app's lookups, built once after the bulk insert
+    print("\n🔧 Creating indexes and analyzing tables...")
+    migrate_schema(conn)
+    
+    # Denormalized per-restaurant cards for one-lookup search hydration
+    print("\n🗂️  Building restaurant cards...")
+    stats["cards"] = build_restaurant_cards(conn)
+    
     conn.close()
     
     # Print summary
@@ -197,6 +207,7 @@ def main():
     print(f"📝 Reviews: {stats['reviews']}")
     print(f"📷 Photos: {stats['photos']}")
     print(f"✨ Vibe entries: {stats['vibes']}")
+    print(f"🗂️  Restaurant cards: {stats['cards']}")
     print(f"\n📁 Database: {DB_PATH}")
     print("\nYou can now query the database with:")
     print(f"  sqlite3 {DB_PATH}")
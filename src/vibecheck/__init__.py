@@ -1,13 +1,23 @@
 """
 VibeCheck - Restaurant recommendation based on visual aesthetics.
+
+Importing the package is cheap: heavy dependencies (torch, CLIP, FAISS,
+sentence-transformers, ...) are only imported when the modules that need them
+are, e.g. on first access to ``vibecheck.VibeCheckRecommender``.
 """
 
+from typing import TYPE_CHECKING
+
 __version__ = "0.1.0"
 
 from vibecheck.logging_config import get_logger, setup_logging
-from vibecheck.recommender import VibeCheckRecommender
 from vibecheck.utils import hello_vibecheck, validate_restaurant_name
 
+if TYPE_CHECKING:
+    from vibecheck.recommender import VibeCheckRecommender
+
+_LAZY_ATTRIBUTES = {"VibeCheckRecommender": "vibecheck.recommender"}
+
 __all__ = [
     "VibeCheckRecommender",
     "hello_vibecheck",
@@ -15,3 +25,17 @@ __all__ = [
     "setup_logging",
     "get_logger",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value  # later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -4,16 +4,12 @@
 
 from pathlib import Path
 
-import hdbscan
-import mlflow
 import numpy as np
 import pandas as pd
-import umap
 from tqdm import tqdm
 
 from vibecheck.database import RestaurantDatabase
 from vibecheck.logging_config import get_logger
-from vibecheck.mlflow_config import MLFlowConfig
 
 logger = get_logger(__name__)
 
@@ -29,16 +25,22 @@ class VibeMapper:
         meta_ids_path: Path = Path("data/restaurants_info/meta_ids.npy"),
         db_path: Path = Path("data/restaurants_info/restaurants.db"),
         use_mlflow: bool = True,
+        mmap: bool = False,
     ):
-        """Initialize mapper with embeddings and metadata."""
+        """Initialize mapper with embeddings and metadata.
+
+        Set ``mmap`` to page the embeddings in from disk on demand rather
+        than reading the whole ``.npy`` file up front.
+        """
         logger.info("Initializing VibeMapper")
 
+        mmap_mode = "r" if mmap else None
         logger.debug(f"Loading embeddings from: {embeddings_path}")
-        self.embeddings = np.load(embeddings_path)
+        self.embeddings = np.load(embeddings_path, mmap_mode=mmap_mode)
         logger.info(f"Loaded embeddings: shape={self.embeddings.shape}")
 
         logger.debug(f"Loading meta_ids from: {meta_ids_path}")
-        self.meta_ids = np.load(meta_ids_path)
+        self.meta_ids = np.load(meta_ids_path, mmap_mode=mmap_mode)
         logger.info(f"Loaded {len(self.meta_ids)} restaurant IDs")
 
         self.db = RestaurantDatabase(db_path)
@@ -63,12 +65,20 @@ class VibeMapper:
         Returns:
             DataFrame with columns: id, x, y, cluster, name, rating, categories.
         """
+        # Slow to import (numba compilation), so only when a map is built
+        import hdbscan
+        import umap
+
         logger.info("Creating vibe map")
         logger.debug(f"UMAP params: n_neighbors={n_neighbors}, min_dist={min_dist}")
         logger.debug(f"HDBSCAN params: min_cluster_size={min_cluster_size}")
 
         # Start MLFlow run if enabled
         if self.use_mlflow:
+            import mlflow
+
+            from vibecheck.mlflow_config import MLFlowConfig
+
             experiment_id = MLFlowConfig.get_or_create_experiment(
                 MLFlowConfig.VIBE_MAPPING_EXPERIMENT
             )
@@ -0,0 +1,20 @@
+"""Helpers for the VibeCheck web services."""
+
+from vibecheck.api.batching import MicroBatcher
+from vibecheck.api.executor import ExecutorOverloaded, InferenceExecutor
+from vibecheck.api.wire import (
+    UnsupportedMediaType,
+    decode_matrix,
+    encode_matrix,
+    negotiate,
+)
+
+__all__ = [
+    "ExecutorOverloaded",
+    "InferenceExecutor",
+    "MicroBatcher",
+    "UnsupportedMediaType",
+    "decode_matrix",
+    "encode_matrix",
+    "negotiate",
+]
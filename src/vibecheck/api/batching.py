@@ -0,0 +1,140 @@
+"""Dynamic micro-batching of concurrent requests into single model calls."""
+
+import asyncio
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Generic, TypeVar
+
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collect concurrent single-item requests and process them as one batch.
+
+    The first request in a batch waits at most ``max_wait_ms`` for others to
+    arrive (or until ``max_batch_size`` items are queued); the whole batch
+    then goes through ``process`` in one call on a worker thread. While a
+    batch is running the next one accumulates, so under load batches fill
+    up on their own and the wait only costs latency when traffic is light.
+
+    Args:
+        process: Maps a list of items to a sequence of results, one per item
+            and in the same order (e.g. one ``model.encode`` call).
+        max_batch_size: Largest batch handed to ``process``.
+        max_wait_ms: Longest a request waits for a batch to fill.
+        executor: Where ``process`` runs; defaults to a single thread, since
+            the model call already uses every core.
+
+    Example:
+        >>> batcher = MicroBatcher(
+        ...     lambda texts: model.encode(texts, normalize_embeddings=True),
+        ...     max_batch_size=32,
+        ...     max_wait_ms=5,
+        ... )
+        >>> vector = await batcher.submit("cozy cafe")
+    """
+
+    def __init__(
+        self,
+        process: Callable[[list[T]], Sequence[R]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        executor: Executor | None = None,
+    ):
+        """Configure the batcher; the worker task starts on first use."""
+        self.process = process
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="micro-batch"
+        )
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._batches = 0
+        self._items = 0
+
+    async def submit(self, item: T) -> R:
+        """Queue one item and wait for its result."""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def submit_many(self, items: Sequence[T]) -> list[R]:
+        """
+        Queue many items at once and wait for all of their results.
+
+        They are split into batches of at most ``max_batch_size`` and share
+        the model thread fairly with single-item requests.
+        """
+        return list(await asyncio.gather(*(self.submit(item) for item in items)))
+
+    async def _next_batch(self) -> list[tuple[T, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:  # noqa: UP041 (not builtin on 3.10)
+                break
+        # Callers that gave up (client disconnected) don't need computing.
+        return [(item, future) for item, future in batch if not future.done()]
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self.process, items
+                )
+            except Exception as e:
+                logger.error(f"Batch of {len(items)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._batches += 1
+            self._items += len(items)
+            for (_, future), result in zip(batch, results, strict=True):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> dict[str, Any]:
+        """Report how many batches ran and their average size."""
+        return {
+            "batches": self._batches,
+            "items": self._items,
+            "mean_batch_size": self._items / self._batches if self._batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def close(self) -> None:
+        """Stop the worker task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,130 @@
+"""Bounded thread pool for running blocking inference from async handlers."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+import numpy as np
+
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutorOverloaded(RuntimeError):
+    """Raised when the inference queue is full; callers should return 503."""
+
+
+class InferenceExecutor:
+    """
+    Run model inference, FAISS and SQLite work off the event loop, with a cap.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` more
+    wait for a worker. Anything beyond that is rejected immediately with
+    :class:`ExecutorOverloaded` instead of piling up latency for everyone.
+    The time each job spends queued is recorded so saturation is visible
+    before requests start failing.
+
+    Args:
+        max_workers: Concurrent jobs. Torch already parallelizes inside one
+            forward pass, so this is usually small.
+        max_queue: Jobs allowed to wait for a worker before rejecting.
+        window: Number of recent queue-wait samples kept for percentiles.
+
+    Example:
+        >>> inference = InferenceExecutor(max_workers=2, max_queue=16)
+        >>> results = await inference.run(recommender.search_by_text, "cozy cafe")
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 16, window: int = 1024):
+        """Create the worker pool."""
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="inference"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0  # queued + running
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._waits: deque[float] = deque(maxlen=window)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run ``fn(*args, **kwargs)`` on the pool and await its result.
+
+        Raises:
+            ExecutorOverloaded: If ``max_workers + max_queue`` jobs are
+                already pending.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorOverloaded(
+                    f"Inference queue full ({self._pending} pending)"
+                )
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def job() -> T:
+            with self._lock:
+                self._waits.append(time.perf_counter() - submitted)
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        def release(_: Future) -> None:
+            # Also runs for jobs cancelled before starting (client went away).
+            with self._lock:
+                self._pending -= 1
+
+        future = self._pool.submit(job)
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report load and queue-wait time.
+
+        Returns:
+            Dictionary with ``running``, ``queued``, ``completed``,
+            ``rejected`` counts and ``queue_wait_ms_p50/p95/max`` over the
+            recent window.
+        """
+        with self._lock:
+            waits = np.fromiter(self._waits, dtype="float64") * 1000
+            running, pending = self._running, self._pending
+            completed, rejected = self._completed, self._rejected
+
+        if waits.size:
+            p50, p95, worst = np.percentile(waits, [50, 95, 100])
+        else:
+            p50 = p95 = worst = 0.0
+
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": pending - running,
+            "completed": completed,
+            "rejected": rejected,
+            "queue_wait_ms_p50": float(p50),
+            "queue_wait_ms_p95": float(p95),
+            "queue_wait_ms_max": float(worst),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and shut the pool down."""
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,149 @@
+"""Compact binary encodings for embedding matrices sent between services."""
+
+import json
+import struct
+from io import BytesIO
+
+import numpy as np
+
+# Raw format: 16-byte little-endian header, then row-major little-endian data.
+#   magic (4s) | version (B) | dtype code (B) | reserved (H) | rows (I) | cols (I)
+RAW_MEDIA_TYPE = "application/octet-stream"
+NPY_MEDIA_TYPE = "application/x-npy"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+JSON_MEDIA_TYPE = "application/json"
+
+MEDIA_TYPES = (RAW_MEDIA_TYPE, NPY_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, JSON_MEDIA_TYPE)
+
+_MAGIC = b"VCEM"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBHII")
+_DTYPE_CODES = {"float32": 1, "float16": 2}
+_DTYPES_BY_CODE = {code: name for name, code in _DTYPE_CODES.items()}
+
+
+class UnsupportedMediaType(ValueError):
+    """Raised when no acceptable encoding can be produced (HTTP 406)."""
+
+
+def negotiate(accept: str | None) -> tuple[str, str]:
+    """
+    Pick a media type and dtype from an ``Accept`` header.
+
+    The dtype is read from a ``dtype`` media-type parameter, e.g.
+    ``application/octet-stream; dtype=float16``. Entries are tried in
+    ``q`` order; ``*/*`` or a missing header selects raw float32.
+
+    Returns:
+        Tuple of (media type, dtype name).
+
+    Raises:
+        UnsupportedMediaType: If nothing in the header can be produced.
+    """
+    if not accept:
+        return RAW_MEDIA_TYPE, "float32"
+
+    candidates = []
+    for position, entry in enumerate(accept.split(",")):
+        media_type, *params = (part.strip() for part in entry.split(";"))
+        options = dict(p.split("=", 1) for p in params if "=" in p)
+        try:
+            quality = float(options.get("q", 1))
+        except ValueError:
+            quality = 0.0
+        candidates.append((-quality, position, media_type.lower(), options))
+
+    for neg_quality, _, media_type, options in sorted(candidates):
+        if neg_quality == 0:
+            continue
+        if media_type in ("*/*", "application/*"):
+            media_type = RAW_MEDIA_TYPE
+        dtype = options.get("dtype", "float32").lower()
+        if media_type in MEDIA_TYPES and dtype in _DTYPE_CODES:
+            if media_type == MSGPACK_MEDIA_TYPE and not _has_msgpack():
+                continue
+            return media_type, dtype
+
+    raise UnsupportedMediaType(
+        f"Cannot produce any of: {accept}. Supported: {', '.join(MEDIA_TYPES)}"
+    )
+
+
+def _has_msgpack() -> bool:
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def encode_matrix(
+    matrix: np.ndarray, media_type: str = RAW_MEDIA_TYPE, dtype: str = "float32"
+) -> bytes:
+    """
+    Serialize a 2-D embedding matrix.
+
+    Args:
+        matrix: Array of shape (rows, cols).
+        media_type: One of :data:`MEDIA_TYPES`.
+        dtype: ``float32`` or ``float16`` (half the bytes, ~3 significant
+            digits, plenty for normalized embeddings).
+
+    Returns:
+        The encoded payload.
+    """
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a 2-D matrix, got shape {matrix.shape}")
+    data = np.ascontiguousarray(matrix, dtype=np.dtype(dtype).newbyteorder("<"))
+    rows, cols = data.shape
+
+    if media_type == RAW_MEDIA_TYPE:
+        header = _HEADER.pack(_MAGIC, _VERSION, _DTYPE_CODES[dtype], 0, rows, cols)
+        return header + data.tobytes()
+    if media_type == NPY_MEDIA_TYPE:
+        buffer = BytesIO()
+        np.save(buffer, data, allow_pickle=False)
+        return buffer.getvalue()
+    if media_type == MSGPACK_MEDIA_TYPE:
+        import msgpack
+
+        return msgpack.packb(
+            {"shape": [rows, cols], "dtype": dtype, "data": data.tobytes()}
+        )
+    if media_type == JSON_MEDIA_TYPE:
+        body = {"shape": [rows, cols], "embeddings": data.tolist()}
+        return json.dumps(body).encode()
+    raise UnsupportedMediaType(f"Unsupported media type: {media_type}")
+
+
+def decode_matrix(payload: bytes, media_type: str = RAW_MEDIA_TYPE) -> np.ndarray:
+    """
+    Inverse of :func:`encode_matrix`; always returns float32.
+
+    Args:
+        payload: Encoded bytes.
+        media_type: The response ``Content-Type`` (parameters are ignored).
+    """
+    media_type = media_type.split(";")[0].strip().lower()
+
+    if media_type == RAW_MEDIA_TYPE:
+        magic, version, code, _, rows, cols = _HEADER.unpack_from(payload)
+        if magic != _MAGIC or version != _VERSION or code not in _DTYPES_BY_CODE:
+            raise ValueError("Not a VibeCheck embedding payload")
+        dtype = np.dtype(_DTYPES_BY_CODE[code]).newbyteorder("<")
+        matrix = np.frombuffer(payload, dtype=dtype, offset=_HEADER.size)
+        return matrix.reshape(rows, cols).astype("float32")
+    if media_type == NPY_MEDIA_TYPE:
+        return np.load(BytesIO(payload), allow_pickle=False).astype("float32")
+    if media_type == MSGPACK_MEDIA_TYPE:
+        import msgpack
+
+        body = msgpack.unpackb(payload)
+        dtype = np.dtype(body["dtype"]).newbyteorder("<")
+        matrix = np.frombuffer(body["data"], dtype=dtype)
+        return matrix.reshape(body["shape"]).astype("float32")
+    if media_type == JSON_MEDIA_TYPE:
+        body = json.loads(payload)
+        matrix = np.asarray(body["embeddings"], dtype="float32")
+        return matrix.reshape(body["shape"])
+    raise UnsupportedMediaType(f"Unsupported media type: {media_type}")
@@ -0,0 +1,175 @@
+"""Bounded in-process caches for query embeddings and search results."""
+
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def default_sizeof(value: Any) -> int:
+    """Approximate memory footprint of a cached value in bytes."""
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    return sys.getsizeof(value)
+
+
+def content_key(data: bytes) -> str:
+    """Hash raw bytes (e.g. an uploaded image) into a compact cache key."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the counters plus ``hit_rate`` as a plain dictionary."""
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by entry count and total bytes, with TTL.
+
+    Entries are evicted least-recently-used first whenever either limit is
+    exceeded, and treated as missing once they are older than ``ttl`` seconds.
+
+    Args:
+        max_entries: Maximum number of entries (0 disables caching).
+        max_bytes: Optional cap on the summed ``sizeof`` of all values.
+        ttl: Optional time-to-live in seconds.
+        sizeof: Function returning a value's size in bytes.
+
+    Example:
+        >>> cache = LRUCache(max_entries=2)
+        >>> cache.put("cozy cafe", 1)
+        >>> cache.get("cozy cafe")
+        1
+        >>> cache.stats().hits
+        1
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        sizeof: Callable[[Any], int] = default_sizeof,
+    ):
+        """Create an empty cache."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+
+        # key -> (value, size, inserted_at)
+        self._data: OrderedDict[Hashable, tuple[Any, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry: tuple[Any, int, float]) -> bool:
+        return self.ttl is not None and time.monotonic() - entry[2] > self.ttl
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return default
+
+            if self._expired(entry):
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or replace ``key``, evicting old entries to stay in bounds."""
+        if self.max_entries <= 0:
+            return
+
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            logger.debug(f"Value of {size} bytes exceeds cache budget, not cached")
+            return
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+            self._data[key] = (value, size, time.monotonic())
+            self._bytes += size
+
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self._stats.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value, computing and storing it on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                expirations=self._stats.expirations,
+                entries=len(self._data),
+                bytes=self._bytes,
+            )
@@ -41,6 +41,7 @@ class VibeCheckClient:
         self._index = None
         self._embeddings = None
         self._metadata = None
+        self._recommender = None
 
     def collect_restaurant_images(
         self,
@@ -90,18 +91,44 @@ class VibeCheckClient:
             "search_terms_used": search_terms,
         }
 
+    def _get_recommender(self):
+        """Create the live-index recommender over ``data_dir`` on first use."""
+        if self._recommender is None:
+            from vibecheck.recommender import VibeCheckRecommender
+
+            self._recommender = VibeCheckRecommender(
+                db_path=self.data_dir / "restaurants_info" / "restaurants.db",
+                image_dir=self.data_dir / "images" / "sample_images",
+                faiss_index_path=self.data_dir / "embeddings" / "vibecheck_index.faiss",
+                meta_ids_path=self.data_dir / "restaurants_info" / "meta_ids.npy",
+                live_index_path=self.data_dir
+                / "embeddings"
+                / "vibecheck_live_index.faiss",
+            )
+        return self._recommender
+
     def add_restaurant(
-        self, restaurant_name: str, image_paths: list[Path] | None = None
+        self,
+        restaurant_name: str,
+        image_paths: list[Path] | None = None,
+        restaurant_id: int | None = None,
+        text: str | None = None,
     ) -> bool:
         """
         Add a restaurant to the VibeCheck system.
 
-        This method processes restaurant images and adds them to the searchable index.
+        This method embeds the restaurant's review text and images and inserts
+        them into the live searchable index, so it is searchable immediately
+        without rebuilding the index or restarting servers. Calling it again
+        for the same restaurant replaces its embedding.
 
         Args:
             restaurant_name: Name of the restaurant to add.
-            image_paths: Optional list of image paths. If not provided,
-                images will be collected automatically.
+            image_paths: Optional list of image paths.
+            restaurant_id: Integer restaurant id. Looked up by name in the
+                database if not provided.
+            text: Review text to embed. Defaults to the database review
+                snippet, or the name if there is none.
 
         Returns:
             True if restaurant was successfully added, False otherwise.
@@ -114,9 +141,42 @@ class VibeCheckClient:
         if not restaurant_name or not restaurant_name.strip():
             return False
 
-        # Placeholder implementation
+        recommender = self._get_recommender()
+        if restaurant_id is None:
+            restaurant_id = recommender.db.find_restaurant_id(restaurant_name)
+            if restaurant_id is None:
+                return False
+
+        if text is None:
+            row = recommender.db.get_restaurant(restaurant_id)
+            text = (row or {}).get("review_snippet") or restaurant_name
+
+        from PIL import Image
+
+        try:
+            images = [Image.open(path).convert("RGB") for path in image_paths or []]
+            recommender.add_restaurant(restaurant_id, text=text, images=images)
+        except (OSError, ValueError):
+            return False
         return True
 
+    def remove_restaurant(self, restaurant_id: int) -> bool:
+        """
+        Remove a restaurant from the live searchable index.
+
+        Args:
+            restaurant_id: Integer restaurant id.
+
+        Returns:
+            True if the restaurant was removed, False if it was not indexed.
+
+        Example:
+            >>> client = VibeCheckClient()
+            >>> client.remove_restaurant(1234)
+            True
+        """
+        return self._get_recommender().remove_restaurant(restaurant_id)
+
     def get_similar_restaurants(
         self,
         restaurant_name: str,
@@ -1,15 +1,175 @@
 """Database operations for VibeCheck."""
 
+import os
+import queue
 import sqlite3
+import threading
+from collections.abc import Callable, Iterable
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
+from urllib.parse import quote
 
 from vibecheck.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+class ConnectionPool:
+    """
+    Thread-safe pool of read-only SQLite connections.
+
+    Connections are opened lazily (``mode=ro``, ``query_only``), tuned with
+    ``mmap_size``/``cache_size`` and handed out one thread at a time, so
+    concurrent requests reuse warm page caches and each connection's
+    prepared-statement cache instead of paying for a connect per call. A pool
+    inherited across ``fork()`` discards the parent's connections.
+
+    Read-only connections cannot change the journal mode, so the database
+    should already be in WAL mode (:func:`vibecheck.schema.migrate_schema`
+    switches it) for readers not to block on, or be blocked by, a writer.
+    The first connection logs a warning if it is not.
+
+    Args:
+        db_path: SQLite database file (must exist).
+        size: Maximum number of open connections; callers beyond that wait.
+        immutable: Open with ``immutable=1``: no locking or change detection
+            at all. Only for files that never change while open (e.g. baked
+            into an image or on a read-only mount); otherwise readers may see
+            corrupt data after a write.
+        mmap_size: Bytes of the file to memory-map per connection.
+        cache_size_kib: Page cache per connection, in KiB.
+        cached_statements: Prepared statements kept per connection.
+        row_factory: Optional ``row_factory`` for every connection
+            (e.g. ``sqlite3.Row``).
+        timeout: Seconds to wait for a free connection (and for locks).
+
+    Example:
+        >>> pool = ConnectionPool("data/vibecheck.db", size=4)
+        >>> with pool.connection() as conn:
+        ...     conn.execute("SELECT COUNT(*) FROM restaurants").fetchone()
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        size: int = 4,
+        immutable: bool = False,
+        mmap_size: int = 256 * 1024 * 1024,
+        cache_size_kib: int = 16 * 1024,
+        cached_statements: int = 256,
+        row_factory: Callable | None = None,
+        timeout: float = 5.0,
+    ):
+        """Create an empty pool; connections open on first use."""
+        self.db_path = Path(db_path)
+        self.size = size
+        self.immutable = immutable
+        self.mmap_size = mmap_size
+        self.cache_size_kib = cache_size_kib
+        self.cached_statements = cached_statements
+        self.row_factory = row_factory
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._journal_checked = immutable  # immutable files are never written
+        self._reset()
+
+    def _reset(self) -> None:
+        # Connections from an older generation are closed when returned
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._pid = os.getpid()
+        self._generation += 1
+
+    def _connect(self) -> sqlite3.Connection:
+        uri = f"file:{quote(str(self.db_path.resolve()))}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        logger.debug(f"Opening pooled read-only connection: {uri}")
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=self.timeout,
+            check_same_thread=False,  # used by one thread at a time
+            cached_statements=self.cached_statements,
+        )
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kib)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        if not self._journal_checked:
+            self._journal_checked = True
+            (journal_mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+            if journal_mode.lower() != "wal":
+                logger.warning(
+                    f"{self.db_path} uses journal_mode={journal_mode}, not WAL: "
+                    "pooled readers and writers will block each other. Run "
+                    "vibecheck.schema.migrate_schema on it once."
+                )
+        if self.row_factory is not None:
+            conn.row_factory = self.row_factory
+        return conn
+
+    def _acquire(self) -> tuple[sqlite3.Connection, int]:
+        with self._lock:
+            if self._pid != os.getpid():
+                # SQLite connections must not be shared with a forked child
+                self._reset()
+            generation, idle = self._generation, self._idle
+            try:
+                return idle.get_nowait(), generation
+            except queue.Empty:
+                opening = self._opened < self.size
+                if opening:
+                    self._opened += 1
+
+        if opening:
+            try:
+                return self._connect(), generation
+            except sqlite3.Error:
+                with self._lock:
+                    if generation == self._generation:
+                        self._opened -= 1
+                raise
+        try:
+            return idle.get(timeout=self.timeout), generation
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"No free database connection after {self.timeout}s "
+                f"(pool size {self.size})"
+            ) from None
+
+    def _release(self, conn: sqlite3.Connection, generation: int) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if generation == self._generation:
+                self._idle.put(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of the ``with`` block."""
+        conn, generation = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn, generation)
+
+    def close(self) -> None:
+        """Close idle connections (borrowed ones close when returned)."""
+        with self._lock:
+            idle = self._idle
+            self._reset()
+        while True:
+            try:
+                idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
 class RestaurantDatabase:
     """
     Interface for restaurant database operations.
@@ -20,9 +180,39 @@ class RestaurantDatabase:
         >>> print(info['name'])
     """
 
-    def __init__(self, db_path: Path = Path("data/restaurants_info/restaurants.db")):
-        """Initialize database connection."""
+    # Stay well under SQLite's default host-parameter limit for IN (...) lookups.
+    MAX_IN_PARAMS = 900
+
+    def __init__(
+        self,
+        db_path: Path = Path("data/restaurants_info/restaurants.db"),
+        persistent: bool = False,
+        pool_size: int = 0,
+        immutable: bool = False,
+    ):
+        """
+        Initialize database connection.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            persistent: Reuse one connection for every call instead of opening
+                a new one each time. Access is serialized with a lock so the
+                connection can be shared between threads.
+            pool_size: Serve calls from a :class:`ConnectionPool` of up to this
+                many read-only connections, so threads read concurrently
+                (takes precedence over ``persistent``; 0 disables).
+            immutable: Open pooled connections with ``immutable=1``; only for
+                database files that never change while the process runs.
+        """
         self.db_path = Path(db_path)
+        self.persistent = persistent
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._pool = (
+            ConnectionPool(self.db_path, size=pool_size, immutable=immutable)
+            if pool_size > 0
+            else None
+        )
         logger.info(f"Initialized database connection: {self.db_path}")
 
         if not self.db_path.exists():
@@ -31,6 +221,19 @@ class RestaurantDatabase:
     @contextmanager
     def get_connection(self):
         """Context manager for database connections."""
+        if self._pool is not None:
+            with self._pool.connection() as conn:
+                yield conn
+            return
+
+        if self.persistent:
+            with self._lock:
+                if self._conn is None:
+                    logger.debug(f"Opening persistent connection: {self.db_path}")
+                    self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                yield self._conn
+            return
+
         logger.debug(f"Opening database connection: {self.db_path}")
         conn = sqlite3.connect(self.db_path)
         try:
@@ -39,6 +242,16 @@ class RestaurantDatabase:
             conn.close()
             logger.debug("Database connection closed")
 
+    def close(self) -> None:
+        """Close the persistent connection or pooled connections, if open."""
+        if self._pool is not None:
+            self._pool.close()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                logger.debug("Persistent connection closed")
+
     def get_restaurant(self, restaurant_id: str) -> dict[str, Any] | None:
         """
         Get restaurant information by ID.
@@ -79,6 +292,27 @@ class RestaurantDatabase:
             logger.error(f"Database error fetching restaurant {restaurant_id}: {e}")
             return None
 
+    def find_restaurant_id(self, name: str) -> Any | None:
+        """
+        Look up a restaurant id by exact name.
+
+        Args:
+            name: Restaurant name.
+
+        Returns:
+            The id of the first matching restaurant, or None if not found.
+        """
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT id FROM restaurants WHERE name=? LIMIT 1", (name,)
+                ).fetchone()
+            return row[0] if row else None
+
+        except sqlite3.Error as e:
+            logger.error(f"Database error looking up restaurant {name!r}: {e}")
+            return None
+
     def get_all_restaurants(self) -> list[dict[str, Any]]:
         """Get all restaurants from database."""
         logger.info("Fetching all restaurants from database")
@@ -105,3 +339,131 @@ class RestaurantDatabase:
         except sqlite3.Error as e:
             logger.error(f"Database error fetching all restaurants: {e}")
             return []
+
+    def get_restaurants(
+        self, restaurant_ids: Iterable[Any], strict: bool = False
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get information for many restaurants with set-based ``IN`` queries.
+
+        Args:
+            restaurant_ids: Restaurant identifiers (numpy scalars are accepted).
+            strict: Raise database errors instead of logging them and
+                returning an empty mapping.
+
+        Returns:
+            Mapping of ``str(id)`` to the same dictionaries returned by
+            :meth:`get_restaurant`. Missing ids are simply absent.
+
+        Raises:
+            sqlite3.Error: On database errors, if ``strict``.
+
+        Example:
+            >>> db = RestaurantDatabase(persistent=True)
+            >>> found = db.get_restaurants(["id_1", "id_2"])
+            >>> found["id_1"]["name"]
+        """
+        ids = list(
+            dict.fromkeys(
+                rid.item() if hasattr(rid, "item") else rid for rid in restaurant_ids
+            )
+        )
+        logger.debug(f"Fetching {len(ids)} restaurants")
+        if not ids:
+            return {}
+
+        results: dict[str, dict[str, Any]] = {}
+        try:
+            with self.get_connection() as conn:
+                for start in range(0, len(ids), self.MAX_IN_PARAMS):
+                    chunk = ids[start : start + self.MAX_IN_PARAMS]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        "SELECT id, name, rating, address, image_url, categories, review_snippet "
+                        f"FROM restaurants WHERE id IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+
+                    for row in rows:
+                        results[str(row[0])] = {
+                            "id": row[0],
+                            "name": row[1],
+                            "rating": row[2],
+                            "address": row[3],
+                            "image_url": row[4],
+                            "categories": row[5],
+                            "review_snippet": row[6],
+                        }
+
+        except sqlite3.Error as e:
+            logger.error(f"Database error fetching {len(ids)} restaurants: {e}")
+            if strict:
+                raise
+            return {}
+
+        logger.debug(f"Found {len(results)}/{len(ids)} restaurants")
+        return results
+
+    def get_photo_filenames(
+        self, limit_per_restaurant: int = 5
+    ) -> dict[str, list[str]]:
+        """
+        Get downloaded vibe photo filenames for every restaurant in one query.
+
+        Args:
+            limit_per_restaurant: Maximum filenames returned per restaurant.
+
+        Returns:
+            Mapping of ``str(restaurant_id)`` to filenames in insertion order.
+            Empty if the database has no ``vibe_photos`` table.
+        """
+        logger.debug("Fetching vibe photo filenames")
+
+        try:
+            with self.get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT restaurant_id, local_filename FROM vibe_photos "
+                    "WHERE local_filename IS NOT NULL ORDER BY restaurant_id, id"
+                ).fetchall()
+
+        except sqlite3.Error as e:
+            logger.debug(f"No vibe photos available: {e}")
+            return {}
+
+        photos: dict[str, list[str]] = {}
+        for restaurant_id, filename in rows:
+            files = photos.setdefault(str(restaurant_id), [])
+            if len(files) < limit_per_restaurant:
+                files.append(filename)
+
+        logger.debug(f"Found photos for {len(photos)} restaurants")
+        return photos
+
+    def get_restaurant_photo_filenames(
+        self, restaurant_id: Any, limit: int = 5
+    ) -> list[str]:
+        """
+        Get one restaurant's downloaded vibe photo filenames.
+
+        Args:
+            restaurant_id: Restaurant identifier.
+            limit: Maximum filenames returned.
+
+        Returns:
+            Filenames in insertion order; empty if there are none or the
+            database has no ``vibe_photos`` table.
+        """
+        try:
+            with self.get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT local_filename FROM vibe_photos "
+                    "WHERE restaurant_id = ? AND local_filename IS NOT NULL "
+                    "ORDER BY id LIMIT ?",
+                    (restaurant_id, limit),
+                ).fetchall()
+
+        except sqlite3.Error as e:
+            logger.debug(f"No vibe photos available: {e}")
+            return []
+
+        return [filename for (filename,) in rows]
@@ -0,0 +1,204 @@
+"""Query encoders: in-process models or a remote ml_service."""
+
+from abc import ABC, abstractmethod
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TEXT_DIM = 384
+IMAGE_DIM = 512
+
+
+class Encoder(ABC):
+    """
+    Turns texts and images into normalized embeddings.
+
+    ``VibeCheckRecommender`` only talks to an encoder, so whether the models
+    run in the same process (:class:`LocalEncoder`) or on a separate model
+    tier (:class:`RemoteEncoder`) is a deployment choice.
+    """
+
+    @abstractmethod
+    def encode_texts(self, texts: list[str]) -> np.ndarray:
+        """Return a float32 matrix of shape (N, 384)."""
+
+    @abstractmethod
+    def encode_images(self, images: list[Image.Image]) -> np.ndarray:
+        """Return a float32 matrix of shape (N, 512)."""
+
+    def encode_image_bytes(self, images: list[bytes]) -> np.ndarray:
+        """Encode encoded image files (JPEG, PNG, ...); shape (N, 512)."""
+        return self.encode_images(
+            [Image.open(BytesIO(data)).convert("RGB") for data in images]
+        )
+
+    def warm(self, text: bool = True, image: bool = True) -> None:  # noqa: B027
+        """Load whatever the requested modalities need ahead of first use."""
+
+    def loaded(self) -> dict[str, bool]:
+        """Which modalities can encode without loading anything first."""
+        return {"text_model": True, "clip_model": True}
+
+
+class LocalEncoder(Encoder):
+    """
+    Run MiniLM and CLIP in this process, via the shared :class:`ModelCache`.
+
+    Each model is loaded on first use of its modality, so a deployment that
+    only serves text queries never pays for CLIP. Call :meth:`warm` to load
+    them ahead of time instead.
+    """
+
+    def warm(self, text: bool = True, image: bool = True) -> None:
+        """Load the requested models (concurrently when both are asked for)."""
+        from vibecheck.embeddings.models import ModelCache
+
+        ModelCache.preload(text=text, clip_model=image)
+
+    def loaded(self) -> dict[str, bool]:
+        from vibecheck.embeddings.models import ModelCache
+
+        return ModelCache.loaded()
+
+    def encode_texts(self, texts: list[str]) -> np.ndarray:
+        from vibecheck.embeddings.models import ModelCache
+
+        if not texts:
+            return np.zeros((0, TEXT_DIM), dtype="float32")
+        return (
+            ModelCache.get_text_model()
+            .encode(
+                texts,
+                batch_size=len(texts),
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+            .astype("float32")
+        )
+
+    def encode_images(self, images: list[Image.Image]) -> np.ndarray:
+        import torch
+
+        from vibecheck.embeddings.models import ModelCache
+
+        if not images:
+            return np.zeros((0, IMAGE_DIM), dtype="float32")
+        clip_model, preprocess = ModelCache.get_clip_model()
+        batch = torch.stack([preprocess(img) for img in images]).to(
+            ModelCache.get_device()
+        )
+
+        with torch.no_grad():
+            img_vecs = clip_model.encode_image(batch)
+
+        img_vecs /= img_vecs.norm(dim=-1, keepdim=True)
+        return img_vecs.cpu().numpy().astype("float32")
+
+
+class RemoteEncoder(Encoder):
+    """
+    Encode through ``ml_service.py``'s ``/embed/batch`` endpoint.
+
+    Uses one pooled ``requests.Session`` (keep-alive connections), connect
+    and read timeouts, and retries with backoff on connection errors and
+    502/503/504. Inputs are sent in chunks of ``max_batch`` and responses
+    use the compact binary format from :mod:`vibecheck.api.wire`.
+
+    Args:
+        base_url: ml_service address, e.g. ``http://ml-service:8002``.
+        timeout: (connect, read) timeouts in seconds.
+        retries: Retry attempts per request.
+        backoff: Exponential backoff factor between retries, in seconds.
+        pool_size: Keep-alive connections kept per host; match the number of
+            threads that encode concurrently.
+        max_batch: Items per request (the service caps this too).
+        dtype: ``float16`` halves the transfer; vectors are returned as
+            float32 either way.
+
+    Example:
+        >>> encoder = RemoteEncoder("http://ml-service:8002")
+        >>> recommender = VibeCheckRecommender(encoder=encoder)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: tuple[float, float] = (2.0, 30.0),
+        retries: int = 3,
+        backoff: float = 0.2,
+        pool_size: int = 10,
+        max_batch: int = 256,
+        dtype: str = "float16",
+    ):
+        """Create the connection pool; nothing is sent until first use."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.url = base_url.rstrip("/") + "/embed/batch"
+        self.timeout = timeout
+        self.max_batch = max_batch
+        self.accept = f"application/octet-stream; dtype={dtype}"
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"POST"}),  # embedding is idempotent
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        logger.info(f"Remote encoder: {self.url}")
+
+    def _post(self, **kwargs) -> np.ndarray:
+        from vibecheck.api.wire import decode_matrix
+
+        response = self.session.post(
+            self.url,
+            headers={"Accept": self.accept},
+            timeout=self.timeout,
+            **kwargs,
+        )
+        response.raise_for_status()
+        return decode_matrix(response.content, response.headers["Content-Type"])
+
+    def encode_texts(self, texts: list[str]) -> np.ndarray:
+        chunks = [
+            self._post(data={"texts": texts[start : start + self.max_batch]})
+            for start in range(0, len(texts), self.max_batch)
+        ]
+        return np.vstack(chunks) if chunks else np.zeros((0, TEXT_DIM), "float32")
+
+    def encode_image_bytes(self, images: list[bytes]) -> np.ndarray:
+        chunks = [
+            self._post(
+                files=[
+                    ("images", (f"{start + i}.img", data))
+                    for i, data in enumerate(images[start : start + self.max_batch])
+                ]
+            )
+            for start in range(0, len(images), self.max_batch)
+        ]
+        return np.vstack(chunks) if chunks else np.zeros((0, IMAGE_DIM), "float32")
+
+    def encode_images(self, images: list[Image.Image]) -> np.ndarray:
+        # PNG is lossless, so the remote embedding matches a local one.
+        payloads = []
+        for image in images:
+            buffer = BytesIO()
+            image.save(buffer, format="PNG")
+            payloads.append(buffer.getvalue())
+        return self.encode_image_bytes(payloads)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
@@ -2,17 +2,17 @@
 """Generate embeddings for restaurants."""
 
 from pathlib import Path
+from typing import Any
 
-import mlflow
 import numpy as np
 import torch
-from PIL import Image
 from tqdm import tqdm
 
 from vibecheck.database import RestaurantDatabase
 from vibecheck.embeddings.models import ModelCache
+from vibecheck.embeddings.prefetch import ImagePrefetcher
+from vibecheck.embeddings.store import EmbeddingStore, fingerprint_inputs
 from vibecheck.logging_config import get_logger
-from vibecheck.mlflow_config import MLFlowConfig
 
 logger = get_logger(__name__)
 
@@ -32,13 +32,36 @@ class EmbeddingGenerator:
         db_path: Path = Path("data/restaurants_info/restaurants.db"),
         image_dir: Path = Path("data/images/sample_images"),
         use_mlflow: bool = True,
+        batch_size: int = 64,
+        max_images_per_restaurant: int = 1,
+        num_workers: int = 4,
+        use_vibe_photos: bool = False,
     ):
-        """Initialize generator with database and image directory."""
+        """
+        Initialize generator with database and image directory.
+
+        Args:
+            db_path: SQLite database with the ``restaurants`` table.
+            image_dir: Directory containing restaurant photos.
+            use_mlflow: Log parameters and metrics to MLFlow.
+            batch_size: Number of texts / images per model forward pass.
+            max_images_per_restaurant: Photos averaged into each restaurant's
+                image embedding (only more than one with ``use_vibe_photos``).
+            num_workers: Threads decoding and preprocessing images ahead of
+                the CLIP forward pass (0 decodes on the main thread).
+            use_vibe_photos: Embed the restaurant's photos from the
+                ``vibe_photos`` table, falling back to ``<image_dir>/<id>.jpg``
+                when it has none. Off by default, since it changes the image
+                half of existing embeddings.
+        """
         logger.info("Initializing EmbeddingGenerator")
 
         self.db = RestaurantDatabase(db_path)
         self.image_dir = Path(image_dir)
         self.use_mlflow = use_mlflow
+        self.batch_size = batch_size
+        self.max_images_per_restaurant = max_images_per_restaurant
+        self.use_vibe_photos = use_vibe_photos
 
         logger.debug(f"Database path: {db_path}")
         logger.debug(f"Image directory: {self.image_dir}")
@@ -51,37 +74,86 @@ class EmbeddingGenerator:
         self.text_model = ModelCache.get_text_model()
         self.clip_model, self.clip_preprocess = ModelCache.get_clip_model()
         self.device = ModelCache.get_device()
+        self.prefetcher = ImagePrefetcher(self.clip_preprocess, num_workers=num_workers)
         logger.info("Models loaded successfully")
 
     def generate_text_embedding(self, text: str) -> np.ndarray:
         """Generate embedding for text."""
         logger.debug(f"Generating text embedding for: {text[:50]}...")
-        embedding: np.ndarray = self.text_model.encode(
-            text, convert_to_numpy=True, normalize_embeddings=True
+        return self.generate_text_embeddings([text])[0]
+
+    def generate_text_embeddings(self, texts: list[str]) -> np.ndarray:
+        """
+        Generate embeddings for many texts, ``batch_size`` at a time.
+
+        Returns:
+            Normalized embedding matrix of shape (N, 384).
+        """
+        logger.debug(f"Generating {len(texts)} text embeddings")
+        if not texts:
+            return np.zeros((0, 384), dtype="float32")
+        embeddings: np.ndarray = self.text_model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
         )
-        return embedding
+        return embeddings.astype("float32")
 
     def generate_image_embedding(self, image_path: Path) -> np.ndarray:
         """Generate CLIP embedding for image."""
         logger.debug(f"Generating image embedding for: {image_path}")
+        vectors, _ = self.generate_image_embeddings([image_path])
+        return vectors[0]
 
-        try:
-            image = (
-                self.clip_preprocess(Image.open(image_path))
-                .unsqueeze(0)
-                .to(self.device)
-            )
+    def generate_image_embeddings(
+        self, image_paths: list[Path]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Generate CLIP embeddings for many images, ``batch_size`` per forward pass.
 
-            with torch.no_grad():
-                img_vec = self.clip_model.encode_image(image)
+        Args:
+            image_paths: Image files to embed.
 
-            img_vec /= img_vec.norm(dim=-1, keepdim=True)
-            result: np.ndarray = img_vec.cpu().numpy()[0]
-            return result
+        Returns:
+            Tuple of (normalized embedding matrix of shape (N, 512), boolean
+            mask of which images loaded successfully). Failed rows are zeros.
+        """
+        vectors = np.zeros((len(image_paths), 512), dtype="float32")
+        ok = np.zeros(len(image_paths), dtype=bool)
 
-        except Exception as e:
-            logger.warning(f"Error processing image {image_path}: {e}")
-            return np.zeros((512,))
+        for rows, batch in self.prefetcher.iter_batches(image_paths, self.batch_size):
+            with torch.no_grad():
+                img_vecs = self.clip_model.encode_image(batch.to(self.device))
+            img_vecs /= img_vecs.norm(dim=-1, keepdim=True)
+            vectors[rows] = img_vecs.cpu().numpy()
+            ok[rows] = True
+
+        return vectors, ok
+
+    def _photo_files(self) -> dict[str, list[str]]:
+        """Vibe photo filenames per restaurant, if ``use_vibe_photos``."""
+        if not self.use_vibe_photos:
+            return {}
+        return self.db.get_photo_filenames(self.max_images_per_restaurant)
+
+    def _image_paths(
+        self, restaurant_id: str, photo_files: dict[str, list[str]]
+    ) -> list[Path]:
+        """Photos to embed for one restaurant (vibe photos, else ``<id>.jpg``)."""
+        files = photo_files.get(str(restaurant_id))
+        if files:
+            paths = [self.image_dir / f for f in files]
+        else:
+            paths = [self.image_dir / f"{restaurant_id}.jpg"]
+        return [p for p in paths if p.exists()][: self.max_images_per_restaurant]
+
+    def _restaurant_inputs(
+        self, resto: dict[str, Any], photo_files: dict[str, list[str]]
+    ) -> tuple[str, list[Path]]:
+        """Text and photo paths to embed for one restaurant row."""
+        text = resto["review_snippet"] or resto["name"] or ""
+        return text, self._image_paths(resto["id"], photo_files)
 
     def generate_restaurant_embedding(
         self, restaurant_id: str, text: str
@@ -97,21 +169,89 @@ class EmbeddingGenerator:
             Combined embedding vector (384 text + 512 image = 896 dims).
         """
         logger.debug(f"Generating embedding for restaurant: {restaurant_id}")
+        photo_files = {}
+        if self.use_vibe_photos:
+            photo_files[str(restaurant_id)] = self.db.get_restaurant_photo_filenames(
+                restaurant_id, self.max_images_per_restaurant
+            )
+        embeddings, _ = self._embed_restaurants(
+            [text or ""], [self._image_paths(restaurant_id, photo_files)]
+        )
+        return embeddings[0]
 
-        # Text embedding
-        text_vec = self.generate_text_embedding(text or "")
+    def _embed_restaurants(
+        self, texts: list[str], image_paths: list[list[Path]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Embed many restaurants with batched text and image forward passes.
 
-        # Image embedding
-        img_path = self.image_dir / f"{restaurant_id}.jpg"
-        if img_path.exists():
-            img_vec = self.generate_image_embedding(img_path)
-        else:
-            logger.debug(f"No image found for restaurant: {restaurant_id}")
-            img_vec = np.zeros((512,))
+        Each restaurant's image vector is the renormalized mean of its
+        successfully loaded photos, or zeros if it has none.
+
+        Args:
+            texts: One text per restaurant.
+            image_paths: Each restaurant's photo files.
 
-        # Combine
-        combined: np.ndarray = np.concatenate([text_vec, img_vec]).astype("float32")
-        return combined
+        Returns:
+            Tuple of (combined (N, 896) float32 matrix, boolean mask of
+            restaurants that got at least one image).
+        """
+        text_vecs = self.generate_text_embeddings(texts)
+
+        # Flatten every restaurant's photos into one list for batched CLIP.
+        paths, owners = [], []
+        for row, restaurant_paths in enumerate(image_paths):
+            for path in restaurant_paths:
+                paths.append(path)
+                owners.append(row)
+
+        photo_vecs, ok = self.generate_image_embeddings(paths)
+
+        owners_arr = np.asarray(owners, dtype=int)[ok]
+        img_vecs = np.zeros((len(texts), 512), dtype="float32")
+        np.add.at(img_vecs, owners_arr, photo_vecs[ok])
+        norms = np.linalg.norm(img_vecs, axis=1, keepdims=True)
+        has_image = norms[:, 0] > 0
+        img_vecs[has_image] /= norms[has_image]
+
+        combined = np.hstack([text_vecs, img_vecs]).astype("float32")
+        return combined, has_image
+
+    def _embed_chunk(
+        self, ids: list[Any], texts: list[str], image_paths: list[list[Path]]
+    ) -> tuple[list[Any], np.ndarray, np.ndarray, int]:
+        """
+        Embed a chunk of restaurants, isolating the ones that fail.
+
+        The chunk is embedded in one batched call; if that raises, each
+        restaurant is retried on its own so only the failing ones are dropped.
+
+        Returns:
+            Tuple of (ids embedded, their (N, 896) vectors, has-image mask,
+            number of restaurants that failed).
+        """
+        try:
+            vectors, has_image = self._embed_restaurants(texts, image_paths)
+            return ids, vectors, has_image, 0
+        except Exception as e:
+            logger.warning(f"Batch of {len(ids)} failed ({e}), retrying one by one")
+
+        kept: list[Any] = []
+        rows: list[np.ndarray] = []
+        flags: list[np.ndarray] = []
+        for restaurant_id, text, paths in zip(ids, texts, image_paths, strict=True):
+            try:
+                vector, has_image = self._embed_restaurants([text], [paths])
+            except Exception as e:
+                logger.error(f"Error processing restaurant {restaurant_id}: {e}")
+                continue
+            kept.append(restaurant_id)
+            rows.append(vector)
+            flags.append(has_image)
+
+        if not rows:
+            return [], np.zeros((0, 896), dtype="float32"), np.zeros(0, bool), len(ids)
+        return kept, np.vstack(rows), np.concatenate(flags), len(ids) - len(kept)
 
     def generate_all(self, run_name: str | None = None) -> tuple[np.ndarray, list[str]]:
         """
@@ -128,13 +268,17 @@ class EmbeddingGenerator:
         restaurants = self.db.get_all_restaurants()
         logger.info(f"Processing {len(restaurants)} restaurants")
 
-        embeddings = []
-        meta_ids = []
         errors = 0
         images_found = 0
+        embeddings_array = np.zeros((0, 896), dtype="float32")
+        meta_ids: list[str] = []
 
         # Start MLFlow run if enabled
         if self.use_mlflow:
+            import mlflow
+
+            from vibecheck.mlflow_config import MLFlowConfig
+
             experiment_id = MLFlowConfig.get_or_create_experiment(
                 MLFlowConfig.EMBEDDING_EXPERIMENT
             )
@@ -150,44 +294,62 @@ class EmbeddingGenerator:
             mlflow.log_param("device", str(self.device))
             mlflow.log_param("db_path", str(self.db.db_path))
             mlflow.log_param("image_dir", str(self.image_dir))
+            mlflow.log_param("batch_size", self.batch_size)
+            mlflow.log_param(
+                "max_images_per_restaurant", self.max_images_per_restaurant
+            )
+            mlflow.log_param("use_vibe_photos", self.use_vibe_photos)
 
         try:
-            for i, resto in enumerate(tqdm(restaurants, desc="Generating embeddings")):
-                try:
-                    text = resto["review_snippet"] or resto["name"] or ""
-                    embedding = self.generate_restaurant_embedding(resto["id"], text)
-
-                    embeddings.append(embedding)
-                    meta_ids.append(resto["id"])
-
-                    # Track if image was found
-                    img_path = self.image_dir / f"{resto['id']}.jpg"
-                    if img_path.exists():
-                        images_found += 1
-
-                    if (i + 1) % 50 == 0:
-                        logger.debug(
-                            f"Processed {i + 1}/{len(restaurants)} restaurants"
-                        )
+            photo_files = self._photo_files()
+            chunks: list[np.ndarray] = []
+
+            # Chunks of restaurants keep memory bounded while every model call
+            # inside a chunk still runs at full batch size.
+            chunk_size = self.batch_size * 4
+            for start in tqdm(
+                range(0, len(restaurants), chunk_size), desc="Generating embeddings"
+            ):
+                chunk = restaurants[start : start + chunk_size]
+                ids, texts, image_paths = [], [], []
+                for resto in chunk:
+                    try:
+                        text, paths = self._restaurant_inputs(resto, photo_files)
+                    except Exception as e:
+                        logger.error(f"Error processing restaurant {resto['id']}: {e}")
+                        errors += 1
+                        continue
+                    ids.append(resto["id"])
+                    texts.append(text)
+                    image_paths.append(paths)
+
+                ids, vectors, has_image, chunk_errors = self._embed_chunk(
+                    ids, texts, image_paths
+                )
+                errors += chunk_errors
+                chunks.append(vectors)
+                meta_ids.extend(ids)
+                images_found += int(has_image.sum())
+                logger.debug(
+                    f"Processed {start + len(chunk)}/{len(restaurants)} restaurants"
+                )
 
-                except Exception as e:
-                    logger.error(f"Error processing restaurant {resto['id']}: {e}")
-                    errors += 1
-                    continue
+            if chunks:
+                embeddings_array = np.vstack(chunks)
 
             logger.info(
-                f"Embedding generation complete: {len(embeddings)} successful, {errors} errors"
+                f"Embedding generation complete: {len(embeddings_array)} successful, {errors} errors"
             )
 
             # Log metrics to MLFlow
             if self.use_mlflow:
-                mlflow.log_metric("successful_embeddings", len(embeddings))
+                mlflow.log_metric("successful_embeddings", len(embeddings_array))
                 mlflow.log_metric("failed_embeddings", errors)
                 mlflow.log_metric("images_found", images_found)
                 mlflow.log_metric("images_missing", len(restaurants) - images_found)
                 mlflow.log_metric(
                     "success_rate",
-                    len(embeddings) / len(restaurants) if restaurants else 0,
+                    len(embeddings_array) / len(restaurants) if restaurants else 0,
                 )
                 mlflow.log_metric(
                     "image_coverage",
@@ -195,7 +357,6 @@ class EmbeddingGenerator:
                 )
 
                 # Log embedding statistics
-                embeddings_array = np.vstack(embeddings).astype("float32")
                 mlflow.log_metric("embedding_mean", float(np.mean(embeddings_array)))
                 mlflow.log_metric("embedding_std", float(np.std(embeddings_array)))
                 mlflow.log_metric("embedding_min", float(np.min(embeddings_array)))
@@ -207,4 +368,93 @@ class EmbeddingGenerator:
             if self.use_mlflow:
                 mlflow.end_run()
 
-        return np.vstack(embeddings).astype("float32"), meta_ids
+        return embeddings_array, meta_ids
+
+    def embedding_config(self) -> dict[str, Any]:
+        """Settings that change every embedding; stored alongside fingerprints."""
+        return {
+            "text_model": "all-MiniLM-L6-v2",
+            "image_model": "CLIP-ViT-B/32",
+            "max_images_per_restaurant": self.max_images_per_restaurant,
+            "use_vibe_photos": self.use_vibe_photos,
+        }
+
+    def generate_incremental(self, store: EmbeddingStore) -> dict[str, int]:
+        """
+        Bring an :class:`EmbeddingStore` up to date, re-embedding only changes.
+
+        Each restaurant's input text and image files are fingerprinted and
+        compared with the store. New or changed restaurants are embedded,
+        deleted ones are dropped, and everything else is left untouched.
+        The caller is responsible for ``store.save()`` and rebuilding the index.
+
+        Args:
+            store: Store to update in memory. Its ``config`` should match
+                :meth:`embedding_config`.
+
+        Returns:
+            Counts of ``embedded``, ``removed``, ``unchanged`` and ``errors``.
+
+        Example:
+            >>> generator = EmbeddingGenerator(use_mlflow=False)
+            >>> store = EmbeddingStore(
+            ...     embeddings_path, meta_ids_path,
+            ...     config=generator.embedding_config(),
+            ... )
+            >>> stats = generator.generate_incremental(store)
+            >>> store.save()
+        """
+        logger.info("Starting incremental embedding update")
+
+        restaurants = self.db.get_all_restaurants()
+        photo_files = self._photo_files()
+
+        inputs = {}
+        fingerprints = {}
+        failed = set()
+        for resto in restaurants:
+            key = str(resto["id"])
+            try:
+                text, paths = self._restaurant_inputs(resto, photo_files)
+                fingerprints[key] = fingerprint_inputs(text, paths)
+            except Exception as e:
+                logger.error(f"Error processing restaurant {resto['id']}: {e}")
+                failed.add(key)
+                continue
+            inputs[key] = (resto["id"], text, paths)
+
+        changed, removed = store.diff(fingerprints)
+        # Restaurants we couldn't read keep their stored embedding for now
+        removed = [key for key in removed if key not in failed]
+        errors = len(failed)
+
+        embedded_ids: list[Any] = []
+        chunks: list[np.ndarray] = []
+        chunk_size = self.batch_size * 4
+        for start in tqdm(range(0, len(changed), chunk_size), desc="Re-embedding"):
+            keys = changed[start : start + chunk_size]
+            ids, vectors, _, chunk_errors = self._embed_chunk(
+                [inputs[key][0] for key in keys],
+                [inputs[key][1] for key in keys],
+                [inputs[key][2] for key in keys],
+            )
+            errors += chunk_errors
+            embedded_ids.extend(ids)
+            chunks.append(vectors)
+
+        if chunks or removed:
+            store.apply(
+                embedded_ids,
+                np.vstack(chunks) if chunks else np.zeros((0, 896), dtype="float32"),
+                fingerprints,
+                removed=removed,
+            )
+
+        stats = {
+            "embedded": len(embedded_ids),
+            "removed": len(removed),
+            "unchanged": len(fingerprints) - len(changed),
+            "errors": errors,
+        }
+        logger.info(f"Incremental update complete: {stats}")
+        return stats
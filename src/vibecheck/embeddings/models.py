@@ -2,60 +2,212 @@
 
 """Model loading and caching for embeddings."""
 
-import clip
-import torch
-from sentence_transformers import SentenceTransformer
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from vibecheck.logging_config import get_logger
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 logger = get_logger(__name__)
 
 
+MODEL_BACKENDS = ("torch", "onnx")
+
+
 class ModelCache:
-    """Cache for pre-trained models to avoid reloading."""
+    """Cache for pre-trained models to avoid reloading.
+
+    The ``torch`` backend (default) runs the original FP32 models. The
+    ``onnx`` backend serves int8-quantized ONNX exports of MiniLM and the
+    CLIP image tower on CPU; select it with :meth:`set_backend` or the
+    ``VIBECHECK_MODEL_BACKEND`` / ``VIBECHECK_ONNX_DIR`` environment
+    variables, after exporting with ``scripts/benchmark_onnx.py --export``.
+    The ``onnx`` backend requires the ``onnx`` extra
+    (``poetry install -E onnx``).
+    """
 
     _text_model = None
     _clip_model = None
     _clip_preprocess = None
     _device = None
+    _backend = os.getenv("VIBECHECK_MODEL_BACKEND", "torch")
+    _onnx_dir = Path(os.getenv("VIBECHECK_ONNX_DIR", "models/onnx"))
+    _onnx_quantized = True
+    _num_threads: int | None = None
+    # One lock per model, so text and CLIP can load concurrently but no
+    # model is ever loaded twice by racing threads.
+    _text_lock = threading.Lock()
+    _clip_lock = threading.Lock()
+
+    @classmethod
+    def set_backend(
+        cls, backend: str, onnx_dir: Path | None = None, quantized: bool = True
+    ) -> None:
+        """
+        Choose how models are run; cached models are dropped if it changes.
+
+        Args:
+            backend: ``"torch"`` or ``"onnx"``.
+            onnx_dir: Directory holding the exported ``.onnx`` files.
+            quantized: Serve the int8 exports (otherwise the FP32 ones).
+        """
+        if backend not in MODEL_BACKENDS:
+            raise ValueError(f"Unknown model backend {backend!r}: {MODEL_BACKENDS}")
+        onnx_dir = Path(onnx_dir) if onnx_dir else cls._onnx_dir
+        if (backend, onnx_dir, quantized) != (
+            cls._backend,
+            cls._onnx_dir,
+            cls._onnx_quantized,
+        ):
+            cls._text_model = cls._clip_model = cls._clip_preprocess = None
+        cls._backend, cls._onnx_dir, cls._onnx_quantized = backend, onnx_dir, quantized
+        logger.info(f"Model backend: {backend}")
+
+    @classmethod
+    def _onnx_model_path(cls, name: str) -> Path:
+        from vibecheck.embeddings.onnx_models import onnx_path
+
+        path = onnx_path(cls._onnx_dir, name, cls._onnx_quantized)
+        if not path.exists():
+            raise FileNotFoundError(
+                f"ONNX model not found: {path}. "
+                "Export it with `python scripts/benchmark_onnx.py --export`."
+            )
+        return path
 
     @classmethod
     def get_device(cls) -> str:
         """Get computing device (cuda or cpu)."""
         if cls._device is None:
+            import torch
+
             cls._device = "cuda" if torch.cuda.is_available() else "cpu"
             logger.info(f"Using device: {cls._device}")
         return cls._device
 
     @classmethod
-    def get_text_model(cls) -> SentenceTransformer:
+    def get_text_model(cls) -> "SentenceTransformer":
         """Get or load text embedding model."""
+        if cls._text_model is not None:
+            return cls._text_model
+        with cls._text_lock:
+            cls._load_text_model()
+        return cls._text_model
+
+    @classmethod
+    def _load_text_model(cls) -> None:
         if cls._text_model is None:
-            logger.info("Loading text model (all-MiniLM-L6-v2)...")
+            logger.info(f"Loading text model (all-MiniLM-L6-v2, {cls._backend})...")
             try:
-                cls._text_model = SentenceTransformer(
-                    "all-MiniLM-L6-v2", device=cls.get_device()
-                )
+                if cls._backend == "onnx":
+                    from vibecheck.embeddings.onnx_models import (
+                        TEXT_ONNX,
+                        OnnxTextModel,
+                    )
+
+                    cls._text_model = OnnxTextModel(
+                        cls._onnx_model_path(TEXT_ONNX), cls._num_threads
+                    )
+                else:
+                    from sentence_transformers import SentenceTransformer
+
+                    cls._text_model = SentenceTransformer(
+                        "all-MiniLM-L6-v2", device=cls.get_device()
+                    )
                 logger.info("Text model loaded successfully")
             except Exception as e:
                 logger.error(f"Failed to load text model: {e}")
                 raise
-        return cls._text_model
 
     @classmethod
     def get_clip_model(cls) -> tuple:
         """Get or load CLIP model and preprocessor."""
         if cls._clip_model is None:
-            logger.info("Loading CLIP model (ViT-B/32)...")
+            with cls._clip_lock:
+                cls._load_clip_model()
+        return cls._clip_model, cls._clip_preprocess
+
+    @classmethod
+    def _load_clip_model(cls) -> None:
+        if cls._clip_model is None:
+            logger.info(f"Loading CLIP model (ViT-B/32, {cls._backend})...")
             try:
-                cls._clip_model, cls._clip_preprocess = clip.load(
-                    "ViT-B/32", device=cls.get_device()
-                )
+                if cls._backend == "onnx":
+                    from vibecheck.embeddings.onnx_models import (
+                        CLIP_ONNX,
+                        OnnxClipImageModel,
+                        clip_preprocess,
+                    )
+
+                    model = OnnxClipImageModel(
+                        cls._onnx_model_path(CLIP_ONNX), cls._num_threads
+                    )
+                    preprocess = clip_preprocess()
+                else:
+                    import clip
+
+                    model, preprocess = clip.load("ViT-B/32", device=cls.get_device())
+                # The model is published last: readers check it without the lock
+                cls._clip_preprocess = preprocess
+                cls._clip_model = model
                 logger.info("CLIP model loaded successfully")
             except Exception as e:
                 logger.error(f"Failed to load CLIP model: {e}")
                 raise
-        return cls._clip_model, cls._clip_preprocess
+
+    @classmethod
+    def preload(cls, text: bool = True, clip_model: bool = True) -> None:
+        """
+        Load models eagerly, e.g. in a pre-fork server master process.
+
+        Workers forked afterwards inherit the weights copy-on-write instead
+        of each loading their own copy. Both models are loaded concurrently.
+        """
+        logger.info("Preloading models")
+        loaders = [
+            loader
+            for loader, wanted in (
+                (cls.get_text_model, text),
+                (cls.get_clip_model, clip_model),
+            )
+            if wanted
+        ]
+        with ThreadPoolExecutor(max_workers=max(len(loaders), 1)) as pool:
+            for future in [pool.submit(loader) for loader in loaders]:
+                future.result()
+
+    @classmethod
+    def loaded(cls) -> dict[str, bool]:
+        """Which models are in memory, without loading anything."""
+        return {
+            "text_model": cls._text_model is not None,
+            "clip_model": cls._clip_model is not None,
+        }
+
+    @classmethod
+    def configure_threads(cls, num_threads: int) -> None:
+        """
+        Limit torch (and ONNX Runtime) intra-op threads for this process.
+
+        Call once per worker after forking so N workers don't each spawn one
+        thread per core and oversubscribe the CPU. ONNX sessions created
+        afterwards use the same count.
+        """
+        import torch
+
+        cls._num_threads = num_threads
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(num_threads)
+        except RuntimeError:
+            # Only allowed before any inter-op parallel work has started.
+            logger.debug("Inter-op thread count already fixed for this process")
+        logger.info(f"Torch configured with {num_threads} thread(s)")
 
     @classmethod
     def clear_cache(cls):
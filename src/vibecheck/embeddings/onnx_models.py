@@ -0,0 +1,239 @@
+"""ONNX Runtime export and int8 inference for MiniLM and the CLIP image tower.
+
+Requires the ``onnx`` extra (``onnx`` and ``onnxruntime``)::
+
+    poetry install -E onnx   # or: pip install "vibecheck[onnx]"
+"""
+
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TEXT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+TEXT_MAX_LENGTH = 256  # all-MiniLM-L6-v2's max_seq_length
+CLIP_IMAGE_SIZE = 224
+CLIP_MEAN = (0.48145466, 0.4578275, 0.40821073)
+CLIP_STD = (0.26862954, 0.26130258, 0.27577711)
+
+TEXT_ONNX = "minilm.onnx"
+CLIP_ONNX = "clip_visual.onnx"
+
+
+def onnx_path(onnx_dir: Path, name: str, quantized: bool = True) -> Path:
+    """File name of an exported model, with ``.int8`` for quantized ones."""
+    path = Path(onnx_dir) / name
+    return path.with_suffix(".int8.onnx") if quantized else path
+
+
+def _quantize(fp32_path: Path) -> Path:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = fp32_path.with_suffix(".int8.onnx")
+    # Dynamic quantization: int8 weights, activations quantized per batch at
+    # run time, so no calibration data is needed.
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    logger.info(f"Quantized {fp32_path.name} -> {int8_path.name}")
+    return int8_path
+
+
+def export_text_model(onnx_dir: Path, quantize: bool = True) -> Path:
+    """
+    Export the MiniLM transformer (without pooling) to ONNX.
+
+    Mean pooling and normalization are done in numpy by
+    :class:`OnnxTextModel`, exactly as sentence-transformers does them.
+
+    Returns:
+        Path of the model to serve (the int8 one when ``quantize``).
+    """
+    from transformers import AutoModel, AutoTokenizer
+
+    onnx_dir = Path(onnx_dir)
+    onnx_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = onnx_dir / TEXT_ONNX
+
+    tokenizer = AutoTokenizer.from_pretrained(TEXT_MODEL_NAME)
+    model = AutoModel.from_pretrained(TEXT_MODEL_NAME).eval()
+    sample = tokenizer(["a cozy cafe"], return_tensors="pt")
+    names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic = {"batch": 0, "sequence": 1}
+
+    logger.info(f"Exporting text model to {fp32_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in names),
+            str(fp32_path),
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                **dict.fromkeys(names, dynamic),
+                "last_hidden_state": dynamic,
+            },
+            opset_version=17,
+        )
+    return _quantize(fp32_path) if quantize else fp32_path
+
+
+def export_clip_visual(onnx_dir: Path, quantize: bool = True) -> Path:
+    """
+    Export CLIP ViT-B/32's image encoder to ONNX.
+
+    Returns:
+        Path of the model to serve (the int8 one when ``quantize``).
+    """
+    import clip
+
+    onnx_dir = Path(onnx_dir)
+    onnx_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = onnx_dir / CLIP_ONNX
+
+    model, _ = clip.load("ViT-B/32", device="cpu")
+    visual = model.visual.float().eval()
+    sample = torch.randn(1, 3, CLIP_IMAGE_SIZE, CLIP_IMAGE_SIZE)
+
+    logger.info(f"Exporting CLIP image encoder to {fp32_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            visual,
+            (sample,),
+            str(fp32_path),
+            input_names=["pixel_values"],
+            output_names=["image_embeds"],
+            dynamic_axes={
+                "pixel_values": {0: "batch"},
+                "image_embeds": {0: "batch"},
+            },
+            opset_version=17,
+        )
+    return _quantize(fp32_path) if quantize else fp32_path
+
+
+def _session(model_path: Path, num_threads: int | None = None):
+    try:
+        import onnxruntime as ort
+    except ImportError as e:
+        raise ImportError(
+            "The onnx model backend needs the onnx extra: poetry install -E onnx"
+        ) from e
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads:
+        options.intra_op_num_threads = num_threads
+    logger.info(f"Loading ONNX model: {model_path}")
+    return ort.InferenceSession(
+        str(model_path), options, providers=["CPUExecutionProvider"]
+    )
+
+
+class OnnxTextModel:
+    """
+    MiniLM served by ONNX Runtime, with the ``encode`` API the code expects.
+
+    Example:
+        >>> model = OnnxTextModel(Path("models/onnx/minilm.int8.onnx"))
+        >>> model.encode(["cozy cafe"], normalize_embeddings=True).shape
+        (1, 384)
+    """
+
+    def __init__(self, model_path: Path, num_threads: int | None = None):
+        """Load the tokenizer and ONNX session."""
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(TEXT_MODEL_NAME)
+        self.session = _session(model_path, num_threads)
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(
+        self,
+        sentences: str | list[str],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        **_,
+    ) -> np.ndarray:
+        """Mean-pooled sentence embeddings; a single string gives shape (384,)."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        chunks = []
+        for start in range(0, len(texts), max(batch_size, 1)):
+            tokens = self.tokenizer(
+                texts[start : start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=TEXT_MAX_LENGTH,
+                return_tensors="np",
+            )
+            feeds = {
+                name: tokens[name].astype("int64")
+                for name in self.input_names
+                if name in tokens
+            }
+            (hidden,) = self.session.run(["last_hidden_state"], feeds)
+
+            mask = tokens["attention_mask"][..., None].astype("float32")
+            counts = np.clip(mask.sum(axis=1), 1e-9, None)
+            chunks.append((hidden * mask).sum(axis=1) / counts)
+
+        vectors = (
+            np.vstack(chunks).astype("float32")
+            if chunks
+            else np.zeros((0, 384), dtype="float32")
+        )
+        if normalize_embeddings:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.clip(norms, 1e-12, None)
+        return vectors[0] if single else vectors
+
+
+class OnnxClipImageModel:
+    """
+    CLIP's image tower served by ONNX Runtime.
+
+    ``encode_image`` takes and returns torch tensors so it is a drop-in for
+    the PyTorch CLIP model wherever only images are encoded.
+    """
+
+    def __init__(self, model_path: Path, num_threads: int | None = None):
+        """Load the ONNX session."""
+        self.session = _session(model_path, num_threads)
+
+    def encode_image(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        (embeds,) = self.session.run(
+            ["image_embeds"],
+            {"pixel_values": pixel_values.detach().cpu().float().numpy()},
+        )
+        return torch.from_numpy(embeds)
+
+
+def _convert_image_to_rgb(image):
+    return image.convert("RGB")
+
+
+def clip_preprocess():
+    """CLIP's image transform, without loading the PyTorch model."""
+    from torchvision.transforms import (
+        CenterCrop,
+        Compose,
+        InterpolationMode,
+        Normalize,
+        Resize,
+        ToTensor,
+    )
+
+    return Compose(
+        [
+            Resize(CLIP_IMAGE_SIZE, interpolation=InterpolationMode.BICUBIC),
+            CenterCrop(CLIP_IMAGE_SIZE),
+            _convert_image_to_rgb,
+            ToTensor(),
+            Normalize(CLIP_MEAN, CLIP_STD),
+        ]
+    )
@@ -0,0 +1,117 @@
+"""Background image decoding and preprocessing for CLIP embedding builds."""
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import torch
+from PIL import Image
+
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def load_image_tensor(path: Path, preprocess: Callable) -> torch.Tensor | None:
+    """Decode one image, convert to RGB and preprocess it; None on failure."""
+    try:
+        with Image.open(path) as image:
+            return preprocess(image.convert("RGB"))
+    except Exception as e:
+        logger.warning(f"Error processing image {path}: {e}")
+        return None
+
+
+class ImagePrefetcher:
+    """
+    Decode and preprocess images on a worker pool ahead of the model.
+
+    Up to ``max_prefetch`` images are in flight at once (a bounded queue), so
+    the CLIP forward pass on the main thread never waits on disk or JPEG
+    decoding while memory stays capped.
+
+    Args:
+        preprocess: CLIP preprocessing transform.
+        num_workers: Pool size; 0 decodes inline on the calling thread.
+        max_prefetch: Maximum images decoded ahead of the consumer
+            (defaults to ``4 * num_workers``).
+        use_processes: Use a process pool instead of threads, for when
+            preprocessing is GIL-bound. ``preprocess`` must be picklable.
+
+    Example:
+        >>> prefetcher = ImagePrefetcher(clip_preprocess, num_workers=4)
+        >>> for rows, batch in prefetcher.iter_batches(paths, batch_size=64):
+        ...     vectors = clip_model.encode_image(batch.to(device))
+    """
+
+    def __init__(
+        self,
+        preprocess: Callable,
+        num_workers: int = 4,
+        max_prefetch: int | None = None,
+        use_processes: bool = False,
+    ):
+        """Configure the prefetcher; the pool is created per iteration."""
+        self.preprocess = preprocess
+        self.num_workers = num_workers
+        self.max_prefetch = max_prefetch or max(4 * num_workers, 1)
+        self.use_processes = use_processes
+
+    def _executor(self) -> Executor:
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.num_workers)
+        return ThreadPoolExecutor(
+            max_workers=self.num_workers, thread_name_prefix="image-prefetch"
+        )
+
+    def iter_tensors(self, paths: list[Path]) -> Iterator[tuple[int, torch.Tensor]]:
+        """
+        Yield ``(position, tensor)`` for every image that loads, in input order.
+
+        Images that fail to load are logged and skipped.
+        """
+        if self.num_workers <= 0:
+            for i, path in enumerate(paths):
+                tensor = load_image_tensor(path, self.preprocess)
+                if tensor is not None:
+                    yield i, tensor
+            return
+
+        with self._executor() as pool:
+            pending: deque[tuple[int, Future]] = deque()
+            next_path = 0
+
+            while pending or next_path < len(paths):
+                # Keep the queue topped up before blocking on the oldest item.
+                while next_path < len(paths) and len(pending) < self.max_prefetch:
+                    future = pool.submit(
+                        load_image_tensor, paths[next_path], self.preprocess
+                    )
+                    pending.append((next_path, future))
+                    next_path += 1
+
+                i, future = pending.popleft()
+                tensor = future.result()
+                if tensor is not None:
+                    yield i, tensor
+
+    def iter_batches(
+        self, paths: list[Path], batch_size: int
+    ) -> Iterator[tuple[list[int], torch.Tensor]]:
+        """
+        Yield ``(positions, stacked_tensor)`` batches ready for CLIP.
+
+        ``positions`` index into ``paths`` so callers can map vectors back.
+        """
+        rows: list[int] = []
+        tensors: list[torch.Tensor] = []
+        for i, tensor in self.iter_tensors(paths):
+            rows.append(i)
+            tensors.append(tensor)
+            if len(tensors) == batch_size:
+                yield rows, torch.stack(tensors)
+                rows, tensors = [], []
+
+        if tensors:
+            yield rows, torch.stack(tensors)
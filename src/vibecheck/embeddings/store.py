@@ -0,0 +1,195 @@
+"""Persistent embedding store with per-restaurant input fingerprints."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def fingerprint_inputs(text: str, image_paths: list[Path]) -> str:
+    """
+    Fingerprint everything that goes into one restaurant's embedding.
+
+    The text is hashed directly; image files contribute their name, size and
+    modification time, so replaced or re-downloaded photos are detected
+    without reading every file.
+    """
+    digest = hashlib.sha256(text.encode("utf-8"))
+    for path in image_paths:
+        stat = path.stat()
+        digest.update(f"\0{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def _atomic_save(path: Path, write) -> None:
+    """Write via a temporary file and rename, so readers never see half a file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+class EmbeddingStore:
+    """
+    On-disk embeddings plus the fingerprints they were computed from.
+
+    Keeps ``vibe_embeddings.npy`` and ``meta_ids.npy`` row-aligned and stores
+    a JSON sidecar mapping each restaurant id to its input fingerprint, so
+    later runs can re-embed only restaurants whose inputs changed.
+
+    Example:
+        >>> store = EmbeddingStore(
+        ...     Path("data/processed/vibe_embeddings.npy"),
+        ...     Path("data/processed/meta_ids.npy"),
+        ... )
+        >>> changed, removed = store.diff(current_fingerprints)
+    """
+
+    def __init__(
+        self,
+        embeddings_path: Path,
+        meta_ids_path: Path,
+        fingerprints_path: Path | None = None,
+        config: dict[str, Any] | None = None,
+    ):
+        """
+        Load an existing store, or start empty if files are missing.
+
+        Args:
+            embeddings_path: ``.npy`` file of shape (N, 896).
+            meta_ids_path: ``.npy`` file of N restaurant ids.
+            fingerprints_path: JSON sidecar; defaults to
+                ``embedding_fingerprints.json`` next to the embeddings.
+            config: Settings that affect every embedding (models, photos per
+                restaurant, ...). If they differ from the stored ones, all
+                fingerprints are discarded and everything is re-embedded.
+        """
+        self.embeddings_path = Path(embeddings_path)
+        self.meta_ids_path = Path(meta_ids_path)
+        self.fingerprints_path = Path(
+            fingerprints_path
+            or self.embeddings_path.with_name("embedding_fingerprints.json")
+        )
+        self.config = config or {}
+
+        self.embeddings = np.zeros((0, 896), dtype="float32")
+        self.meta_ids: list[Any] = []
+        self.fingerprints: dict[str, str] = {}
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.meta_ids)
+
+    def load(self) -> None:
+        """Read the store from disk if all of its files exist."""
+        paths = (self.embeddings_path, self.meta_ids_path, self.fingerprints_path)
+        if not all(p.exists() for p in paths):
+            logger.info("No existing embedding store, starting empty")
+            return
+
+        with open(self.fingerprints_path) as f:
+            sidecar = json.load(f)
+
+        if sidecar.get("config") != self.config:
+            logger.warning("Embedding config changed, all restaurants will be rebuilt")
+            return
+
+        embeddings = np.load(self.embeddings_path).astype("float32")
+        meta_ids = np.load(self.meta_ids_path).tolist()
+        if len(embeddings) != len(meta_ids):
+            logger.warning("Embedding store is inconsistent, rebuilding from scratch")
+            return
+
+        self.embeddings = embeddings
+        self.meta_ids = meta_ids
+        self.fingerprints = sidecar.get("fingerprints", {})
+        logger.info(f"Loaded embedding store with {len(self.meta_ids)} restaurants")
+
+    def diff(self, fingerprints: dict[str, str]) -> tuple[list[str], list[str]]:
+        """
+        Compare current inputs against the stored fingerprints.
+
+        Args:
+            fingerprints: Mapping of ``str(restaurant_id)`` to its current
+                fingerprint, for every restaurant that should be indexed.
+
+        Returns:
+            Tuple of (ids that are new or changed, ids no longer present).
+        """
+        stored = {str(rid) for rid in self.meta_ids}
+        changed = [
+            rid
+            for rid, fp in fingerprints.items()
+            if rid not in stored or self.fingerprints.get(rid) != fp
+        ]
+        removed = [rid for rid in stored if rid not in fingerprints]
+        logger.info(
+            f"Embedding diff: {len(changed)} new/changed, {len(removed)} removed, "
+            f"{len(fingerprints) - len(changed)} unchanged"
+        )
+        return changed, removed
+
+    def apply(
+        self,
+        restaurant_ids: list[Any],
+        embeddings: np.ndarray,
+        fingerprints: dict[str, str],
+        removed: list[str] | None = None,
+    ) -> None:
+        """
+        Upsert re-embedded restaurants and drop removed ones.
+
+        Existing rows are updated in place and new restaurants are appended,
+        so unchanged restaurants keep their row positions.
+        """
+        removed_set = set(removed or [])
+        rows = {str(rid): i for i, rid in enumerate(self.meta_ids)}
+
+        vectors = self.embeddings.copy()
+        meta_ids = list(self.meta_ids)
+        appended_ids, appended_vecs = [], []
+        for rid, vector in zip(restaurant_ids, embeddings, strict=True):
+            key = str(rid)
+            if key in rows:
+                vectors[rows[key]] = vector
+            else:
+                appended_ids.append(rid)
+                appended_vecs.append(vector)
+            self.fingerprints[key] = fingerprints[key]
+
+        if appended_vecs:
+            vectors = np.vstack([vectors, np.asarray(appended_vecs, dtype="float32")])
+            meta_ids.extend(appended_ids)
+
+        if removed_set:
+            keep = [i for i, rid in enumerate(meta_ids) if str(rid) not in removed_set]
+            vectors = vectors[keep]
+            meta_ids = [meta_ids[i] for i in keep]
+            for key in removed_set:
+                self.fingerprints.pop(key, None)
+
+        self.embeddings = vectors.astype("float32")
+        self.meta_ids = meta_ids
+
+    def save(self) -> None:
+        """Atomically write embeddings, ids and fingerprints."""
+        _atomic_save(self.embeddings_path, lambda f: np.save(f, self.embeddings))
+        _atomic_save(self.meta_ids_path, lambda f: np.save(f, np.array(self.meta_ids)))
+        _atomic_save(
+            self.fingerprints_path,
+            lambda f: f.write(
+                json.dumps(
+                    {"config": self.config, "fingerprints": self.fingerprints},
+                    indent=2,
+                ).encode()
+            ),
+        )
+        logger.info(f"Saved embedding store with {len(self.meta_ids)} restaurants")
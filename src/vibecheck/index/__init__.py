@@ -0,0 +1,30 @@
+"""FAISS index building and management for VibeCheck."""
+
+from vibecheck.index.builders import (
+    INDEX_TYPES,
+    IndexConfig,
+    build_index,
+    evaluate_index,
+    load_index_config,
+    recall_latency_report,
+    set_search_params,
+)
+from vibecheck.index.live import LiveIndex
+from vibecheck.index.loader import load_array, load_index
+from vibecheck.index.snapshot import IndexSnapshot, IndexWatcher, SnapshotHolder
+
+__all__ = [
+    "INDEX_TYPES",
+    "IndexConfig",
+    "IndexSnapshot",
+    "IndexWatcher",
+    "LiveIndex",
+    "SnapshotHolder",
+    "build_index",
+    "evaluate_index",
+    "load_array",
+    "load_index",
+    "load_index_config",
+    "recall_latency_report",
+    "set_search_params",
+]
@@ -0,0 +1,311 @@
+"""FAISS index construction, tuning and recall/latency evaluation."""
+
+import math
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import faiss
+import numpy as np
+
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+
+@dataclass
+class IndexConfig:
+    """
+    Settings for building the 896-d vibe index.
+
+    All variants use inner-product similarity, matching the normalized
+    embeddings produced by the embedding pipeline.
+
+    Attributes:
+        type: One of ``flat``, ``ivf_flat``, ``ivf_pq`` or ``hnsw``.
+        nlist: Number of IVF coarse clusters.
+        nprobe: IVF clusters visited per query (recall vs. latency knob).
+        pq_m: Number of PQ sub-quantizers (must divide the dimension).
+        pq_nbits: Bits per PQ code.
+        hnsw_m: HNSW graph degree.
+        ef_construction: HNSW build-time beam width.
+        ef_search: HNSW query-time beam width (recall vs. latency knob).
+    """
+
+    type: str = "flat"
+    nlist: int = 64
+    nprobe: int = 8
+    pq_m: int = 32
+    pq_nbits: int = 8
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    ef_search: int = 64
+
+    def __post_init__(self):
+        if self.type not in INDEX_TYPES:
+            raise ValueError(
+                f"Unknown index type '{self.type}', expected one of {INDEX_TYPES}"
+            )
+
+    @classmethod
+    def from_dict(cls, params: dict[str, Any]) -> "IndexConfig":
+        """Build a config from a mapping, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in params.items() if k in known})
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the config as a plain dictionary (e.g. for MLFlow params)."""
+        return asdict(self)
+
+
+def load_index_config(params_path: Path = Path("params.yaml")) -> IndexConfig:
+    """
+    Read the ``index`` section of the DVC params file.
+
+    Args:
+        params_path: Path to ``params.yaml``.
+
+    Returns:
+        The configured :class:`IndexConfig`, or the flat default if the file
+        or section is missing.
+    """
+    import yaml
+
+    params_path = Path(params_path)
+    if not params_path.exists():
+        logger.warning(f"Params file not found, using flat index: {params_path}")
+        return IndexConfig()
+
+    with open(params_path) as f:
+        params = yaml.safe_load(f) or {}
+    return IndexConfig.from_dict(params.get("index") or {})
+
+
+def set_search_params(
+    index: faiss.Index, nprobe: int | None = None, ef_search: int | None = None
+) -> None:
+    """
+    Apply query-time tuning knobs to an index.
+
+    Uses ``faiss.ParameterSpace`` so wrapped indexes (e.g. ``IndexIDMap2``)
+    are handled too. Knobs that do not apply to the index type are ignored.
+    """
+    params = faiss.ParameterSpace()
+    for name, value in (("nprobe", nprobe), ("efSearch", ef_search)):
+        if value is None:
+            continue
+        try:
+            params.set_index_parameter(index, name, value)
+        except RuntimeError:
+            logger.debug(f"{name} does not apply to {type(index).__name__}")
+
+
+def _clamped_nlist(config: IndexConfig, n: int) -> int:
+    # FAISS wants roughly 39 training points per centroid.
+    nlist = max(1, min(config.nlist, n // 39))
+    if nlist != config.nlist:
+        logger.warning(f"Reducing nlist from {config.nlist} to {nlist} for {n} vectors")
+    return nlist
+
+
+def _clamped_pq_nbits(config: IndexConfig, n: int) -> int:
+    # k-means for each sub-quantizer needs at least 2**nbits training points.
+    nbits = max(1, min(config.pq_nbits, int(math.log2(max(n, 2)))))
+    if nbits != config.pq_nbits:
+        logger.warning(
+            f"Reducing pq_nbits from {config.pq_nbits} to {nbits} for {n} vectors"
+        )
+    return nbits
+
+
+def build_index(
+    embeddings: np.ndarray,
+    config: IndexConfig | None = None,
+    ids: np.ndarray | None = None,
+) -> faiss.Index:
+    """
+    Build, train and populate a FAISS index for the given embeddings.
+
+    Args:
+        embeddings: Matrix of shape (N, dim), float32, L2-normalized blocks.
+        config: Index settings; defaults to an exact ``IndexFlatIP``.
+        ids: Optional int64 labels, one per row. Searches then return these
+            labels instead of row numbers and ``remove_ids`` works by label
+            (IVF indexes store them natively, flat ones are wrapped in an
+            ``IndexIDMap2``). Not supported for ``hnsw``, which cannot
+            remove vectors.
+
+    Returns:
+        A populated index with search knobs already applied. ``nprobe`` and
+        ``efSearch`` are serialized with the index by ``faiss.write_index``.
+
+    Example:
+        >>> index = build_index(embeddings, IndexConfig(type="hnsw"))
+        >>> distances, rows = index.search(embeddings[:1], 5)
+    """
+    config = config or IndexConfig()
+    if ids is not None and config.type == "hnsw":
+        raise ValueError("hnsw indexes cannot remove vectors, so they take no ids")
+    embeddings = np.ascontiguousarray(embeddings, dtype="float32")
+    n, dim = embeddings.shape
+    logger.info(f"Building {config.type} index over {n} vectors (dim={dim})")
+
+    if config.type == "flat":
+        index = faiss.IndexFlatIP(dim)
+
+    elif config.type == "ivf_flat":
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFFlat(
+            quantizer, dim, _clamped_nlist(config, n), faiss.METRIC_INNER_PRODUCT
+        )
+
+    elif config.type == "ivf_pq":
+        if dim % config.pq_m != 0:
+            raise ValueError(f"pq_m={config.pq_m} must divide dimension {dim}")
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(
+            quantizer,
+            dim,
+            _clamped_nlist(config, n),
+            config.pq_m,
+            _clamped_pq_nbits(config, n),
+            faiss.METRIC_INNER_PRODUCT,
+        )
+
+    else:  # hnsw
+        index = faiss.IndexHNSWFlat(dim, config.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = config.ef_construction
+
+    if not index.is_trained:
+        logger.info("Training index...")
+        index.train(embeddings)
+
+    if ids is None:
+        index.add(embeddings)
+    else:
+        if faiss.try_extract_index_ivf(index) is None:
+            index = faiss.IndexIDMap2(index)
+        index.add_with_ids(embeddings, np.asarray(ids, dtype="int64"))
+    set_search_params(index, nprobe=config.nprobe, ef_search=config.ef_search)
+
+    logger.info(f"Index built with {index.ntotal} vectors")
+    return index
+
+
+def evaluate_index(
+    index: faiss.Index,
+    embeddings: np.ndarray,
+    queries: np.ndarray | None = None,
+    k: int = 10,
+    n_queries: int = 200,
+    seed: int = 42,
+) -> dict[str, float]:
+    """
+    Measure recall@k and latency of an index against exact search.
+
+    Args:
+        index: Index to evaluate.
+        embeddings: The vectors the index was built from.
+        queries: Optional query matrix. Defaults to ``n_queries`` rows sampled
+            from ``embeddings``.
+        k: Number of neighbors compared.
+        n_queries: Sample size when ``queries`` is not given.
+        seed: Random seed for sampling queries.
+
+    Returns:
+        Dictionary with ``recall_at_k``, ``latency_ms_p50``,
+        ``latency_ms_p95`` and ``qps``.
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype="float32")
+    if queries is None:
+        rng = np.random.default_rng(seed)
+        rows = rng.choice(len(embeddings), min(n_queries, len(embeddings)), False)
+        queries = embeddings[rows]
+    queries = np.ascontiguousarray(queries, dtype="float32")
+    k = min(k, len(embeddings))
+
+    exact = faiss.IndexFlatIP(embeddings.shape[1])
+    exact.add(embeddings)
+    _, truth = exact.search(queries, k)
+
+    latencies = []
+    found = np.empty_like(truth)
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        _, found[i : i + 1] = index.search(query[None, :], k)
+        latencies.append(time.perf_counter() - start)
+
+    hits = sum(
+        len(set(expected) & set(got))
+        for expected, got in zip(truth.tolist(), found.tolist(), strict=True)
+    )
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "recall_at_k": hits / truth.size,
+        "latency_ms_p50": float(np.percentile(latencies_ms, 50)),
+        "latency_ms_p95": float(np.percentile(latencies_ms, 95)),
+        "qps": float(len(queries) / np.sum(latencies)),
+    }
+
+
+def recall_latency_report(
+    embeddings: np.ndarray,
+    configs: list[IndexConfig],
+    k: int = 10,
+    n_queries: int = 200,
+    nprobe_values: tuple[int, ...] = (1, 4, 8, 16, 32),
+    ef_search_values: tuple[int, ...] = (16, 32, 64, 128, 256),
+) -> list[dict[str, Any]]:
+    """
+    Compare index variants against the exact Flat baseline.
+
+    Each config is built once, then swept over its query-time knob
+    (``nprobe`` for IVF variants, ``efSearch`` for HNSW).
+
+    Args:
+        embeddings: Vectors to index, shape (N, dim).
+        configs: Index variants to compare.
+        k: Number of neighbors used for recall.
+        n_queries: Number of sampled queries.
+        nprobe_values: ``nprobe`` settings to sweep for IVF indexes.
+        ef_search_values: ``efSearch`` settings to sweep for HNSW indexes.
+
+    Returns:
+        One row per (config, knob value) with the config fields, build time
+        and the metrics from :func:`evaluate_index`.
+
+    Example:
+        >>> rows = recall_latency_report(
+        ...     embeddings, [IndexConfig(type="flat"), IndexConfig(type="hnsw")]
+        ... )
+        >>> for row in rows:
+        ...     print(row["type"], row["recall_at_k"], row["latency_ms_p50"])
+    """
+    report = []
+    for config in configs:
+        start = time.perf_counter()
+        index = build_index(embeddings, config)
+        build_seconds = time.perf_counter() - start
+
+        if config.type in ("ivf_flat", "ivf_pq"):
+            sweep = [{"nprobe": v} for v in nprobe_values]
+        elif config.type == "hnsw":
+            sweep = [{"ef_search": v} for v in ef_search_values]
+        else:
+            sweep = [{}]
+
+        for knobs in sweep:
+            set_search_params(index, **knobs)
+            metrics = evaluate_index(index, embeddings, k=k, n_queries=n_queries)
+            row = {**config.to_dict(), **knobs, "build_seconds": build_seconds}
+            row.update(metrics)
+            report.append(row)
+            logger.info(
+                f"{config.type} {knobs}: recall@{k}={metrics['recall_at_k']:.3f}, "
+                f"p50={metrics['latency_ms_p50']:.3f}ms"
+            )
+
+    return report
@@ -0,0 +1,372 @@
+"""Mutable, id-addressed FAISS index for adding and removing restaurants online."""
+
+import os
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import faiss
+import numpy as np
+
+from vibecheck.index.builders import IndexConfig, build_index
+from vibecheck.logging_config import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, run a single worker
+    fcntl = None
+
+logger = get_logger(__name__)
+
+
+def to_faiss_ids(restaurant_ids: Iterable[Any]) -> np.ndarray:
+    """
+    Convert restaurant ids to the int64 labels FAISS stores.
+
+    Raises:
+        ValueError: If an id is not an integer (``IndexIDMap2`` only supports
+            64-bit integer labels).
+    """
+    try:
+        return np.asarray([int(rid) for rid in restaurant_ids], dtype="int64")
+    except (TypeError, ValueError) as e:
+        raise ValueError(
+            f"Restaurant ids must be integers for a live index: {e}"
+        ) from e
+
+
+class _ReadWriteLock:
+    """Many concurrent readers or one writer; waiting writers go first."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+class LiveIndex:
+    """
+    FAISS index keyed by restaurant id, safe to mutate while serving.
+
+    Searches return restaurant ids directly (no ``meta_ids`` lookup). ``add``
+    and ``remove`` change the index in place under a write lock, so they cost
+    O(changed vectors) rather than a copy of the whole index; searches share
+    a read lock and run concurrently with each other.
+
+    Changes are written to ``path`` (atomically) at most once per
+    ``flush_interval`` seconds after the first unsaved change, so a burst of
+    updates costs one write. Call :meth:`flush` before shutting down; a crash
+    loses at most the last ``flush_interval`` seconds of updates.
+
+    Several processes (e.g. gunicorn workers) may share one ``path``: each
+    keeps its unsaved changes as a list of per-id operations, and a flush
+    takes an exclusive lock on the file, replays them onto whatever another
+    process wrote since, then writes the result, so no process overwrites
+    another's updates. Other processes see the change once they call
+    :meth:`refresh` (see ``VibeCheckRecommender.watch_live_index``).
+
+    Example:
+        >>> live = LiveIndex.load_or_build(
+        ...     Path("data/embeddings/vibecheck_live_index.faiss"),
+        ...     embeddings_path=Path("data/embeddings/vibe_embeddings.npy"),
+        ...     meta_ids=np.load("data/restaurants_info/meta_ids.npy"),
+        ...     config=load_index_config(),
+        ... )
+        >>> live.add([1234], vectors)
+        >>> distances, ids = live.search(query, 5)
+        >>> live.flush()
+    """
+
+    def __init__(
+        self,
+        index: faiss.Index,
+        path: Path | None = None,
+        flush_interval: float = 5.0,
+    ):
+        """
+        Wrap an existing id-keyed index.
+
+        Args:
+            index: The index to serve and mutate: an ``IndexIDMap2`` or an
+                IVF index, built with ids (see :func:`build_index`).
+            path: Where changes are persisted (None keeps them in memory).
+            flush_interval: Seconds to batch changes before writing them;
+                0 writes after every change.
+        """
+        self.index = index
+        self.path = Path(path) if path else None
+        self.flush_interval = flush_interval
+        self._lock = _ReadWriteLock()
+        self._flush_lock = threading.Lock()
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+        # Unsaved changes by id (None = removed), replayed when merging
+        self._pending: dict[int, np.ndarray | None] = {}
+        # The file state this index matches, to spot other processes' writes
+        self._synced = self._file_signature()
+        self.generation = 0  # bumped when another process's changes are merged
+
+    @classmethod
+    def from_embeddings(
+        cls,
+        embeddings: np.ndarray,
+        restaurant_ids: Iterable[Any],
+        path: Path | None = None,
+        flush_interval: float = 5.0,
+        config: IndexConfig | None = None,
+    ) -> "LiveIndex":
+        """
+        Build a live index with :func:`build_index` (exact by default).
+
+        ``hnsw`` cannot remove vectors, so that config falls back to ``flat``.
+        """
+        if config is not None and config.type == "hnsw":
+            logger.warning("hnsw indexes cannot remove vectors, live index is flat")
+            config = replace(config, type="flat")
+        ids = to_faiss_ids(restaurant_ids)
+        return cls(build_index(embeddings, config, ids=ids), path, flush_interval)
+
+    @classmethod
+    def load_or_build(
+        cls,
+        path: Path,
+        embeddings_path: Path,
+        meta_ids: np.ndarray,
+        config: IndexConfig | None = None,
+        flush_interval: float = 5.0,
+    ) -> "LiveIndex":
+        """
+        Load a persisted live index, or build one from the stored embeddings.
+
+        The index is built from ``embeddings_path`` (rows aligned with
+        ``meta_ids``) with the same ``config`` as the offline index, rather
+        than reconstructed from the offline index, which is lossy for PQ.
+        Embeddings newer than the live copy replace it, so deploying a full
+        rebuild resets the live index.
+
+        Raises:
+            FileNotFoundError: If neither file exists.
+        """
+        path = Path(path)
+        embeddings_path = Path(embeddings_path)
+        if path.exists() and (
+            not embeddings_path.exists()
+            or path.stat().st_mtime_ns >= embeddings_path.stat().st_mtime_ns
+        ):
+            logger.info(f"Loading live index: {path}")
+            return cls(faiss.read_index(str(path)), path, flush_interval)
+
+        logger.info(f"Building live index from {embeddings_path}")
+        embeddings = np.load(embeddings_path)
+        live = cls.from_embeddings(embeddings, meta_ids, path, flush_interval, config)
+        live.save()
+        return live
+
+    @property
+    def ntotal(self) -> int:
+        return self.index.ntotal
+
+    @property
+    def dirty(self) -> bool:
+        """True if there are changes not yet written to ``path``."""
+        return self._dirty
+
+    def search(
+        self, query_vectors: np.ndarray, top_k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Search the index; returns (distances, restaurant ids)."""
+        query_vectors = np.ascontiguousarray(query_vectors, dtype="float32")
+        with self._lock.read():
+            return self.index.search(query_vectors, top_k)
+
+    def add(self, restaurant_ids: Iterable[Any], vectors: np.ndarray) -> None:
+        """
+        Insert or replace restaurants.
+
+        Ids that already exist are replaced, so re-adding a restaurant updates
+        its embedding.
+        """
+        ids = to_faiss_ids(restaurant_ids)
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        with self._lock.write():
+            self.index.remove_ids(ids)
+            self.index.add_with_ids(vectors, ids)
+            self._pending.update(zip(ids.tolist(), vectors, strict=True))
+        self._changed()
+        logger.info(f"Added {len(ids)} restaurant(s) to live index")
+
+    def remove(self, restaurant_ids: Iterable[Any]) -> int:
+        """
+        Delete restaurants from the index.
+
+        Returns:
+            Number of vectors actually removed.
+        """
+        ids = to_faiss_ids(restaurant_ids)
+        with self._lock.write():
+            removed = int(self.index.remove_ids(ids))
+            if removed:
+                self._pending.update(dict.fromkeys(ids.tolist()))
+        if removed:
+            self._changed()
+        logger.info(f"Removed {removed} restaurant(s) from live index")
+        return removed
+
+    def _changed(self) -> None:
+        """Mark unsaved changes and schedule (or do) the write."""
+        if self.path is None:
+            return
+        with self._flush_lock:
+            self._dirty = True
+            if self.flush_interval > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.flush_interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> bool:
+        """
+        Write pending changes to ``path`` now.
+
+        Changes another process wrote since this index was loaded are merged
+        in first (see :meth:`refresh`).
+
+        Returns:
+            True if anything was written.
+        """
+        if self.path is None:
+            return False
+        with self._flush_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return False
+            with self._file_lock():
+                self._merge_from_disk()
+                # Readers may keep searching while the index is serialized;
+                # writers wait, so the file is a consistent point in time.
+                with self._lock.read():
+                    self._dirty = False
+                    self._pending.clear()
+                    self._write()
+        logger.debug(f"Flushed live index to {self.path}")
+        return True
+
+    def changed_on_disk(self) -> bool:
+        """True if another process has written ``path`` since we synced."""
+        return self.path is not None and self._file_signature() != self._synced
+
+    def refresh(self) -> bool:
+        """
+        Pick up changes another process wrote to ``path``.
+
+        The file is read and this process's unsaved changes are replayed on
+        top, so they are kept too.
+
+        Returns:
+            True if the index was replaced.
+        """
+        if not self.changed_on_disk():
+            return False
+        with self._flush_lock, self._file_lock():
+            return self._merge_from_disk()
+
+    def _merge_from_disk(self) -> bool:
+        """Swap in the file's index plus pending changes, if the file moved on."""
+        signature = self._file_signature()
+        if signature is None or signature == self._synced:
+            return False
+        merged = faiss.read_index(str(self.path))
+        with self._lock.write():
+            for restaurant_id, vector in self._pending.items():
+                ids = np.array([restaurant_id], dtype="int64")
+                merged.remove_ids(ids)
+                if vector is not None:
+                    merged.add_with_ids(vector[None, :], ids)
+            self.index = merged
+            self.generation += 1
+        self._synced = signature
+        logger.info(f"Merged live index changes from {self.path}")
+        return True
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self.path.stat()
+        except (AttributeError, OSError):  # no path, or not written yet
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock shared by every process using ``path``."""
+        if fcntl is None:
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(f".{self.path.name}.lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        faiss.write_index(self.index, str(tmp))
+        os.replace(tmp, self.path)
+        self._synced = self._file_signature()
+
+    def save(self) -> None:
+        """
+        Atomically write the current index to ``path``.
+
+        Unlike :meth:`flush` this replaces the file outright (e.g. after a
+        rebuild); changes other processes wrote to it are discarded.
+        """
+        if self.path is None:
+            raise ValueError("LiveIndex has no path to save to")
+        with self._flush_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            with self._file_lock(), self._lock.read():
+                self._dirty = False
+                self._pending.clear()
+                self._write()
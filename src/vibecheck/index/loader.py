@@ -0,0 +1,57 @@
+"""Load FAISS indexes and their companion arrays, optionally memory-mapped."""
+
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def load_index(path: Path, mmap: bool = False) -> faiss.Index:
+    """
+    Read a serialized FAISS index.
+
+    Args:
+        path: Index file written by ``faiss.write_index``.
+        mmap: Map the file read-only (``IO_FLAG_MMAP``) instead of copying it
+            into process memory. Workers that map the same file share its
+            pages through the OS page cache, and startup skips the full read.
+
+    Returns:
+        The loaded index. A memory-mapped index is read-only: adding or
+        removing vectors requires loading it without ``mmap``.
+    """
+    flags = 0
+    if mmap:
+        # IO_FLAG_MMAP maps IVF inverted lists; IO_FLAG_MMAP_IFC (faiss >= 1.10)
+        # also maps the codes of flat and HNSW indexes.
+        flags = (
+            faiss.IO_FLAG_MMAP
+            | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+            | faiss.IO_FLAG_READ_ONLY
+        )
+    logger.info(f"Loading FAISS index{' (mmap)' if mmap else ''}: {path}")
+    try:
+        return faiss.read_index(str(path), flags)
+    except RuntimeError as e:
+        if not mmap:
+            raise
+        # Not every index type supports mmap; fall back to a private copy.
+        logger.warning(f"mmap not supported for {path}, reading into memory: {e}")
+        return faiss.read_index(str(path))
+
+
+def load_array(path: Path, mmap: bool = False) -> np.ndarray:
+    """
+    Load a ``.npy`` array such as ``meta_ids.npy`` or ``vibe_embeddings.npy``.
+
+    Args:
+        path: Array file written by ``np.save``.
+        mmap: Open with ``mmap_mode="r"`` so the array is paged in lazily and
+            shared between processes instead of copied per worker.
+    """
+    logger.debug(f"Loading array{' (mmap)' if mmap else ''}: {path}")
+    return np.load(str(path), mmap_mode="r" if mmap else None)
@@ -0,0 +1,255 @@
+"""Versioned index snapshots that can be reloaded and swapped while serving."""
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from vibecheck.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from vibecheck.index.live import LiveIndex
+    from vibecheck.metadata_store import RestaurantMetadataStore
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSnapshot:
+    """
+    Everything one search reads, bundled so it can be replaced as a unit.
+
+    Request handlers read the holder's ``current`` snapshot once and use it
+    for the whole request, so a reload that lands mid-request never mixes an
+    old index with new ``meta_ids``.
+
+    Attributes:
+        index: FAISS index (for a live index, its current ``IndexIDMap2``).
+        meta_ids: Restaurant ids aligned with the index rows.
+        version: Increases on every reload or live update.
+        metadata_store: Optional in-memory metadata aligned with ``meta_ids``.
+        live_index: Set when the index is id-keyed and mutable.
+        loaded_at: Unix time the snapshot was created.
+    """
+
+    index: Any
+    meta_ids: np.ndarray
+    version: int = 0
+    metadata_store: "RestaurantMetadataStore | None" = None
+    live_index: "LiveIndex | None" = None
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def size(self) -> int:
+        index = self.live_index or self.index
+        return int(index.ntotal)
+
+
+class SnapshotHolder:
+    """
+    Holds the current :class:`IndexSnapshot` and swaps in reloaded ones.
+
+    ``loader`` builds a complete snapshot off to the side (this is the slow
+    part: reading the index, ids and metadata); only then is it published
+    with a single reference assignment. Reloads and updates are serialized,
+    and a failed reload leaves the current snapshot serving. Background
+    reloads are coalesced, so repeated requests cost at most two loads.
+
+    Example:
+        >>> holder = SnapshotHolder(lambda version: IndexSnapshot(
+        ...     load_index(path), load_array(ids_path), version
+        ... ))
+        >>> snapshot = holder.current
+        >>> holder.reload_async()
+    """
+
+    def __init__(self, loader: Callable[[int], IndexSnapshot]):
+        """Load the initial snapshot (version 0) synchronously."""
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._async_lock = threading.Lock()
+        self._reload_thread: threading.Thread | None = None
+        self._reload_queued = False
+        self._current = loader(0)
+
+    @property
+    def current(self) -> IndexSnapshot:
+        return self._current
+
+    def reload(self) -> IndexSnapshot:
+        """
+        Load a new snapshot and publish it.
+
+        Returns:
+            The newly published snapshot.
+
+        Raises:
+            Exception: Whatever ``loader`` raised; the old snapshot stays.
+        """
+        with self._lock:
+            started = time.perf_counter()
+            try:
+                snapshot = self._loader(self._current.version + 1)
+            except Exception as e:
+                logger.error(f"Index reload failed, keeping current snapshot: {e}")
+                raise
+            self._current = snapshot
+        logger.info(
+            f"Index snapshot v{snapshot.version} live "
+            f"({snapshot.size} vectors, loaded in "
+            f"{time.perf_counter() - started:.2f}s)"
+        )
+        return snapshot
+
+    @property
+    def reloading(self) -> bool:
+        """True while a background reload is running or queued."""
+        return self._reload_thread is not None
+
+    def reload_async(self) -> str:
+        """
+        Run :meth:`reload` on a background thread, coalescing requests.
+
+        Only one background reload runs at a time. A request that arrives
+        while one is running queues a single follow-up reload (so files
+        written mid-load are still picked up); further requests join that
+        queued reload instead of adding more.
+
+        Returns:
+            ``"reloading"`` if a background reload started, or ``"queued"``
+            if the request joined a reload that will run after the current
+            one.
+        """
+        with self._async_lock:
+            if self._reload_thread is not None:
+                self._reload_queued = True
+                return "queued"
+            self._reload_thread = threading.Thread(
+                target=self._reload_in_background, name="index-reload", daemon=True
+            )
+            self._reload_thread.start()
+            return "reloading"
+
+    def _reload_in_background(self) -> None:
+        while True:
+            try:
+                self.reload()
+            except Exception:
+                pass  # already logged; the current snapshot keeps serving
+            with self._async_lock:
+                if not self._reload_queued:
+                    self._reload_thread = None
+                    return
+                self._reload_queued = False
+
+    def update(self, change: Callable[[IndexSnapshot], Any]) -> Any:
+        """
+        Apply an in-place change (e.g. a live index add) and bump the version.
+
+        ``change`` runs under the reload lock, so it cannot interleave with a
+        reload.
+
+        Returns:
+            Whatever ``change`` returned.
+        """
+        with self._lock:
+            result = change(self._current)
+            snapshot = self._current
+            index = snapshot.live_index.index if snapshot.live_index else snapshot.index
+            self._current = replace(snapshot, index=index, version=snapshot.version + 1)
+            return result
+
+
+class IndexWatcher:
+    """
+    Poll index files and trigger a reload when a new build lands.
+
+    A change is acted on only once the files' size and modification time
+    have been stable for one full interval, so a build that is still being
+    written is not loaded half-way.
+
+    Example:
+        >>> watcher = IndexWatcher(
+        ...     [index_path, meta_ids_path], holder.reload, interval=30
+        ... )
+        >>> watcher.start()
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        on_change: Callable[[], Any],
+        interval: float = 30.0,
+    ):
+        """Record the files' current state as already loaded."""
+        self.paths = [Path(p) for p in paths]
+        self.on_change = on_change
+        self.interval = interval
+        self._loaded = self._signature()
+        self._pending: tuple | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _signature(self) -> tuple:
+        signature = []
+        for path in self.paths:
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def check(self) -> bool:
+        """
+        Poll once and call ``on_change`` if a stable change is seen.
+
+        Returns:
+            True if ``on_change`` ran successfully.
+        """
+        signature = self._signature()
+        if signature == self._loaded or None in signature:
+            self._pending = None
+            return False
+        if signature != self._pending:
+            self._pending = signature  # still changing; wait for it to settle
+            return False
+
+        logger.info("Index files changed, reloading")
+        try:
+            self.on_change()
+        except Exception as e:
+            logger.error(f"Index watcher reload failed: {e}")
+            return False
+        finally:
+            # Don't retry the same broken build every interval.
+            self._loaded = signature
+            self._pending = None
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> "IndexWatcher":
+        """Start polling on a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="index-watcher", daemon=True
+            )
+            self._thread.start()
+            logger.info(
+                f"Watching {len(self.paths)} index files every {self.interval}s"
+            )
+        return self
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,181 @@
+"""In-memory restaurant metadata aligned with FAISS index rows."""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from vibecheck.database import RestaurantDatabase
+from vibecheck.logging_config import get_logger
+from vibecheck.queries import files_signature
+
+logger = get_logger(__name__)
+
+
+class _Columns(NamedTuple):
+    """One immutable snapshot of the store's column arrays."""
+
+    present: np.ndarray
+    name: np.ndarray
+    rating: np.ndarray
+    address: np.ndarray
+    image_url: np.ndarray
+    image_path: np.ndarray
+    signature: tuple
+
+
+class RestaurantMetadataStore:
+    """
+    Read-only, columnar copy of the ``restaurants`` table keyed by FAISS row.
+
+    Every column is a numpy array with one slot per entry in ``meta_ids``, so
+    hydrating search results is plain array indexing: no SQL and no per-row
+    dictionaries are kept in memory. The store is loaded once and reloaded
+    when the database or its ``-wal`` file changes (see
+    :func:`~vibecheck.queries.files_signature`); if a reload fails, the
+    previous columns keep being served.
+
+    Example:
+        >>> meta_ids = np.load("data/restaurants_info/meta_ids.npy")
+        >>> store = RestaurantMetadataStore(
+        ...     "data/restaurants_info/restaurants.db", meta_ids
+        ... )
+        >>> store.hydrate(np.array([0, 3]), np.array([0.91, 0.87]))
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        meta_ids: np.ndarray,
+        image_dir: Path = Path("data/images/sample_images"),
+    ):
+        """Load metadata for every FAISS row in ``meta_ids``."""
+        self.db_path = Path(db_path)
+        self.meta_ids = meta_ids
+        self.image_dir = Path(image_dir)
+        self._reload_lock = threading.Lock()
+        self._columns = self._load()
+
+    def __len__(self) -> int:
+        return len(self.meta_ids)
+
+    def _db_signature(self) -> tuple:
+        # Committed writes sit in the -wal file until a checkpoint
+        return files_signature([self.db_path])
+
+    @property
+    def signature(self) -> tuple:
+        """State of the database files the current columns were read from."""
+        return self._columns.signature
+
+    def _load(self) -> _Columns:
+        """
+        Read the database into fresh column arrays.
+
+        Raises:
+            sqlite3.Error: If the database can't be read.
+        """
+        signature = self._db_signature()
+        logger.info(f"Loading metadata store for {len(self.meta_ids)} rows")
+
+        rows = RestaurantDatabase(self.db_path).get_restaurants(
+            self.meta_ids, strict=True
+        )
+
+        n = len(self.meta_ids)
+        present = np.zeros(n, dtype=bool)
+        name = np.empty(n, dtype=object)
+        rating = np.full(n, np.nan, dtype="float64")
+        address = np.empty(n, dtype=object)
+        image_url = np.empty(n, dtype=object)
+        image_path = np.empty(n, dtype=object)
+
+        for i, restaurant_id in enumerate(self.meta_ids):
+            row = rows.get(str(restaurant_id))
+            if row is None:
+                continue
+            present[i] = True
+            name[i] = row["name"]
+            if row["rating"] is not None:
+                rating[i] = row["rating"]
+            address[i] = row["address"]
+            image_url[i] = row["image_url"]
+            path = self.image_dir / f"{restaurant_id}.jpg"
+            image_path[i] = str(path) if path.exists() else None
+
+        logger.info(f"Metadata store loaded: {int(present.sum())}/{n} rows found")
+        return _Columns(
+            present, name, rating, address, image_url, image_path, signature
+        )
+
+    def reload(self) -> None:
+        """
+        Re-read the database and atomically swap in the new columns.
+
+        Raises:
+            sqlite3.Error: If the database can't be read; the current
+                columns are left in place.
+        """
+        with self._reload_lock:
+            self._columns = self._load()
+
+    def refresh_if_stale(self) -> bool:
+        """
+        Reload if the database (or its WAL) changed since the last load.
+
+        A failed reload is logged and the current columns stay in place;
+        it is retried on the next call.
+
+        Returns:
+            True if the store was reloaded.
+        """
+        if self._db_signature() == self._columns.signature:
+            return False
+
+        with self._reload_lock:
+            # Another thread may have reloaded while we waited for the lock.
+            if self._db_signature() == self._columns.signature:
+                return False
+            logger.info(f"Database changed, reloading metadata: {self.db_path}")
+            try:
+                self._columns = self._load()
+            except sqlite3.Error as e:
+                logger.error(f"Metadata reload failed, keeping previous data: {e}")
+                return False
+        return True
+
+    def hydrate(self, rows: np.ndarray, distances: np.ndarray) -> list[dict[str, Any]]:
+        """
+        Build result dictionaries for one query's FAISS hits.
+
+        Args:
+            rows: FAISS row indices for one query (``-1`` padding is skipped).
+            distances: Matching distances from the index search.
+
+        Returns:
+            Restaurant dictionaries in rank order, with the same keys as
+            :meth:`VibeCheckRecommender.get_restaurant_info` plus
+            ``distance`` and ``similarity``.
+        """
+        cols = self._columns  # single read so a concurrent reload can't mix
+        results = []
+        for row, distance in zip(rows, distances, strict=True):
+            if row < 0 or not cols.present[row]:
+                continue
+            rating = cols.rating[row]
+            distance = float(distance)
+            results.append(
+                {
+                    "id": str(self.meta_ids[row]),
+                    "name": cols.name[row],
+                    "rating": None if np.isnan(rating) else float(rating),
+                    "address": cols.address[row],
+                    "image_url": cols.image_url[row],
+                    "image_path": cols.image_path[row],
+                    "distance": distance,
+                    "similarity": 1.0 / (1.0 + distance),
+                }
+            )
+        return results
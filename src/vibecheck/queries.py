@@ -0,0 +1,291 @@
+"""Set-based SQL for the web app's listing endpoints."""
+
+import base64
+import binascii
+import json
+import sqlite3
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from vibecheck.cache import LRUCache
+from vibecheck.database import RestaurantDatabase
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Every rated restaurant with its vibe-map position and single top vibe, in one
+# pass: the window function ranks each restaurant's vibes instead of issuing
+# one ``vibe_analysis`` query per restaurant.
+MAP_DATA_SQL = """
+    WITH ranked_vibes AS (
+        SELECT restaurant_id, vibe_name, mention_count,
+               ROW_NUMBER() OVER (
+                   PARTITION BY restaurant_id
+                   ORDER BY mention_count DESC, id
+               ) AS vibe_rank
+        FROM vibe_analysis
+    )
+    SELECT r.id, r.name, r.rating, r.address, r.reviews_count,
+           vm.x, vm.y, vm.cluster, r.latitude, r.longitude,
+           rv.vibe_name AS top_vibe,
+           COALESCE(rv.mention_count, 0) AS vibe_count
+    FROM restaurants r
+    LEFT JOIN vibe_map_data vm ON vm.id = r.id
+    LEFT JOIN ranked_vibes rv ON rv.restaurant_id = r.id AND rv.vibe_rank = 1
+    WHERE r.rating IS NOT NULL
+"""
+
+
+def fetch_map_data(conn: sqlite3.Connection) -> list[dict[str, Any]]:
+    """
+    Rows for the vibe map, one per rated restaurant.
+
+    Args:
+        conn: Connection to the app database (needs ``vibe_map_data``,
+            imported from ``vibe_map.csv``).
+
+    Returns:
+        Dicts with id, name, rating, address, reviews_count, x, y, cluster,
+        latitude, longitude, top_vibe and vibe_count.
+    """
+    cursor = conn.execute(MAP_DATA_SQL)
+    columns = [c[0] for c in cursor.description]
+    return [dict(zip(columns, row, strict=True)) for row in cursor.fetchall()]
+
+
+# Per-restaurant lookups behind the details view
+RESTAURANT_SQL = """
+    SELECT id, name, rating, address, reviews_count, place_id, latitude, longitude
+    FROM restaurants
+    WHERE id = ?
+"""
+
+PHOTOS_SQL = """
+    SELECT local_filename, photo_url
+    FROM vibe_photos
+    WHERE restaurant_id = ?
+    LIMIT ?
+"""
+
+TOP_VIBES_SQL = """
+    SELECT vibe_name, mention_count
+    FROM vibe_analysis
+    WHERE restaurant_id = ?
+    ORDER BY mention_count DESC
+    LIMIT 3
+"""
+
+TOP_REVIEWS_SQL = """
+    SELECT review_text, likes
+    FROM reviews
+    WHERE restaurant_id = ?
+    ORDER BY likes DESC
+    LIMIT ?
+"""
+
+# One page of restaurants tagged with a vibe, with each one's first photo and
+# most-liked review, as a single statement. Pages are keyset-paginated on
+# (mention_count, rating, id), all descending, so page N costs the same as
+# page 1 instead of growing with an OFFSET.
+VIBE_RESTAURANTS_SQL = """
+    WITH page AS (
+        SELECT r.id, r.name, r.rating, r.address, r.reviews_count,
+               va.mention_count,
+               COALESCE(va.mention_count, 0) AS mention_key,
+               COALESCE(r.rating, -1.0) AS rating_key
+        FROM vibe_analysis va
+        JOIN restaurants r ON r.id = va.restaurant_id
+        WHERE va.vibe_name = :vibe
+          AND (
+              :after_id IS NULL
+              OR (COALESCE(va.mention_count, 0), COALESCE(r.rating, -1.0), r.id)
+                 < (:after_mentions, :after_rating, :after_id)
+          )
+        ORDER BY COALESCE(va.mention_count, 0) DESC, rating_key DESC, r.id DESC
+        LIMIT :limit
+    )
+    SELECT p.id, p.name, p.rating, p.address, p.reviews_count,
+           p.mention_count, p.rating_key,
+           (
+               SELECT vp.local_filename FROM vibe_photos vp
+               WHERE vp.restaurant_id = p.id
+               ORDER BY vp.id
+               LIMIT 1
+           ) AS photo_filename,
+           (
+               SELECT rv.review_text FROM reviews rv
+               WHERE rv.restaurant_id = p.id
+               ORDER BY rv.likes DESC
+               LIMIT 1
+           ) AS top_review,
+           p.mention_key
+    FROM page p
+    ORDER BY p.mention_key DESC, p.rating_key DESC, p.id DESC
+"""
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(mention_count: int, rating_key: float, restaurant_id: int) -> str:
+    """Opaque, URL-safe cursor pointing just after the given row."""
+    raw = json.dumps([mention_count, rating_key, restaurant_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, float, int]:
+    """
+    Inverse of :func:`encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        mention_count, rating_key, restaurant_id = json.loads(raw)
+        return int(mention_count), float(rating_key), int(restaurant_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def fetch_restaurants_by_vibe(
+    conn: sqlite3.Connection,
+    vibe_name: str,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    One page of restaurants with a vibe, most mentions first.
+
+    Args:
+        conn: Connection to the app database.
+        vibe_name: Vibe to filter on.
+        limit: Page size, capped at :data:`MAX_PAGE_SIZE`.
+        cursor: ``next_cursor`` from the previous page, or None for the first.
+
+    Returns:
+        Tuple of (restaurants, next_cursor); ``next_cursor`` is None on the
+        last page.
+
+    Raises:
+        ValueError: If ``cursor`` is malformed.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    after = decode_cursor(cursor) if cursor else (None, None, None)
+    rows = conn.execute(
+        VIBE_RESTAURANTS_SQL,
+        {
+            "vibe": vibe_name,
+            "after_mentions": after[0],
+            "after_rating": after[1],
+            "after_id": after[2],
+            "limit": limit + 1,  # one extra row tells us whether there's more
+        },
+    ).fetchall()
+
+    restaurants = []
+    for row in rows[:limit]:
+        review = row[8]
+        restaurants.append(
+            {
+                "id": row[0],
+                "name": row[1],
+                "rating": row[2],
+                "address": row[3],
+                "reviews_count": row[4],
+                "mention_count": row[5],
+                "photo_filename": row[7],
+                "top_review": review[:200] + "..." if review else None,
+            }
+        )
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last[9], last[6], last[0])
+    return restaurants, next_cursor
+
+
+RESTAURANT_CARDS_SQL = """
+    SELECT restaurant_id, card
+    FROM restaurant_cards
+    WHERE restaurant_id IN ({placeholders})
+"""
+
+
+def fetch_restaurant_cards(
+    conn: sqlite3.Connection, restaurant_ids: list[int]
+) -> dict[int, dict[str, Any]]:
+    """
+    Prebuilt cards (see :func:`vibecheck.schema.build_restaurant_cards`) for
+    ``restaurant_ids``, in one primary-key lookup per
+    ``RestaurantDatabase.MAX_IN_PARAMS`` ids.
+
+    Returns:
+        Mapping of restaurant id to card; ids without a card are absent.
+
+    Raises:
+        sqlite3.OperationalError: If the ``restaurant_cards`` table is missing.
+    """
+    ids = list(restaurant_ids)
+    cards = {}
+    for start in range(0, len(ids), RestaurantDatabase.MAX_IN_PARAMS):
+        chunk = ids[start : start + RestaurantDatabase.MAX_IN_PARAMS]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            RESTAURANT_CARDS_SQL.format(placeholders=placeholders), chunk
+        )
+        cards.update((restaurant_id, json.loads(card)) for restaurant_id, card in rows)
+    return cards
+
+
+def files_signature(paths: Iterable[Path]) -> tuple:
+    """
+    (path, mtime_ns, size) for each file; missing files give ``None``.
+
+    SQLite's ``-wal`` file is included for databases, since committed writes
+    land there before being checkpointed into the main file.
+    """
+    signature = []
+    for path in paths:
+        path = Path(path)
+        for candidate in (path, path.with_name(path.name + "-wal")):
+            try:
+                stat = candidate.stat()
+                signature.append((str(candidate), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((str(candidate), None))
+    return tuple(signature)
+
+
+class FileBackedJSONCache:
+    """
+    Serialized JSON payload rebuilt only when its source files change.
+
+    The payload is keyed by :func:`files_signature` of ``paths``, so writing
+    to the database or replacing the vibe map CSV invalidates it on the next
+    request, while unchanged data is served as pre-encoded bytes without
+    touching SQLite.
+
+    Example:
+        >>> cache = FileBackedJSONCache([db_path, csv_path])
+        >>> body = cache.get(lambda: {"restaurants": fetch_map_data(conn)})
+    """
+
+    def __init__(self, paths: Iterable[Path]):
+        """Watch ``paths`` for changes."""
+        self.paths = [Path(p) for p in paths]
+        self._cache = LRUCache(max_entries=1)
+
+    def get(self, build: Callable[[], Any]) -> bytes:
+        """Return the cached JSON bytes, calling ``build`` if files changed."""
+
+        def encode() -> bytes:
+            logger.info("Rebuilding cached JSON payload")
+            return json.dumps(build()).encode()
+
+        return self._cache.get_or_compute(files_signature(self.paths), encode)
+
+    def clear(self) -> None:
+        """Force a rebuild on the next :meth:`get`."""
+        self._cache.clear()
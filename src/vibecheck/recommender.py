@@ -4,21 +4,43 @@
 
 """Core recommendation engine for VibeCheck."""
 
-import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-import faiss
 import numpy as np
-import torch
 from PIL import Image
 
+from vibecheck.cache import LRUCache, content_key
 from vibecheck.database import RestaurantDatabase
-from vibecheck.embeddings.models import ModelCache
+from vibecheck.embeddings.encoders import Encoder, LocalEncoder
+from vibecheck.index import (
+    IndexConfig,
+    IndexSnapshot,
+    IndexWatcher,
+    LiveIndex,
+    SnapshotHolder,
+    load_array,
+    load_index,
+)
 from vibecheck.logging_config import get_logger
+from vibecheck.metadata_store import RestaurantMetadataStore
+from vibecheck.queries import files_signature
 
 logger = get_logger(__name__)
 
+MODALITIES = ("text", "image")
+
+
+def normalize_query_text(text: str) -> str:
+    """
+    Canonicalize a text query for cache lookups.
+
+    all-MiniLM-L6-v2 uses an uncased tokenizer that also splits on whitespace,
+    so lowercasing and collapsing whitespace never changes the embedding.
+    """
+    return " ".join(text.lower().split())
+
 
 class VibeCheckRecommender:
     """Main recommendation engine - same as before but with updated paths."""
@@ -29,34 +51,277 @@ class VibeCheckRecommender:
         image_dir: Path = Path("data/images/sample_images"),
         faiss_index_path: Path = Path("data/embeddings/vibecheck_index.faiss"),
         meta_ids_path: Path = Path("data/restaurants_info/meta_ids.npy"),
+        use_metadata_store: bool = False,
+        mmap: bool = False,
+        live_index_path: Path | None = None,
+        live_index_flush_interval: float = 5.0,
+        embeddings_path: Path | None = None,
+        index_config: IndexConfig | None = None,
+        encoder: Encoder | None = None,
+        warm: tuple[str, ...] = ("text",),
+        db_pool_size: int = 4,
+        text_cache_size: int = 4096,
+        text_cache_max_bytes: int | None = 16 * 1024 * 1024,
+        text_cache_ttl: float | None = 24 * 3600,
+        result_cache_size: int = 1024,
+        result_cache_ttl: float | None = 300,
+        image_cache_max_bytes: int = 32 * 1024 * 1024,
     ):
-        """Initialize with new data paths."""
+        """
+        Initialize with new data paths.
+
+        Args:
+            db_path: SQLite database with the ``restaurants`` table.
+            image_dir: Directory of per-restaurant images.
+            faiss_index_path: Serialized FAISS index.
+            meta_ids_path: Restaurant ids aligned with the index rows.
+            use_metadata_store: Load restaurant metadata into memory once
+                (see :class:`RestaurantMetadataStore`) so search results are
+                hydrated without touching SQLite. Intended for read-only
+                serving; the store reloads itself when the DB file changes.
+            mmap: Memory-map the FAISS index and ``meta_ids`` read-only so
+                multiple worker processes share them via the OS page cache.
+            live_index_path: Serve from an id-keyed :class:`LiveIndex` stored
+                here (built from ``embeddings_path`` on first use) so
+                restaurants can be added and removed without a restart. Needs
+                integer restaurant ids and cannot be combined with
+                ``use_metadata_store``.
+            live_index_flush_interval: Seconds live index changes are
+                batched before being written to ``live_index_path`` (see
+                :meth:`flush_index`).
+            embeddings_path: Embeddings aligned with ``meta_ids`` that the
+                live index is built from. Defaults to ``vibe_embeddings.npy``
+                next to ``faiss_index_path``.
+            index_config: Index type for the live index, normally the
+                ``params.yaml`` one the offline index was built with
+                (:func:`load_index_config`). Defaults to exact search.
+            encoder: Where queries are embedded. Defaults to a
+                :class:`LocalEncoder` (models in this process); pass a
+                :class:`RemoteEncoder` to use ``ml_service.py`` instead.
+            warm: Modalities (``"text"``, ``"image"``) whose models are
+                loaded now, concurrently with the index. The others load on
+                first use, so a text-only deployment never loads CLIP.
+            db_pool_size: Read-only SQLite connections shared by request
+                threads (0 falls back to one lock-serialized connection).
+            text_cache_size: Max cached text-query embeddings (0 disables).
+            text_cache_max_bytes: Memory cap for cached text embeddings.
+            text_cache_ttl: Seconds before a cached text embedding expires.
+            result_cache_size: Max cached text-search result lists
+                (0 disables).
+            result_cache_ttl: Seconds before cached results expire.
+            image_cache_max_bytes: Memory budget for CLIP vectors of uploaded
+                images, keyed by a hash of the raw bytes (0 disables).
+        """
         logger.info("Initializing VibeCheckRecommender")
         logger.debug(f"Database path: {db_path}")
         logger.debug(f"Image directory: {image_dir}")
         logger.debug(f"FAISS index: {faiss_index_path}")
         logger.debug(f"Meta IDs: {meta_ids_path}")
 
-        self.db = RestaurantDatabase(db_path)
-        self.db_path = db_path  # Store for get_restaurant_info
+        unknown = set(warm) - set(MODALITIES)
+        if unknown:
+            raise ValueError(f"Unknown modalities to warm: {sorted(unknown)}")
+        if live_index_path is not None and use_metadata_store:
+            raise ValueError(
+                "live_index_path cannot be combined with use_metadata_store"
+            )
+
+        self.db = RestaurantDatabase(db_path, persistent=True, pool_size=db_pool_size)
+        self.db_path = db_path
         self.image_dir = Path(image_dir)
 
-        # Load models
-        logger.info("Loading models...")
-        self.text_model = ModelCache.get_text_model()
-        self.clip_model, self.clip_preprocess = ModelCache.get_clip_model()
-        self.device = ModelCache.get_device()
+        # Models load lazily (or live in the model service)
+        self.encoder = encoder or LocalEncoder()
+
+        self.faiss_index_path = Path(faiss_index_path)
+        self.meta_ids_path = Path(meta_ids_path)
+        self.live_index_path = Path(live_index_path) if live_index_path else None
+        self.live_index_flush_interval = live_index_flush_interval
+        self.embeddings_path = Path(
+            embeddings_path or self.faiss_index_path.with_name("vibe_embeddings.npy")
+        )
+        self.index_config = index_config
+        self.use_metadata_store = use_metadata_store
+        self.mmap = mmap
+
+        # Warm the requested models on a side thread while the index loads
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            warming = pool.submit(
+                self.encoder.warm, text="text" in warm, image="image" in warm
+            )
+            self.snapshots = SnapshotHolder(self._load_snapshot)
+            warming.result()
+
+        self.text_cache = LRUCache(
+            max_entries=text_cache_size,
+            max_bytes=text_cache_max_bytes,
+            ttl=text_cache_ttl,
+        )
+        self.result_cache = LRUCache(
+            max_entries=result_cache_size, ttl=result_cache_ttl
+        )
+        # One 512-d float32 vector is 2 KiB, so the byte budget is the binding limit.
+        self.image_cache = LRUCache(
+            max_entries=image_cache_max_bytes // (512 * 4),
+            max_bytes=image_cache_max_bytes,
+        )
 
-        # Load search index
-        logger.info("Loading FAISS index...")
+    def _load_snapshot(self, version: int) -> IndexSnapshot:
+        """Load index, ids and (optionally) metadata into a new snapshot."""
+        logger.info(f"Loading FAISS index snapshot v{version}...")
         try:
-            self.index = faiss.read_index(str(faiss_index_path))
-            self.meta_ids = np.load(str(meta_ids_path))
-            logger.info(f"Loaded index with {len(self.meta_ids)} entries")
+            meta_ids = load_array(self.meta_ids_path, mmap=self.mmap)
+            live_index = None
+            if self.live_index_path is not None:
+                # Unsaved live updates would be lost by re-reading the file
+                self.flush_index()
+                live_index = LiveIndex.load_or_build(
+                    self.live_index_path,
+                    self.embeddings_path,
+                    meta_ids,
+                    config=self.index_config,
+                    flush_interval=self.live_index_flush_interval,
+                )
+                index = live_index.index
+            else:
+                index = load_index(self.faiss_index_path, mmap=self.mmap)
+            logger.info(f"Loaded index with {index.ntotal} entries")
         except Exception as e:
             logger.error(f"Failed to load index: {e}")
             raise
 
+        metadata_store = (
+            RestaurantMetadataStore(self.db_path, meta_ids, self.image_dir)
+            if self.use_metadata_store
+            else None
+        )
+        return IndexSnapshot(
+            index=index,
+            meta_ids=meta_ids,
+            version=version,
+            metadata_store=metadata_store,
+            live_index=live_index,
+        )
+
+    @property
+    def index(self):
+        return self.snapshots.current.index
+
+    @property
+    def meta_ids(self) -> np.ndarray:
+        return self.snapshots.current.meta_ids
+
+    @property
+    def metadata_store(self) -> RestaurantMetadataStore | None:
+        return self.snapshots.current.metadata_store
+
+    @property
+    def live_index(self) -> LiveIndex | None:
+        return self.snapshots.current.live_index
+
+    @property
+    def index_version(self) -> int:
+        """Bumped whenever the index contents change so cached results go stale."""
+        return self.snapshots.current.version
+
+    def _results_version(self) -> tuple:
+        """Everything cached text-search results depend on besides the query."""
+        snapshot = self.snapshots.current
+        live_generation = snapshot.live_index.generation if snapshot.live_index else 0
+        if snapshot.metadata_store is not None:
+            # Key on the data that will actually be served, reloading first
+            snapshot.metadata_store.refresh_if_stale()
+            db_signature = snapshot.metadata_store.signature
+        else:
+            db_signature = files_signature([self.db_path])
+        return snapshot.version, live_generation, db_signature
+
+    def warm(self, text: bool = True, image: bool = True) -> None:
+        """Load encoder models now instead of on the first query."""
+        self.encoder.warm(text=text, image=image)
+
+    def readiness(self) -> dict[str, bool]:
+        """
+        Which components are loaded, without loading anything.
+
+        Returns:
+            Dict with ``index``, ``text_model`` and ``clip_model`` flags.
+        """
+        # The first index snapshot is loaded in __init__
+        return {"index": True, **self.encoder.loaded()}
+
+    def reload_index(self, background: bool = False) -> IndexSnapshot | str:
+        """
+        Load the index files again and atomically swap them in.
+
+        In-flight searches finish on the snapshot they started with; later
+        searches use the new one. Cached text results are keyed by version,
+        so they are invalidated by the swap.
+
+        Args:
+            background: Load on a background thread and return immediately.
+                Background requests made while one is running are coalesced
+                (see :meth:`SnapshotHolder.reload_async`).
+
+        Returns:
+            The new snapshot, or the background reload status
+            (``"reloading"`` or ``"queued"``).
+
+        Example:
+            >>> recommender = VibeCheckRecommender()
+            >>> recommender.reload_index().version
+            1
+        """
+        if background:
+            return self.snapshots.reload_async()
+        return self.snapshots.reload()
+
+    def watch_index(self, interval: float = 30.0) -> IndexWatcher:
+        """
+        Reload automatically when a new index build is written.
+
+        Args:
+            interval: Seconds between checks of the index and ids files.
+
+        Returns:
+            The started watcher; call ``stop()`` to end it.
+        """
+        return IndexWatcher(
+            [self.faiss_index_path, self.meta_ids_path],
+            self.snapshots.reload,
+            interval=interval,
+        ).start()
+
+    def watch_live_index(self, interval: float = 5.0) -> IndexWatcher:
+        """
+        Pick up live index changes written by other processes.
+
+        Every worker keeps its own copy of the live index in memory, and
+        ``add_restaurant``/``remove_restaurant`` only change the worker that
+        handled the request. Its flush merges into ``live_index_path``; this
+        watcher merges the file back into every other worker.
+
+        Args:
+            interval: Seconds between checks of ``live_index_path``.
+
+        Returns:
+            The started watcher; call ``stop()`` to end it.
+        """
+        self._require_live_index()
+        return IndexWatcher(
+            [self.live_index_path], self.refresh_live_index, interval=interval
+        ).start()
+
+    def refresh_live_index(self) -> bool:
+        """
+        Merge live index changes other processes wrote to disk.
+
+        Returns:
+            True if the index changed.
+        """
+        live_index = self.live_index
+        return live_index is not None and live_index.refresh()
+
     def encode_text(self, text: str) -> np.ndarray:
         """
         Encode text query into embedding vector.
@@ -78,9 +343,7 @@ class VibeCheckRecommender:
             if len(text) > 50
             else f"Encoding text: {text}"
         )
-        return self.text_model.encode(
-            text, convert_to_numpy=True, normalize_embeddings=True
-        )
+        return self.encode_texts([text])[0]
 
     def encode_image(self, image: Image.Image) -> np.ndarray:
         """
@@ -101,13 +364,159 @@ class VibeCheckRecommender:
             (512,)
         """
         logger.debug("Encoding image...")
-        img_tensor = self.clip_preprocess(image).unsqueeze(0).to(self.device)
+        return self.encoder.encode_images([image])[0]
+
+    def encode_image_bytes(self, data: bytes) -> np.ndarray:
+        """
+        Encode raw uploaded image bytes, reusing the vector for repeat uploads.
+
+        The cache is keyed on a hash of the bytes, so a re-uploaded photo skips
+        decoding, CLIP preprocessing and the forward pass entirely.
+
+        Args:
+            data: Encoded image file contents (JPEG, PNG, ...).
+
+        Returns:
+            Normalized embedding vector of shape (512,).
+
+        Example:
+            >>> recommender = VibeCheckRecommender()
+            >>> with open("cafe.jpg", "rb") as f:
+            ...     vector = recommender.encode_image_bytes(f.read())
+            >>> vector.shape
+            (512,)
+        """
+        key = content_key(data)
+        cached = self.image_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Image embedding cache hit: {key}")
+            return cached
+
+        vector = self.encoder.encode_image_bytes([data])[0].astype("float32")
+        vector.setflags(write=False)  # shared by every later cache hit
+        self.image_cache.put(key, vector)
+        return vector
+
+    def encode_texts(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode a batch of text queries in a single model forward pass.
+
+        Args:
+            texts: Text descriptions of desired vibes.
+
+        Returns:
+            Normalized embedding matrix of shape (N, 384).
+
+        Example:
+            >>> recommender = VibeCheckRecommender()
+            >>> vectors = recommender.encode_texts(["cozy cafe", "rooftop bar"])
+            >>> vectors.shape
+            (2, 384)
+        """
+        keys = [normalize_query_text(text) for text in texts]
+        vectors = np.zeros((len(keys), 384), dtype="float32")
+
+        missing: dict[str, list[int]] = {}
+        for i, key in enumerate(keys):
+            cached = self.text_cache.get(key)
+            if cached is not None:
+                vectors[i] = cached
+            else:
+                missing.setdefault(key, []).append(i)
+
+        logger.debug(
+            f"Encoding {len(texts)} texts ({len(missing)} not in embedding cache)"
+        )
+        if missing:
+            encoded = self.encoder.encode_texts(list(missing))
+            for (key, rows), vector in zip(missing.items(), encoded, strict=True):
+                vector = vector.astype("float32")
+                vector.setflags(write=False)  # shared by every later cache hit
+                self.text_cache.put(key, vector)
+                vectors[rows] = vector
+
+        return vectors
+
+    def encode_images(self, images: list[Image.Image]) -> np.ndarray:
+        """
+        Encode a batch of images in a single CLIP forward pass.
+
+        Args:
+            images: PIL Images of desired aesthetics.
+
+        Returns:
+            Normalized embedding matrix of shape (N, 512).
 
-        with torch.no_grad():
-            img_vec = self.clip_model.encode_image(img_tensor)
+        Example:
+            >>> from PIL import Image
+            >>> recommender = VibeCheckRecommender()
+            >>> imgs = [Image.open("cafe.jpg"), Image.open("bar.jpg")]
+            >>> recommender.encode_images(imgs).shape
+            (2, 512)
+        """
+        logger.debug(f"Encoding {len(images)} images")
+        if not images:
+            return np.zeros((0, 512), dtype="float32")
+        return self.encoder.encode_images(images)
 
-        img_vec /= img_vec.norm(dim=-1, keepdim=True)
-        return img_vec.cpu().numpy()[0]
+    def encode_queries(
+        self,
+        texts: list[str | None] | None = None,
+        images: list[Image.Image | None] | None = None,
+    ) -> np.ndarray:
+        """
+        Encode a batch of multimodal queries into combined embeddings.
+
+        Texts and images are paired by position, so when both lists are given
+        they must have the same length. Missing entries (``None`` or empty
+        text) contribute a zero block, exactly like :meth:`encode_query`.
+
+        Args:
+            texts: Optional list of text descriptions.
+            images: Optional list of PIL Images.
+
+        Returns:
+            Combined embedding matrix of shape (N, 896).
+
+        Raises:
+            ValueError: If no queries are given, the lists differ in length,
+                or a query has neither text nor image.
+
+        Example:
+            >>> recommender = VibeCheckRecommender()
+            >>> vecs = recommender.encode_queries(texts=["cozy cafe", "dive bar"])
+            >>> vecs.shape
+            (2, 896)
+        """
+        if texts is not None and images is not None and len(texts) != len(images):
+            raise ValueError("texts and images must have the same length")
+
+        n = len(texts) if texts is not None else len(images or [])
+        if n == 0:
+            raise ValueError("Must provide at least one text or image query")
+
+        texts = texts if texts is not None else [None] * n
+        images = images if images is not None else [None] * n
+
+        for i, (text, image) in enumerate(zip(texts, images, strict=True)):
+            if not text and image is None:
+                raise ValueError(f"Query {i} has neither text nor image")
+
+        logger.info(f"Encoding batch of {n} queries")
+
+        combined = np.zeros((n, 896), dtype="float32")
+
+        text_rows = [i for i, text in enumerate(texts) if text]
+        if text_rows:
+            combined[text_rows, :384] = self.encode_texts([texts[i] for i in text_rows])
+
+        image_rows = [i for i, image in enumerate(images) if image is not None]
+        if image_rows:
+            combined[image_rows, 384:] = self.encode_images(
+                [images[i] for i in image_rows]
+            )
+
+        return combined
 
     def encode_query(
         self, text: str | None = None, image: Image.Image | None = None
@@ -172,17 +581,129 @@ class VibeCheckRecommender:
             >>> for rid, distance in results:
             ...     print(f"Restaurant {rid}: distance={distance:.4f}")
         """
-        logger.debug(f"Searching index for top {top_k} results")
-        distances, indices = self.index.search(query_vector, top_k)
+        return self.search_vectors(query_vector, top_k=top_k)[0]
 
-        results = []
-        for idx, distance in zip(indices[0], distances[0], strict=False):
-            restaurant_id = self.meta_ids[idx]
-            results.append((restaurant_id, float(distance)))
+    def search_vectors(
+        self, query_vectors: np.ndarray, top_k: int = 5
+    ) -> list[list[tuple[str, float]]]:
+        """
+        Search the FAISS index for a batch of query vectors in one call.
+
+        Args:
+            query_vectors: Query embedding matrix of shape (N, 896).
+            top_k: Number of top results to return per query.
+
+        Returns:
+            One list of (restaurant_id, distance) tuples per query row.
+
+        Example:
+            >>> recommender = VibeCheckRecommender()
+            >>> vecs = recommender.encode_queries(texts=["cozy cafe", "dive bar"])
+            >>> batches = recommender.search_vectors(vecs, top_k=5)
+            >>> len(batches)
+            2
+        """
+        return self._search_ids(self.snapshots.current, query_vectors, top_k)
+
+    def _search_ids(
+        self, snapshot: IndexSnapshot, query_vectors: np.ndarray, top_k: int
+    ) -> list[list[tuple[str, float]]]:
+        """Search one snapshot and map hits to restaurant ids."""
+        distances, indices = self._search_index(snapshot, query_vectors, top_k)
+
+        def to_id(idx) -> str:
+            # A live index stores restaurant ids as labels; otherwise map rows.
+            # Always a plain str: numpy scalars break dict lookups and JSON.
+            if snapshot.live_index is not None:
+                return str(int(idx))
+            return str(snapshot.meta_ids[idx])
 
-        logger.debug(f"Found {len(results)} results")
+        results = []
+        for row_indices, row_distances in zip(indices, distances, strict=True):
+            results.append(
+                [
+                    (to_id(idx), float(distance))
+                    for idx, distance in zip(row_indices, row_distances, strict=True)
+                    if idx >= 0  # FAISS pads with -1 when fewer than top_k hits
+                ]
+            )
+
+        logger.debug(f"Found {sum(len(r) for r in results)} results")
         return results
 
+    def _search_index(
+        self, snapshot: IndexSnapshot, query_vectors: np.ndarray, top_k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Run one FAISS search and return raw (distances, row indices or ids)."""
+        query_vectors = np.ascontiguousarray(query_vectors, dtype="float32")
+        logger.debug(
+            f"Searching index for top {top_k} results "
+            f"({query_vectors.shape[0]} queries)"
+        )
+        if snapshot.live_index is not None:
+            return snapshot.live_index.search(query_vectors, top_k)
+        return snapshot.index.search(query_vectors, top_k)
+
+    def _search_hydrated(
+        self, query_vectors: np.ndarray, top_k: int
+    ) -> list[list[dict[str, Any]]]:
+        """Search and hydrate, using the in-memory store when it is enabled."""
+        snapshot = self.snapshots.current  # one snapshot for the whole request
+        if snapshot.metadata_store is None:
+            return [
+                self._hydrate(search_results)
+                for search_results in self._search_ids(snapshot, query_vectors, top_k)
+            ]
+
+        snapshot.metadata_store.refresh_if_stale()
+        distances, indices = self._search_index(snapshot, query_vectors, top_k)
+        return [
+            snapshot.metadata_store.hydrate(row_indices, row_distances)
+            for row_indices, row_distances in zip(indices, distances, strict=True)
+        ]
+
+    def _fetch_restaurant_info(
+        self, restaurant_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Load display info for many restaurants in one database round trip."""
+        rows = self.db.get_restaurants(restaurant_ids)
+
+        found = {}
+        for restaurant_id in restaurant_ids:
+            row = rows.get(str(restaurant_id))
+            if row is None:
+                logger.debug(f"Restaurant not found: {restaurant_id}")
+                continue
+
+            image_path = self.image_dir / f"{restaurant_id}.jpg"
+            found[str(restaurant_id)] = {
+                "id": str(restaurant_id),
+                "name": row["name"],
+                "rating": row["rating"],
+                "address": row["address"],
+                "image_url": row["image_url"],
+                "image_path": str(image_path) if image_path.exists() else None,
+            }
+        return found
+
+    def _hydrate(self, search_results: list[tuple[str, float]]) -> list[dict[str, Any]]:
+        """Attach database details and similarity scores to raw search hits.
+
+        All hits are fetched with a single ``IN`` query and returned in the
+        original FAISS rank order.
+        """
+        found = self._fetch_restaurant_info([rid for rid, _ in search_results])
+
+        restaurants = []
+        for restaurant_id, distance in search_results:
+            info = found.get(str(restaurant_id))
+            if info:
+                info = dict(info)  # the same id may appear more than once
+                info["distance"] = distance
+                info["similarity"] = 1.0 / (1.0 + distance)
+                restaurants.append(info)
+        return restaurants
+
     def get_restaurant_info(self, restaurant_id: str) -> dict[str, Any] | None:
         """
         Get detailed information about a restaurant from the database.
@@ -192,7 +713,8 @@ class VibeCheckRecommender:
 
         Returns:
             Dictionary with restaurant details or None if not found.
-            Keys: 'id', 'name', 'rating', 'address', 'image_url', 'image_path'
+            Keys: 'id' (always a string), 'name', 'rating', 'address',
+            'image_url', 'image_path'
 
         Example:
             >>> recommender = VibeCheckRecommender()
@@ -202,28 +724,10 @@ class VibeCheckRecommender:
         """
         logger.debug(f"Fetching restaurant info: {restaurant_id}")
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                row = conn.execute(
-                    "SELECT name, rating, address, image_url FROM restaurants WHERE id=?",
-                    (restaurant_id,),
-                ).fetchone()
-
-            if not row:
-                logger.debug(f"Restaurant not found: {restaurant_id}")
-                return None
-
-            name, rating, address, image_url = row
-            image_path = self.image_dir / f"{restaurant_id}.jpg"
-
-            logger.debug(f"Found restaurant: {name}")
-            return {
-                "id": restaurant_id,
-                "name": name,
-                "rating": rating,
-                "address": address,
-                "image_url": image_url,
-                "image_path": str(image_path) if image_path.exists() else None,
-            }
+            info = self._fetch_restaurant_info([restaurant_id]).get(str(restaurant_id))
+            if info:
+                logger.debug(f"Found restaurant: {info['name']}")
+            return info
 
         except Exception as e:
             logger.error(f"Error fetching restaurant {restaurant_id}: {e}")
@@ -252,18 +756,15 @@ class VibeCheckRecommender:
             else f"Text search: '{text}' (top_k={top_k})"
         )
 
-        query_vec = self.encode_query(text=text)
-        search_results = self.search(query_vec, top_k=top_k)
+        cache_key = (normalize_query_text(text), top_k, self._results_version())
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Returning {len(cached)} cached results")
+            return [dict(resto) for resto in cached]
 
-        restaurants = []
-        for restaurant_id, distance in search_results:
-            info = self.get_restaurant_info(restaurant_id)
-            if info:
-                info["distance"] = distance
-                info["similarity"] = 1.0 / (
-                    1.0 + distance
-                )  # Convert distance to similarity
-                restaurants.append(info)
+        query_vec = self.encode_query(text=text)
+        restaurants = self._search_hydrated(query_vec, top_k=top_k)[0]
+        self.result_cache.put(cache_key, [dict(resto) for resto in restaurants])
 
         logger.info(f"Returning {len(restaurants)} results")
         return restaurants
@@ -292,15 +793,37 @@ class VibeCheckRecommender:
         logger.info(f"Image search (top_k={top_k})")
 
         query_vec = self.encode_query(image=image)
-        search_results = self.search(query_vec, top_k=top_k)
+        restaurants = self._search_hydrated(query_vec, top_k=top_k)[0]
 
-        restaurants = []
-        for restaurant_id, distance in search_results:
-            info = self.get_restaurant_info(restaurant_id)
-            if info:
-                info["distance"] = distance
-                info["similarity"] = 1.0 / (1.0 + distance)
-                restaurants.append(info)
+        logger.info(f"Returning {len(restaurants)} results")
+        return restaurants
+
+    def search_by_image_bytes(
+        self, data: bytes, top_k: int = 5
+    ) -> list[dict[str, Any]]:
+        """
+        Search for restaurants matching an uploaded image file.
+
+        Same as :meth:`search_by_image`, but takes the raw upload so repeat
+        uploads of the same photo hit the image embedding cache.
+
+        Args:
+            data: Encoded image file contents.
+            top_k: Number of results to return.
+
+        Returns:
+            List of restaurant dictionaries with full information.
+
+        Example:
+            >>> recommender = VibeCheckRecommender()
+            >>> with open("ideal_restaurant.jpg", "rb") as f:
+            ...     results = recommender.search_by_image_bytes(f.read(), top_k=3)
+        """
+        logger.info(f"Image upload search ({len(data)} bytes, top_k={top_k})")
+
+        query_vec = np.zeros((1, 896), dtype="float32")
+        query_vec[0, 384:] = self.encode_image_bytes(data)
+        restaurants = self._search_hydrated(query_vec, top_k=top_k)[0]
 
         logger.info(f"Returning {len(restaurants)} results")
         return restaurants
@@ -334,15 +857,165 @@ class VibeCheckRecommender:
         )
 
         query_vec = self.encode_query(text=text, image=image)
-        search_results = self.search(query_vec, top_k=top_k)
-
-        restaurants = []
-        for restaurant_id, distance in search_results:
-            info = self.get_restaurant_info(restaurant_id)
-            if info:
-                info["distance"] = distance
-                info["similarity"] = 1.0 / (1.0 + distance)
-                restaurants.append(info)
+        restaurants = self._search_hydrated(query_vec, top_k=top_k)[0]
 
         logger.info(f"Returning {len(restaurants)} results")
         return restaurants
+
+    def search_batch(
+        self,
+        texts: list[str | None] | None = None,
+        images: list[Image.Image | None] | None = None,
+        top_k: int = 5,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Run many text and/or image searches with one encode and one index call.
+
+        Queries are paired by position (see :meth:`encode_queries`), so this
+        covers text-only, image-only and multimodal batches.
+
+        Args:
+            texts: Optional list of text descriptions.
+            images: Optional list of PIL Images.
+            top_k: Number of results to return per query.
+
+        Returns:
+            One list of restaurant dictionaries per query, in input order.
+
+        Example:
+            >>> recommender = VibeCheckRecommender()
+            >>> batches = recommender.search_batch(
+            ...     texts=["cozy cafe", "rooftop bar"], top_k=3
+            ... )
+            >>> for results in batches:
+            ...     print([resto["name"] for resto in results])
+        """
+        query_vecs = self.encode_queries(texts=texts, images=images)
+        logger.info(f"Batch search: {len(query_vecs)} queries (top_k={top_k})")
+
+        batches = self._search_hydrated(query_vecs, top_k=top_k)
+
+        logger.info(f"Returning {sum(len(b) for b in batches)} results")
+        return batches
+
+    def embed_restaurant(
+        self, text: str | None = None, images: list[Image.Image] | None = None
+    ) -> np.ndarray:
+        """
+        Build a restaurant's index vector the same way the offline pipeline does.
+
+        Review text fills the 384-d text block; the renormalized mean of the
+        photos' CLIP vectors fills the 512-d image block. Document text does
+        not go through the query caches.
+
+        Args:
+            text: Review text describing the restaurant.
+            images: Photos of the restaurant.
+
+        Returns:
+            Combined embedding vector of shape (896,).
+
+        Raises:
+            ValueError: If neither text nor images are given.
+        """
+        if not text and not images:
+            raise ValueError("Must provide text or images to embed a restaurant")
+
+        vector = np.zeros(896, dtype="float32")
+        if text:
+            vector[:384] = self.encoder.encode_texts([text])[0]
+        if images:
+            image_vec = self.encode_images(images).mean(axis=0)
+            vector[384:] = image_vec / np.linalg.norm(image_vec)
+        return vector
+
+    def _require_live_index(self) -> None:
+        if self.live_index_path is None:
+            raise RuntimeError(
+                "Index is read-only; create the recommender with live_index_path"
+            )
+
+    def add_restaurant(
+        self,
+        restaurant_id: int,
+        text: str | None = None,
+        images: list[Image.Image] | None = None,
+    ) -> None:
+        """
+        Insert or re-embed one restaurant in the live index, without a restart.
+
+        The restaurant's row must already exist in the database for it to
+        appear in hydrated search results.
+
+        Args:
+            restaurant_id: Integer restaurant id.
+            text: Review text describing the restaurant.
+            images: Photos of the restaurant.
+
+        Raises:
+            RuntimeError: If the recommender has no live index.
+            ValueError: If the id is not an integer or nothing can be embedded.
+
+        Example:
+            >>> recommender = VibeCheckRecommender(
+            ...     live_index_path=Path("data/embeddings/vibecheck_live_index.faiss")
+            ... )
+            >>> recommender.add_restaurant(1234, text="Candlelit wine bar")
+        """
+        self._require_live_index()
+        vector = self.embed_restaurant(text=text, images=images)
+        # Runs under the snapshot lock, so a concurrent reload can't drop it.
+        self.snapshots.update(
+            lambda snapshot: snapshot.live_index.add([restaurant_id], vector[None, :])
+        )
+        logger.info(f"Indexed restaurant {restaurant_id}")
+
+    def flush_index(self) -> bool:
+        """
+        Write pending live index changes to disk now (e.g. before shutdown).
+
+        Returns:
+            True if anything was written.
+        """
+        snapshots = getattr(self, "snapshots", None)  # None while loading
+        if snapshots is None or snapshots.current.live_index is None:
+            return False
+        return snapshots.current.live_index.flush()
+
+    def remove_restaurant(self, restaurant_id: int) -> bool:
+        """
+        Remove one restaurant from the live index.
+
+        Args:
+            restaurant_id: Integer restaurant id.
+
+        Returns:
+            True if the restaurant was in the index, False otherwise.
+
+        Raises:
+            RuntimeError: If the recommender has no live index.
+        """
+        self._require_live_index()
+        removed = self.snapshots.update(
+            lambda snapshot: snapshot.live_index.remove([restaurant_id])
+        )
+        if removed:
+            logger.info(f"Removed restaurant {restaurant_id} from index")
+        return removed > 0
+
+    def cache_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Report hit/miss/eviction counters for the query caches.
+
+        Returns:
+            Mapping of cache name to its :class:`CacheStats` as a dictionary.
+
+        Example:
+            >>> recommender = VibeCheckRecommender()
+            >>> recommender.cache_stats()["text_embeddings"]["hit_rate"]
+        """
+        return {
+            "text_embeddings": self.text_cache.stats().to_dict(),
+            "text_results": self.result_cache.stats().to_dict(),
+            "image_embeddings": self.image_cache.stats().to_dict(),
+        }
@@ -0,0 +1,220 @@
+"""Schema migrations and derived tables for the restaurant database."""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+from vibecheck.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Restaurant columns copied into a card, when the table has them
+CARD_FIELDS = (
+    "id",
+    "name",
+    "rating",
+    "address",
+    "reviews_count",
+    "place_id",
+    "latitude",
+    "longitude",
+)
+
+# Secondary indexes for the web app's per-restaurant and per-vibe lookups.
+# Columns after the search key let SQLite read the ORDER BY (and, for
+# vibe_analysis, every selected column) straight from the index.
+INDEXES = {
+    "idx_reviews_restaurant_likes": "reviews (restaurant_id, likes DESC)",
+    "idx_vibe_photos_restaurant": "vibe_photos (restaurant_id)",
+    "idx_vibe_analysis_restaurant_mentions": (
+        "vibe_analysis (restaurant_id, mention_count DESC, vibe_name)"
+    ),
+    # Matches the by-vibe keyset, which treats NULL mention_count as 0
+    "idx_vibe_analysis_vibe_mention_key": (
+        "vibe_analysis "
+        "(vibe_name, COALESCE(mention_count, 0) DESC, restaurant_id, mention_count)"
+    ),
+}
+
+# Indexes replaced by the ones above, dropped so writes don't maintain them
+OBSOLETE_INDEXES = ("idx_vibe_analysis_vibe_mentions",)
+
+CARD_PHOTOS = 5
+CARD_VIBES = 3
+CARD_REVIEWS = 2
+CARD_REVIEW_CHARS = 200
+
+
+def migrate_schema(conn: sqlite3.Connection) -> list[str]:
+    """
+    Switch to WAL, create missing secondary indexes, refresh statistics.
+
+    Safe to run repeatedly (indexes are created ``IF NOT EXISTS``). Run it
+    after bulk loads: building an index once is cheaper than maintaining it
+    row by row, and ``ANALYZE`` needs the data to be there.
+
+    Args:
+        conn: Connection to the loaded database.
+
+    Returns:
+        Names of the indexes whose table exists (and which now exist).
+    """
+    tables = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    # WAL lets pooled read-only connections keep reading while a writer commits
+    conn.execute("PRAGMA journal_mode = WAL")
+
+    created = []
+    with conn:
+        for name in OBSOLETE_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        for name, definition in INDEXES.items():
+            if definition.split()[0] not in tables:
+                continue
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+            created.append(name)
+    conn.execute("ANALYZE")
+    conn.commit()
+    logger.info(f"Schema migrated: {len(created)} indexes, statistics refreshed")
+    return created
+
+
+def _top_rows(
+    conn: sqlite3.Connection, table: str, columns: str, order_by: str, limit: int
+) -> dict[int, list[tuple]]:
+    """The first ``limit`` rows of ``table`` per restaurant, in one pass."""
+    rows = conn.execute(
+        f"""
+        SELECT restaurant_id, {columns}
+        FROM (
+            SELECT restaurant_id, {columns},
+                   ROW_NUMBER() OVER (
+                       PARTITION BY restaurant_id ORDER BY {order_by}
+                   ) AS row_rank
+            FROM {table}
+        )
+        WHERE row_rank <= ?
+        ORDER BY restaurant_id, row_rank
+        """,
+        (limit,),
+    )
+    grouped: dict[int, list[tuple]] = {}
+    for restaurant_id, *values in rows:
+        grouped.setdefault(restaurant_id, []).append(tuple(values))
+    return grouped
+
+
+def _card(
+    restaurant: dict[str, Any],
+    photos: list[tuple],
+    vibes: list[tuple],
+    reviews: list[tuple],
+) -> dict[str, Any]:
+    """A search-result card, in the shape the web app returns per hit."""
+    card = dict(restaurant)
+    card["photos"] = [{"filename": f, "url": u} for f, u in photos]
+    card["photo_filename"] = photos[0][0] if photos else None
+    card["photo_url"] = photos[0][1] if photos else None
+    card["vibes"] = [{"name": name, "count": count} for name, count in vibes]
+    card["reviews"] = [
+        {"text": (text or "")[:CARD_REVIEW_CHARS] + "...", "likes": likes}
+        for text, likes in reviews
+    ]
+    return card
+
+
+def build_restaurant_cards(conn: sqlite3.Connection) -> int:
+    """
+    Materialize one denormalized JSON card per restaurant.
+
+    Each card holds the restaurant's basic fields, up to :data:`CARD_PHOTOS`
+    photos, its top :data:`CARD_VIBES` vibes and :data:`CARD_REVIEWS` most
+    liked reviews (truncated), so hydrating k search hits is one primary-key
+    lookup instead of four queries per hit. The table is rebuilt atomically;
+    rerun this whenever the source tables change.
+
+    Args:
+        conn: Connection to the loaded database.
+
+    Returns:
+        Number of cards written.
+
+    Example:
+        >>> conn = sqlite3.connect("data/vibecheck.db")
+        >>> build_restaurant_cards(conn)
+        1423
+    """
+    cursor = conn.execute("SELECT * FROM restaurants")
+    columns = [c[0] for c in cursor.description]
+    fields = [f for f in CARD_FIELDS if f in columns]
+    restaurants = [
+        {f: row[columns.index(f)] for f in fields} for row in cursor.fetchall()
+    ]
+
+    photos = _top_rows(
+        conn, "vibe_photos", "local_filename, photo_url", "id", CARD_PHOTOS
+    )
+    vibes = _top_rows(
+        conn,
+        "vibe_analysis",
+        "vibe_name, mention_count",
+        "mention_count DESC, id",
+        CARD_VIBES,
+    )
+    reviews = _top_rows(
+        conn, "reviews", "review_text, likes", "likes DESC, id", CARD_REVIEWS
+    )
+
+    cards = [
+        (
+            r["id"],
+            json.dumps(
+                _card(
+                    r,
+                    photos.get(r["id"], []),
+                    vibes.get(r["id"], []),
+                    reviews.get(r["id"], []),
+                )
+            ),
+        )
+        for r in restaurants
+    ]
+
+    with conn:  # one transaction: readers never see a half-built table
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS restaurant_cards (
+                restaurant_id INTEGER PRIMARY KEY,
+                card TEXT NOT NULL
+            )
+        """)
+        conn.execute("DELETE FROM restaurant_cards")
+        conn.executemany(
+            "INSERT INTO restaurant_cards (restaurant_id, card) VALUES (?, ?)",
+            cards,
+        )
+    logger.info(f"Built {len(cards)} restaurant cards")
+    return len(cards)
+
+
+def prepare_database(db_path: Path) -> int:
+    """
+    Run :func:`migrate_schema` and :func:`build_restaurant_cards` on a file.
+
+    Meant to run once per deploy, before any server process reads the
+    database (e.g. gunicorn's ``on_starting`` hook), not once per worker.
+
+    Args:
+        db_path: SQLite database to update in place.
+
+    Returns:
+        Number of cards written.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_schema(conn)
+        return build_restaurant_cards(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,149 @@
+"""End-to-end tests for the FastAPI service, served from a live index."""
+
+import hashlib
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")  # fastapi.testclient
+faiss = pytest.importorskip("faiss")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from api import main  # noqa: E402
+from vibecheck.embeddings.encoders import IMAGE_DIM, TEXT_DIM, Encoder  # noqa: E402
+from vibecheck.recommender import VibeCheckRecommender  # noqa: E402
+
+ADMIN_TOKEN = "test-admin-token"
+
+
+class HashEncoder(Encoder):
+    """Deterministic encoder for tests: each distinct text gets its own vector."""
+
+    def encode_texts(self, texts: list[str]) -> np.ndarray:
+        rows = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+            vector = np.random.default_rng(seed).normal(size=TEXT_DIM)
+            rows.append(vector / np.linalg.norm(vector))
+        return np.asarray(rows, dtype="float32").reshape(-1, TEXT_DIM)
+
+    def encode_images(self, images) -> np.ndarray:
+        return np.zeros((len(images), IMAGE_DIM), dtype="float32")
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db_path = tmp_path / "restaurants.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE restaurants (id INTEGER PRIMARY KEY, name TEXT, "
+            "rating REAL, address TEXT, image_url TEXT, categories TEXT, "
+            "review_snippet TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO restaurants (id, name, rating, address) VALUES (?, ?, ?, ?)",
+            [
+                (1, "Candle Bar", 4.5, "1 Main St"),
+                (2, "Plant Cafe", 4.0, "2 Main St"),
+                (3, "Dive Bar", None, None),
+                (4, "Rooftop", 4.8, "4 Main St"),
+            ],
+        )
+
+    encoder = HashEncoder()
+    texts = ["candlelit wine bar", "cafe full of plants", "sticky dive bar"]
+    embeddings = np.hstack(
+        [encoder.encode_texts(texts), np.zeros((3, IMAGE_DIM), dtype="float32")]
+    )
+    index = faiss.IndexFlatIP(TEXT_DIM + IMAGE_DIM)
+    index.add(embeddings)
+    faiss.write_index(index, str(tmp_path / "index.faiss"))
+    np.save(tmp_path / "meta_ids.npy", np.array([1, 2, 3]))
+    np.save(tmp_path / "vibe_embeddings.npy", embeddings)
+
+    recommender = VibeCheckRecommender(
+        db_path=db_path,
+        image_dir=tmp_path,
+        faiss_index_path=tmp_path / "index.faiss",
+        meta_ids_path=tmp_path / "meta_ids.npy",
+        live_index_path=tmp_path / "live.faiss",
+        encoder=encoder,
+        warm=(),
+        db_pool_size=1,
+    )
+    monkeypatch.setattr(main, "_recommender", recommender)
+    monkeypatch.setenv("ADMIN_TOKEN", ADMIN_TOKEN)
+    yield TestClient(main.app)
+    recommender.db.close()
+
+
+def _search(client, query: str) -> list[dict]:
+    response = client.post("/api/search/text", json={"query": query, "top_k": 2})
+    assert response.status_code == 200, response.text
+    return response.json()["results"]
+
+
+def test_text_search_returns_string_ids(client):
+    results = _search(client, "candlelit wine bar")
+    assert results[0]["id"] == "1"
+    assert results[0]["name"] == "Candle Bar"
+    assert all(isinstance(r["id"], str) for r in results)
+
+
+def test_index_updates_require_admin_token(client, monkeypatch):
+    url = "/api/restaurants/4/index"
+    assert client.post(url, data={"text": "rooftop"}).status_code == 401
+    wrong = {"Authorization": "Bearer nope"}
+    assert client.delete(url, headers=wrong).status_code == 401
+
+    monkeypatch.delenv("ADMIN_TOKEN")
+    auth = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+    assert client.post(url, data={"text": "rooftop"}, headers=auth).status_code == 403
+
+
+def test_add_and_remove_restaurant(client):
+    auth = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+    url = "/api/restaurants/4/index"
+
+    response = client.post(url, data={"text": "rooftop with a view"}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"id": 4, "indexed": True, "index_size": 4}
+    assert _search(client, "rooftop with a view")[0]["id"] == "4"
+
+    response = client.delete(url, headers=auth)
+    assert response.json() == {"id": 4, "indexed": False, "index_size": 3}
+    assert "4" not in [r["id"] for r in _search(client, "rooftop with a view")]
+    assert client.delete(url, headers=auth).status_code == 404
+
+
+def test_reload_requires_admin_token(client):
+    assert client.post("/api/index/reload").status_code == 401
+    auth = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+    response = client.post("/api/index/reload", headers=auth)
+    assert response.status_code == 202
+    assert response.json()["status"] in ("reloading", "queued")
+
+    deadline = time.monotonic() + 5
+    while main._recommender.snapshots.reloading and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.get("/api/index").json()["version"] == 1
+
+
+def test_index_endpoints_return_503_while_loading(monkeypatch):
+    monkeypatch.setattr(main, "_recommender", None)
+    monkeypatch.setattr(main, "_create_recommender", lambda: pytest.fail("loaded"))
+    monkeypatch.setenv("ADMIN_TOKEN", ADMIN_TOKEN)
+    auth = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+    client = TestClient(main.app)
+    for method, url in [
+        ("get", "/api/index"),
+        ("post", "/api/index/reload"),
+        ("get", "/api/stats/cache"),
+    ]:
+        response = getattr(client, method)(url, headers=auth)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"]
@@ -0,0 +1,100 @@
+"""Tests for the bounded LRU cache."""
+
+import numpy as np
+import pytest
+
+from vibecheck import cache as cache_module
+from vibecheck.cache import LRUCache, content_key
+
+
+class Clock:
+    """Stand-in for ``time.monotonic`` that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats().evictions == 1
+
+
+def test_replacing_a_key_does_not_grow_the_cache():
+    cache = LRUCache(max_entries=2, sizeof=lambda value: 10)
+    cache.put("a", 1)
+    cache.put("a", 2)
+    assert cache.get("a") == 2
+    assert (len(cache), cache.stats().bytes) == (1, 10)
+
+
+def test_byte_budget_evicts_until_under_limit():
+    cache = LRUCache(max_entries=100, max_bytes=1000)
+    for i in range(3):
+        cache.put(i, np.zeros(100, dtype="float32"))  # 400 bytes each
+    stats = cache.stats()
+    assert 0 not in cache
+    assert (stats.entries, stats.bytes, stats.evictions) == (2, 800, 1)
+
+
+def test_value_larger_than_budget_is_not_cached():
+    cache = LRUCache(max_entries=10, max_bytes=100)
+    cache.put("small", np.zeros(10, dtype="float32"))
+    cache.put("huge", np.zeros(100, dtype="float32"))
+    assert "huge" not in cache
+    assert "small" in cache  # nothing evicted to make room
+
+
+def test_zero_entries_disables_caching():
+    cache = LRUCache(max_entries=0)
+    cache.put("a", 1)
+    assert len(cache) == 0
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LRUCache(ttl=60)
+    cache.put("a", 1)
+    clock.now += 59
+    assert cache.get("a") == 1
+
+    clock.now += 2
+    assert "a" not in cache
+    assert cache.get("a", "missing") == "missing"
+    stats = cache.stats()
+    assert (stats.expirations, stats.entries, stats.bytes) == (1, 0, 0)
+
+
+def test_stats_count_hits_and_misses():
+    cache = LRUCache()
+    assert cache.get_or_compute("q", lambda: 42) == 42
+    assert cache.get_or_compute("q", lambda: pytest.fail("recomputed")) == 42
+    cache.get("other")
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 2)
+    assert stats.to_dict()["hit_rate"] == pytest.approx(1 / 3)
+
+    cache.clear()
+    assert cache.stats().entries == 0
+    assert cache.stats().hits == 1  # counters survive clear()
+
+
+def test_content_key_is_stable_per_content():
+    assert content_key(b"image") == content_key(b"image")
+    assert content_key(b"image") != content_key(b"other")
@@ -0,0 +1,80 @@
+"""Tests for the read-only SQLite connection pool."""
+
+import logging
+import sqlite3
+
+import pytest
+
+from vibecheck import database
+from vibecheck.database import ConnectionPool
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "restaurants.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE restaurants (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.execute("INSERT INTO restaurants (name) VALUES ('Cafe')")
+        conn.execute("PRAGMA journal_mode = WAL")
+    return path
+
+
+def test_connections_are_reused(db_path):
+    pool = ConnectionPool(db_path, size=2)
+    with pool.connection() as first:
+        first.execute("SELECT 1")
+    with pool.connection() as second:
+        assert second is first
+        with pool.connection() as nested:
+            assert nested is not first
+    assert pool._opened == 2
+    pool.close()
+
+
+def test_connections_are_read_only(db_path):
+    pool = ConnectionPool(db_path, size=1)
+    with pool.connection() as conn:
+        assert conn.execute("SELECT name FROM restaurants").fetchone() == ("Cafe",)
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO restaurants (name) VALUES ('Bar')")
+    pool.close()
+
+
+def test_exhausted_pool_times_out(db_path):
+    pool = ConnectionPool(db_path, size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(sqlite3.OperationalError, match="No free database"):
+            with pool.connection():
+                pass
+    # The held connection went back to the pool
+    with pool.connection():
+        pass
+    pool.close()
+
+
+def test_fork_discards_inherited_connections(db_path, monkeypatch):
+    pool = ConnectionPool(db_path, size=1, timeout=0.05)
+    with pool.connection() as parent_conn:
+        # Simulate running in a forked child: the pool starts over, so the
+        # borrowed connection doesn't count against the child's size.
+        monkeypatch.setattr(database.os, "getpid", lambda: -1)
+        with pool.connection() as child_conn:
+            assert child_conn is not parent_conn
+
+    # The parent's connection was closed on return instead of pooled
+    with pytest.raises(sqlite3.ProgrammingError):
+        parent_conn.execute("SELECT 1")
+    with pool.connection() as conn:
+        assert conn is child_conn
+    pool.close()
+
+
+def test_warns_when_database_is_not_wal(tmp_path, caplog):
+    path = tmp_path / "rollback.db"
+    sqlite3.connect(path).close()
+    pool = ConnectionPool(path, size=1)
+    with caplog.at_level(logging.WARNING, logger="vibecheck"):
+        with pool.connection():
+            pass
+    assert "not WAL" in caplog.text
+    pool.close()
@@ -0,0 +1,113 @@
+"""Tests for the fingerprinted, incrementally updated embedding store."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from vibecheck.embeddings.store import (
+    EmbeddingStore,
+    _atomic_save,
+    fingerprint_inputs,
+)
+
+CONFIG = {"text_model": "all-MiniLM-L6-v2", "photos": 3}
+
+
+def _vector(value: float) -> np.ndarray:
+    return np.full(896, value, dtype="float32")
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / "vibe_embeddings.npy", tmp_path / "meta_ids.npy"
+
+
+def _store(paths, config=CONFIG) -> EmbeddingStore:
+    return EmbeddingStore(*paths, config=config)
+
+
+def _saved_store(paths) -> EmbeddingStore:
+    store = _store(paths)
+    store.apply(
+        [1, 2, 3],
+        np.stack([_vector(1), _vector(2), _vector(3)]),
+        {"1": "a", "2": "b", "3": "c"},
+    )
+    store.save()
+    return store
+
+
+def test_fingerprint_tracks_text_and_image_files(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_bytes(b"jpeg")
+    base = fingerprint_inputs("cozy cafe", [photo])
+    assert fingerprint_inputs("cozy cafe", [photo]) == base
+    assert fingerprint_inputs("cozy bar", [photo]) != base
+    assert fingerprint_inputs("cozy cafe", []) != base
+
+    stat = photo.stat()
+    os.utime(photo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert fingerprint_inputs("cozy cafe", [photo]) != base
+
+
+def test_missing_files_start_empty(paths):
+    store = _store(paths)
+    assert len(store) == 0
+    assert store.embeddings.shape == (0, 896)
+
+
+def test_diff_reports_new_changed_and_removed(paths):
+    store = _saved_store(paths)
+    changed, removed = store.diff({"1": "a", "2": "b2", "4": "d"})
+    assert sorted(changed) == ["2", "4"]
+    assert removed == ["3"]
+
+
+def test_apply_updates_in_place_appends_and_removes(paths):
+    store = _saved_store(paths)
+    store.apply(
+        [2, 4],
+        np.stack([_vector(20), _vector(4)]),
+        {"2": "b2", "4": "d"},
+        removed=["3"],
+    )
+    assert store.meta_ids == [1, 2, 4]  # unchanged rows keep their positions
+    assert store.embeddings[:, 0].tolist() == [1, 20, 4]
+    assert store.fingerprints == {"1": "a", "2": "b2", "4": "d"}
+
+
+def test_save_and_reload_round_trip(paths):
+    _saved_store(paths)
+    store = _store(paths)
+    assert store.meta_ids == [1, 2, 3]
+    assert store.embeddings[:, 0].tolist() == [1, 2, 3]
+    assert store.diff({"1": "a", "2": "b", "3": "c"}) == ([], [])
+
+
+def test_config_change_discards_stored_fingerprints(paths):
+    _saved_store(paths)
+    store = _store(paths, config={**CONFIG, "photos": 5})
+    assert len(store) == 0
+    changed, _ = store.diff({"1": "a"})
+    assert changed == ["1"]
+
+
+def test_inconsistent_files_are_rebuilt(paths):
+    _saved_store(paths)
+    np.save(paths[1], np.array([1, 2]))
+    assert len(_store(paths)) == 0
+
+
+def test_atomic_save_keeps_old_file_when_write_fails(tmp_path):
+    path = tmp_path / "store.json"
+    _atomic_save(path, lambda f: f.write(b'{"v": 1}'))
+
+    def broken(f):
+        f.write(b'{"v": ')
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        _atomic_save(path, broken)
+    assert json.loads(path.read_bytes()) == {"v": 1}
@@ -0,0 +1,72 @@
+"""Backpressure and accounting tests for the inference executor."""
+
+import asyncio
+import threading
+
+import pytest
+
+from vibecheck.api import ExecutorOverloaded, InferenceExecutor
+
+
+async def _wait_until(predicate, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.005)
+
+
+def test_rejects_beyond_max_pending_and_counts():
+    inference = InferenceExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(inference.run(release.wait, 5))
+        await _wait_until(lambda: inference.stats()["running"] == 1)
+        queued = asyncio.ensure_future(inference.run(lambda: "queued"))
+        await asyncio.sleep(0)  # let it reach the pool
+
+        stats = inference.stats()
+        assert (stats["running"], stats["queued"]) == (1, 1)
+
+        with pytest.raises(ExecutorOverloaded):
+            await inference.run(lambda: "rejected")
+        assert inference.stats()["rejected"] == 1
+
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+
+    try:
+        asyncio.run(scenario())
+        stats = inference.stats()
+        assert stats["running"] == 0
+        assert stats["queued"] == 0
+        assert stats["completed"] == 2
+        assert stats["rejected"] == 1
+        # The queued job waited behind the blocked one
+        assert stats["queue_wait_ms_max"] > 0
+        assert stats["queue_wait_ms_p50"] <= stats["queue_wait_ms_max"]
+    finally:
+        release.set()
+        inference.shutdown()
+
+
+def test_capacity_is_released_after_failures():
+    inference = InferenceExecutor(max_workers=1, max_queue=0)
+
+    def fail():
+        raise ValueError("boom")
+
+    async def scenario():
+        for _ in range(3):
+            with pytest.raises(ValueError, match="boom"):
+                await inference.run(fail)
+        return await inference.run(lambda: "ok")
+
+    try:
+        assert asyncio.run(scenario()) == "ok"
+        stats = inference.stats()
+        assert (stats["completed"], stats["rejected"], stats["queued"]) == (4, 0, 0)
+    finally:
+        inference.shutdown()
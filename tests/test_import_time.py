@@ -0,0 +1,62 @@
+"""Import-time budget for the vibecheck package."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Generous enough for a cold CI runner; a regression that imports torch or
+# FAISS eagerly costs seconds, not milliseconds.
+IMPORT_BUDGET_MS = float(os.getenv("VIBECHECK_IMPORT_BUDGET_MS", "500"))
+
+HEAVY_MODULES = [
+    "torch",
+    "clip",
+    "faiss",
+    "sentence_transformers",
+    "mlflow",
+    "umap",
+    "hdbscan",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import vibecheck
+from vibecheck.database import RestaurantDatabase
+elapsed_ms = (time.perf_counter() - start) * 1000
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"elapsed_ms": elapsed_ms, "heavy": heavy}}))
+"""
+
+
+def _import_in_fresh_interpreter() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SRC_DIR), env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_heavy_dependencies():
+    """``import vibecheck`` must not pull in the ML stack."""
+    assert _import_in_fresh_interpreter()["heavy"] == []
+
+
+def test_import_time_within_budget():
+    """Best of three cold imports stays under VIBECHECK_IMPORT_BUDGET_MS."""
+    elapsed = min(_import_in_fresh_interpreter()["elapsed_ms"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_MS, (
+        f"import vibecheck took {elapsed:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms);"
+        " run `python -X importtime -c 'import vibecheck'` to find the culprit"
+    )
@@ -0,0 +1,145 @@
+"""Tests for swappable index snapshots and the index file watcher."""
+
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from vibecheck.index.snapshot import IndexSnapshot, IndexWatcher, SnapshotHolder
+
+
+class FakeIndex:
+    """Just enough of a FAISS index for a snapshot: its size."""
+
+    def __init__(self, ntotal: int):
+        self.ntotal = ntotal
+
+
+class Loader:
+    """Snapshot loader that counts calls and can be blocked or made to fail."""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, version: int) -> IndexSnapshot:
+        self.calls += 1
+        self.gate.wait(5)
+        if self.fail:
+            raise OSError("index file is truncated")
+        return IndexSnapshot(FakeIndex(10 + version), np.arange(3), version)
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.005)
+
+
+def test_reload_swaps_in_a_new_version():
+    loader = Loader()
+    holder = SnapshotHolder(loader)
+    first = holder.current
+    assert (first.version, first.size) == (0, 10)
+
+    snapshot = holder.reload()
+    assert snapshot is holder.current
+    assert (snapshot.version, snapshot.size) == (1, 11)
+    assert first.version == 0  # readers holding the old snapshot are unaffected
+
+
+def test_failed_reload_keeps_serving_current_snapshot():
+    loader = Loader()
+    holder = SnapshotHolder(loader)
+    loader.fail = True
+    with pytest.raises(OSError):
+        holder.reload()
+    assert holder.current.version == 0
+
+
+def test_update_bumps_version_and_returns_result():
+    holder = SnapshotHolder(Loader())
+    assert holder.update(lambda snapshot: snapshot.size * 2) == 20
+    assert holder.current.version == 1
+
+
+def test_background_reloads_are_coalesced():
+    loader = Loader()
+    holder = SnapshotHolder(loader)
+    loader.gate.clear()  # hold the first background reload mid-load
+
+    assert holder.reload_async() == "reloading"
+    _wait_for(lambda: loader.calls == 2)
+    assert [holder.reload_async() for _ in range(5)] == ["queued"] * 5
+
+    loader.gate.set()
+    _wait_for(lambda: not holder.reloading)
+    # The initial load, the running reload and one coalesced follow-up
+    assert loader.calls == 3
+    assert holder.current.version == 2
+    assert holder.reload_async() == "reloading"
+    _wait_for(lambda: not holder.reloading)
+
+
+def _bump(path):
+    stat = path.stat()
+    path.write_bytes(path.read_bytes() + b"x")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def index_files(tmp_path):
+    paths = [tmp_path / "index.faiss", tmp_path / "meta_ids.npy"]
+    for path in paths:
+        path.write_bytes(b"v1")
+    return paths
+
+
+def test_watcher_reloads_once_change_is_stable(index_files):
+    changes = []
+    watcher = IndexWatcher(index_files, lambda: changes.append(1))
+    assert not watcher.check()  # nothing changed yet
+
+    _bump(index_files[0])
+    assert not watcher.check()  # first sighting: may still be being written
+    assert watcher.check()
+    assert changes == [1]
+    assert not watcher.check()  # already loaded
+
+
+def test_watcher_waits_while_files_keep_changing(index_files):
+    changes = []
+    watcher = IndexWatcher(index_files, lambda: changes.append(1))
+    _bump(index_files[0])
+    assert not watcher.check()
+    _bump(index_files[1])
+    assert not watcher.check()
+    assert watcher.check()
+    assert changes == [1]
+
+
+def test_watcher_ignores_missing_files(index_files):
+    watcher = IndexWatcher(index_files, lambda: pytest.fail("reloaded"))
+    index_files[1].unlink()
+    assert not watcher.check()
+    assert not watcher.check()
+
+
+def test_watcher_does_not_retry_a_broken_build(index_files):
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise OSError("bad build")
+
+    watcher = IndexWatcher(index_files, broken)
+    _bump(index_files[0])
+    watcher.check()
+    assert not watcher.check()
+    assert not watcher.check()
+    assert calls == [1]
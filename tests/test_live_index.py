@@ -0,0 +1,198 @@
+"""Tests for the mutable, id-keyed live FAISS index."""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from vibecheck.index import IndexConfig  # noqa: E402
+from vibecheck.index.live import LiveIndex  # noqa: E402
+
+DIM = 16
+
+
+def _vectors(n: int, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).normal(size=(n, DIM)).astype("float32")
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _top_id(live: LiveIndex, query: np.ndarray) -> int:
+    _, ids = live.search(query[None, :], 1)
+    return int(ids[0][0])
+
+
+def test_add_replace_remove_search():
+    vectors = _vectors(4)
+    live = LiveIndex.from_embeddings(vectors[:3], [10, 20, 30])
+    assert _top_id(live, vectors[1]) == 20
+
+    live.add([40], vectors[3:4])
+    assert live.ntotal == 4
+    assert _top_id(live, vectors[3]) == 40
+
+    # Re-adding an id replaces its vector instead of duplicating it
+    live.add([40], vectors[0:1])
+    assert live.ntotal == 4
+    _, ids = live.search(vectors[0][None, :], 2)
+    assert sorted(ids[0].tolist()) == [10, 40]
+
+    assert live.remove([20]) == 1
+    assert live.remove([20, 99]) == 0
+    assert live.ntotal == 3
+    assert _top_id(live, vectors[1]) != 20
+
+
+def test_rejects_non_integer_ids():
+    live = LiveIndex.from_embeddings(_vectors(1), [1])
+    with pytest.raises(ValueError, match="integers"):
+        live.add(["abc"], _vectors(1))
+
+
+def test_changes_are_batched_until_flush(tmp_path):
+    path = tmp_path / "live.faiss"
+    vectors = _vectors(5)
+    live = LiveIndex.from_embeddings(vectors[:3], [1, 2, 3], path, flush_interval=60)
+    live.save()
+
+    live.add([4], vectors[3:4])
+    live.add([5], vectors[4:5])
+    assert live.dirty
+    assert faiss.read_index(str(path)).ntotal == 3  # nothing written yet
+
+    assert live.flush()
+    assert not live.dirty
+    assert faiss.read_index(str(path)).ntotal == 5
+    assert not live.flush()  # nothing pending
+
+
+def test_pending_changes_flush_after_interval(tmp_path):
+    path = tmp_path / "live.faiss"
+    vectors = _vectors(2)
+    live = LiveIndex.from_embeddings(vectors[:1], [1], path, flush_interval=0.05)
+    live.add([2], vectors[1:2])
+
+    deadline = time.monotonic() + 5
+    while live.dirty and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert faiss.read_index(str(path)).ntotal == 2
+
+
+def test_zero_interval_writes_every_change(tmp_path):
+    path = tmp_path / "live.faiss"
+    vectors = _vectors(2)
+    live = LiveIndex.from_embeddings(vectors[:1], [1], path, flush_interval=0)
+    live.add([2], vectors[1:2])
+    assert not live.dirty
+    assert faiss.read_index(str(path)).ntotal == 2
+
+
+def test_load_or_build_builds_from_embeddings_then_reuses_live_copy(tmp_path):
+    vectors = _vectors(3)
+    embeddings_path = tmp_path / "vibe_embeddings.npy"
+    np.save(embeddings_path, vectors)
+    live_path = tmp_path / "live.faiss"
+
+    live = LiveIndex.load_or_build(live_path, embeddings_path, np.array([7, 8, 9]))
+    assert live_path.exists()
+    assert _top_id(live, vectors[2]) == 9  # rows became restaurant ids
+
+    live.remove([9])
+    live.flush()
+    reloaded = LiveIndex.load_or_build(live_path, embeddings_path, np.array([7, 8, 9]))
+    assert reloaded.ntotal == 2
+
+
+def test_builds_configured_index_type():
+    vectors = _vectors(200)
+    config = IndexConfig(type="ivf_flat", nlist=4, nprobe=4)
+    live = LiveIndex.from_embeddings(vectors, range(1000, 1200), config=config)
+    assert faiss.try_extract_index_ivf(live.index) is not None
+    assert _top_id(live, vectors[5]) == 1005
+
+    assert live.remove([1005]) == 1
+    assert _top_id(live, vectors[5]) != 1005
+    live.add([5000], vectors[5:6])
+    assert _top_id(live, vectors[5]) == 5000
+
+
+def test_hnsw_config_falls_back_to_flat():
+    config = IndexConfig(type="hnsw")
+    live = LiveIndex.from_embeddings(_vectors(3), [1, 2, 3], config=config)
+    assert live.remove([2]) == 1
+
+
+def test_searches_run_during_updates():
+    vectors = _vectors(200)
+    live = LiveIndex.from_embeddings(vectors[:100], range(100))
+    errors = []
+
+    def search():
+        try:
+            for _ in range(50):
+                distances, ids = live.search(vectors[:4], 5)
+                assert (ids[:, 0] >= 0).all()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(100, 200):
+        live.add([i], vectors[i : i + 1])
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert live.ntotal == 200
+
+
+def _workers(tmp_path, n: int = 2) -> list[LiveIndex]:
+    """Live indexes in separate "processes" sharing one file, as under gunicorn."""
+    embeddings_path = tmp_path / "vibe_embeddings.npy"
+    np.save(embeddings_path, _vectors(3))
+    path = tmp_path / "live.faiss"
+    return [
+        LiveIndex.load_or_build(path, embeddings_path, np.array([1, 2, 3]), None, 60)
+        for _ in range(n)
+    ]
+
+
+def test_flushes_from_several_processes_are_merged(tmp_path):
+    first, second = _workers(tmp_path)
+    vectors = _vectors(3, seed=1)
+    first.add([10], vectors[0:1])
+    second.add([20], vectors[1:2])
+    second.remove([1])
+
+    first.flush()
+    second.flush()  # merges the first worker's write instead of overwriting it
+    on_disk = LiveIndex(faiss.read_index(str(first.path)))
+    assert on_disk.ntotal == 4
+    assert _top_id(on_disk, vectors[0]) == 10
+    assert _top_id(on_disk, vectors[1]) == 20
+    assert second.ntotal == 4
+
+
+def test_refresh_picks_up_other_process_and_keeps_pending(tmp_path):
+    first, second = _workers(tmp_path)
+    vectors = _vectors(2, seed=1)
+    assert not first.refresh()  # nothing new on disk
+
+    second.add([20], vectors[1:2])
+    second.flush()
+    first.add([10], vectors[0:1])  # not flushed yet
+
+    assert first.changed_on_disk()
+    assert first.refresh()
+    assert first.generation == 1
+    assert _top_id(first, vectors[1]) == 20
+    assert _top_id(first, vectors[0]) == 10
+    assert first.dirty
+    assert not first.refresh()  # already in sync
+
+    first.flush()
+    assert second.refresh()
+    assert second.ntotal == 5
@@ -0,0 +1,86 @@
+"""Tests for the in-memory restaurant metadata store."""
+
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+
+from vibecheck.metadata_store import RestaurantMetadataStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "restaurants.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE restaurants (id INTEGER PRIMARY KEY, name TEXT, "
+            "rating REAL, address TEXT, image_url TEXT, categories TEXT, "
+            "review_snippet TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO restaurants (id, name, rating) VALUES (?, ?, ?)",
+            [(1, "Cafe", 4.5), (2, "Bar", None)],
+        )
+    return path
+
+
+def _touch(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_hydrate_in_rank_order(db_path, tmp_path):
+    store = RestaurantMetadataStore(db_path, np.array([2, 1, 3]), tmp_path)
+    results = store.hydrate(np.array([1, 0, 2, -1]), np.array([0.0, 1.0, 2.0, 9.0]))
+    assert [(r["id"], r["name"], r["rating"]) for r in results] == [
+        ("1", "Cafe", 4.5),
+        ("2", "Bar", None),
+    ]
+    assert results[0]["similarity"] == 1.0
+
+
+def test_reloads_when_database_changes(db_path, tmp_path):
+    store = RestaurantMetadataStore(db_path, np.array([1]), tmp_path)
+    assert not store.refresh_if_stale()
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE restaurants SET name = 'Cafe Nova' WHERE id = 1")
+    _touch(db_path)
+
+    assert store.refresh_if_stale()
+    assert store.hydrate(np.array([0]), np.array([0.0]))[0]["name"] == "Cafe Nova"
+
+
+def test_failed_reload_keeps_previous_columns(db_path, tmp_path):
+    store = RestaurantMetadataStore(db_path, np.array([1]), tmp_path)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("ALTER TABLE restaurants RENAME TO restaurants_old")
+    _touch(db_path)
+
+    assert not store.refresh_if_stale()
+    assert store.hydrate(np.array([0]), np.array([0.0]))[0]["name"] == "Cafe"
+    with pytest.raises(sqlite3.Error):
+        store.reload()
+    assert len(store.hydrate(np.array([0]), np.array([0.0]))) == 1
+
+
+def test_reloads_on_writes_still_in_the_wal(db_path, tmp_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+    store = RestaurantMetadataStore(db_path, np.array([1]), tmp_path)
+    db_mtime = db_path.stat().st_mtime_ns
+
+    writer = sqlite3.connect(db_path)
+    try:
+        writer.execute("PRAGMA wal_autocheckpoint=0")
+        with writer:
+            writer.execute("UPDATE restaurants SET name = 'Cafe Nova' WHERE id = 1")
+        assert db_path.stat().st_mtime_ns == db_mtime  # only the -wal changed
+
+        assert store.refresh_if_stale()
+        name = store.hydrate(np.array([0]), np.array([0.0]))[0]["name"]
+        assert name == "Cafe Nova"
+    finally:
+        writer.close()
@@ -0,0 +1,174 @@
+"""Query-plan regression tests: hot web-app queries must use indexes."""
+
+import sqlite3
+
+import pytest
+
+from vibecheck import queries
+from vibecheck.schema import build_restaurant_cards, migrate_schema
+
+# Tables as created by scripts/load_sql.py (plus the map coordinates)
+SOURCE_SCHEMA = """
+    CREATE TABLE restaurants (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        place_id TEXT UNIQUE NOT NULL,
+        data_id TEXT,
+        address TEXT,
+        rating REAL,
+        reviews_count INTEGER,
+        latitude REAL,
+        longitude REAL
+    );
+    CREATE TABLE reviews (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        restaurant_id INTEGER,
+        review_text TEXT,
+        likes INTEGER DEFAULT 0
+    );
+    CREATE TABLE vibe_photos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        restaurant_id INTEGER,
+        photo_url TEXT,
+        local_filename TEXT
+    );
+    CREATE TABLE vibe_analysis (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        restaurant_id INTEGER,
+        vibe_name TEXT,
+        mention_count INTEGER
+    );
+"""
+
+VIBES = ["cozy", "romantic", "lively", "trendy", "casual"]
+
+# Plans may scan these CTE / subquery aliases: they hold one bounded page
+ALLOWED_SCANS = {"p"}
+
+
+@pytest.fixture(scope="module")
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SOURCE_SCHEMA)
+    for rid in range(1, 201):
+        conn.execute(
+            "INSERT INTO restaurants (id, name, place_id, rating, reviews_count) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (rid, f"Restaurant {rid}", f"place-{rid}", 3 + rid % 20 / 10, rid),
+        )
+        conn.executemany(
+            "INSERT INTO reviews (restaurant_id, review_text, likes) VALUES (?, ?, ?)",
+            [(rid, f"Review {i}", i) for i in range(5)],
+        )
+        conn.executemany(
+            "INSERT INTO vibe_photos (restaurant_id, photo_url, local_filename) "
+            "VALUES (?, ?, ?)",
+            [(rid, f"https://x/{rid}/{i}", f"{rid}_{i}.jpg") for i in range(5)],
+        )
+        conn.executemany(
+            "INSERT INTO vibe_analysis (restaurant_id, vibe_name, mention_count) "
+            "VALUES (?, ?, ?)",
+            # Some counts are NULL: paging must still return those rows
+            [(rid, vibe, (rid + i) % 7 or None) for i, vibe in enumerate(VIBES)],
+        )
+    conn.commit()
+    migrate_schema(conn)
+    build_restaurant_cards(conn)
+    yield conn
+    conn.close()
+
+
+def full_scans(conn: sqlite3.Connection, sql: str, params) -> list[str]:
+    """Plan steps that read a whole table instead of searching an index."""
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    details = [row[-1] for row in plan]
+    return [
+        d for d in details if d.startswith("SCAN") and d.split()[1] not in ALLOWED_SCANS
+    ]
+
+
+FIRST_PAGE = {
+    "vibe": "cozy",
+    "after_mentions": None,
+    "after_rating": None,
+    "after_id": None,
+    "limit": 51,
+}
+
+
+@pytest.mark.parametrize(
+    ("sql", "params"),
+    [
+        (queries.RESTAURANT_SQL, (1,)),
+        (queries.PHOTOS_SQL, (1, 5)),
+        (queries.TOP_VIBES_SQL, (1,)),
+        (queries.TOP_REVIEWS_SQL, (1, 2)),
+        (queries.VIBE_RESTAURANTS_SQL, FIRST_PAGE),
+        (
+            queries.VIBE_RESTAURANTS_SQL,
+            {**FIRST_PAGE, "after_mentions": 3, "after_rating": 4.0, "after_id": 9},
+        ),
+        (queries.RESTAURANT_CARDS_SQL.format(placeholders="?,?,?"), (1, 2, 3)),
+    ],
+    ids=[
+        "restaurant",
+        "photos",
+        "top_vibes",
+        "top_reviews",
+        "by_vibe_first_page",
+        "by_vibe_next_page",
+        "cards",
+    ],
+)
+def test_hot_query_uses_index(conn, sql, params):
+    assert full_scans(conn, sql, params) == []
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        FIRST_PAGE,
+        {**FIRST_PAGE, "after_mentions": 3, "after_rating": 4.0, "after_id": 9},
+    ],
+    ids=["first_page", "next_page"],
+)
+def test_vibe_page_is_read_in_keyset_order(conn, params):
+    plan = conn.execute(
+        f"EXPLAIN QUERY PLAN {queries.VIBE_RESTAURANTS_SQL}", params
+    ).fetchall()
+    page_id = next(row[0] for row in plan if row[-1] == "CO-ROUTINE page")
+    page_steps = [row[-1] for row in plan if row[1] == page_id]
+    assert any("idx_vibe_analysis_vibe_mention_key" in step for step in page_steps)
+    # Only ties on mention count are sorted, never every matching row
+    assert "USE TEMP B-TREE FOR ORDER BY" not in page_steps
+
+
+def test_migrate_schema_is_idempotent(conn):
+    first = migrate_schema(conn)
+    assert migrate_schema(conn) == first
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+
+def test_vibe_pages_cover_every_restaurant_once(conn):
+    seen, cursor = [], None
+    while True:
+        page, cursor = queries.fetch_restaurants_by_vibe(
+            conn, "cozy", limit=30, cursor=cursor
+        )
+        seen += [r["id"] for r in page]
+        if cursor is None:
+            break
+    assert sorted(seen) == list(range(1, 201))
+
+
+def test_cards_are_fetched_in_chunks(conn, monkeypatch):
+    monkeypatch.setattr(queries.RestaurantDatabase, "MAX_IN_PARAMS", 7)
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        cards = queries.fetch_restaurant_cards(conn, list(range(1, 251)))
+    finally:
+        conn.set_trace_callback(None)
+    assert sorted(cards) == list(range(1, 201))
+    assert cards[5]["name"] == "Restaurant 5"
+    assert len(statements) == 36  # ceil(250 / 7)
@@ -0,0 +1,83 @@
+"""Tests for VibeCheckRecommender search over a plain (row-based) index."""
+
+import json
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from vibecheck.embeddings.encoders import IMAGE_DIM, TEXT_DIM, Encoder  # noqa: E402
+from vibecheck.recommender import VibeCheckRecommender  # noqa: E402
+
+DIM = TEXT_DIM + IMAGE_DIM
+
+
+class ZeroEncoder(Encoder):
+    """Never used for these tests' vector searches, but required."""
+
+    def encode_texts(self, texts: list[str]) -> np.ndarray:
+        return np.zeros((len(texts), TEXT_DIM), dtype="float32")
+
+    def encode_images(self, images) -> np.ndarray:
+        return np.zeros((len(images), IMAGE_DIM), dtype="float32")
+
+
+@pytest.fixture
+def recommender(tmp_path):
+    db_path = tmp_path / "restaurants.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE restaurants (id INTEGER PRIMARY KEY, name TEXT, "
+            "rating REAL, address TEXT, image_url TEXT, categories TEXT, "
+            "review_snippet TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO restaurants (id, name) VALUES (?, ?)",
+            [(11, "Cafe"), (22, "Bar")],
+        )
+
+    vectors = np.eye(2, DIM, dtype="float32")
+    index = faiss.IndexFlatIP(DIM)
+    index.add(vectors)
+    faiss.write_index(index, str(tmp_path / "index.faiss"))
+    np.save(tmp_path / "meta_ids.npy", np.array([11, 22]))
+
+    recommender = VibeCheckRecommender(
+        db_path=db_path,
+        image_dir=tmp_path,
+        faiss_index_path=tmp_path / "index.faiss",
+        meta_ids_path=tmp_path / "meta_ids.npy",
+        encoder=ZeroEncoder(),
+        warm=(),
+        db_pool_size=1,
+    )
+    yield recommender
+    recommender.db.close()
+
+
+def test_search_vectors_returns_plain_string_ids(recommender):
+    [hits] = recommender.search_vectors(np.eye(1, DIM, 1, dtype="float32"), top_k=2)
+    assert [rid for rid, _ in hits] == ["22", "11"]
+    assert all(type(rid) is str for rid, _ in hits)
+    json.dumps(hits)  # numpy scalars would not serialize
+
+
+def test_hydrated_results_keep_rank_order(recommender):
+    [results] = recommender._search_hydrated(np.eye(1, DIM, dtype="float32"), 2)
+    assert [(r["id"], r["name"]) for r in results] == [("11", "Cafe"), ("22", "Bar")]
+
+
+def test_cached_text_results_follow_database_edits(recommender):
+    [first] = recommender.search_by_text("cozy cafe", top_k=1)
+    with sqlite3.connect(recommender.db_path) as conn:
+        conn.execute(
+            "UPDATE restaurants SET name = 'Renamed' WHERE id = ?", (first["id"],)
+        )
+    stat = recommender.db_path.stat()
+    os.utime(recommender.db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    [second] = recommender.search_by_text("cozy cafe", top_k=1)
+    assert second["name"] == "Renamed"
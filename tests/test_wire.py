@@ -0,0 +1,114 @@
+"""Tests for the binary embedding wire formats and content negotiation."""
+
+import numpy as np
+import pytest
+
+from vibecheck.api import wire
+from vibecheck.api.wire import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    NPY_MEDIA_TYPE,
+    RAW_MEDIA_TYPE,
+    UnsupportedMediaType,
+    decode_matrix,
+    encode_matrix,
+    negotiate,
+)
+
+
+@pytest.fixture
+def matrix():
+    vectors = np.random.default_rng(0).normal(size=(3, 896)).astype("float32")
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize(
+    "media_type", [RAW_MEDIA_TYPE, NPY_MEDIA_TYPE, JSON_MEDIA_TYPE]
+)
+def test_float32_round_trip_is_exact(matrix, media_type):
+    decoded = decode_matrix(encode_matrix(matrix, media_type), media_type)
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, matrix)
+
+
+@pytest.mark.parametrize("media_type", [RAW_MEDIA_TYPE, NPY_MEDIA_TYPE])
+def test_float16_halves_payload(matrix, media_type):
+    full = encode_matrix(matrix, media_type, "float32")
+    half = encode_matrix(matrix, media_type, "float16")
+    assert len(half) < len(full) * 0.6
+
+    decoded = decode_matrix(half, f"{media_type}; dtype=float16")
+    assert decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, matrix, atol=1e-3)
+
+
+def test_raw_payload_is_header_plus_data(matrix):
+    payload = encode_matrix(matrix, RAW_MEDIA_TYPE, "float16")
+    assert len(payload) == 16 + matrix.size * 2
+    with pytest.raises(ValueError, match="Not a VibeCheck"):
+        decode_matrix(b"XXXX" + payload[4:], RAW_MEDIA_TYPE)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_msgpack_round_trip(matrix, dtype):
+    pytest.importorskip("msgpack")
+    payload = encode_matrix(matrix, MSGPACK_MEDIA_TYPE, dtype)
+    decoded = decode_matrix(payload, MSGPACK_MEDIA_TYPE)
+    assert decoded.shape == matrix.shape
+    np.testing.assert_allclose(decoded, matrix, atol=1e-3)
+
+
+def test_rejects_non_matrix():
+    with pytest.raises(ValueError, match="2-D"):
+        encode_matrix(np.zeros(4), RAW_MEDIA_TYPE)
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, (RAW_MEDIA_TYPE, "float32")),
+        ("*/*", (RAW_MEDIA_TYPE, "float32")),
+        ("application/x-npy", (NPY_MEDIA_TYPE, "float32")),
+        ("application/octet-stream; dtype=float16", (RAW_MEDIA_TYPE, "float16")),
+        (
+            "application/json;q=0.5, application/x-npy;dtype=FLOAT16",
+            (NPY_MEDIA_TYPE, "float16"),
+        ),
+        ("text/html, application/json;q=0.1", (JSON_MEDIA_TYPE, "float32")),
+        ("application/x-npy;q=0, application/json", (JSON_MEDIA_TYPE, "float32")),
+    ],
+)
+def test_negotiate_picks_media_type_and_dtype(accept, expected):
+    assert negotiate(accept) == expected
+
+
+@pytest.mark.parametrize(
+    "accept",
+    ["text/html", "application/x-npy; dtype=int8", "application/json;q=0"],
+)
+def test_negotiate_rejects_unproducible_accept(accept):
+    with pytest.raises(UnsupportedMediaType):
+        negotiate(accept)
+
+
+def test_negotiate_skips_msgpack_when_not_installed(monkeypatch):
+    monkeypatch.setattr(wire, "_has_msgpack", lambda: False)
+    with pytest.raises(UnsupportedMediaType):
+        negotiate(MSGPACK_MEDIA_TYPE)
+    accept = f"{MSGPACK_MEDIA_TYPE}, {NPY_MEDIA_TYPE};q=0.5"
+    assert negotiate(accept) == (NPY_MEDIA_TYPE, "float32")
+
+
+def test_batch_endpoint_returns_406_for_unsupported_accept():
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    import ml_service
+
+    client = TestClient(ml_service.app)
+    response = client.post(
+        "/embed/batch", data={"texts": ["cozy cafe"]}, headers={"Accept": "text/csv"}
+    )
+    assert response.status_code == 406
+    assert "Supported" in response.json()["detail"]